@@ -1,11 +1,22 @@
 import os
+import sys
 from src.c3_core.etl.etl_v4 import ETLPipeline
 from src.c3_core.component_timing.component_v4 import ComponentTimingV4
 from src.c3_core.qc_aggregation.qc_aggregation_v4 import QCAggregationV4
 from src.c3_core.scenario_engine.scenario_v4 import ScenarioEngineV4
+from src.c3_core.stage_cache import run_cached_pipeline
+from src.c3_core.instrumentation import profile_run, RUN_LOG_FILE
 
-def prepare_data():
+def prepare_data(use_cache: bool = True):
     print("--- Running C3 Pipeline ---")
+    output_dir = "data/derived/scenarios"
+    
+    if use_cache:
+        # Unchanged stages (same neuro_data.db and PIPELINE_VERSIONS) are loaded from data/derived/cache
+        results = run_cached_pipeline(db_path="neuro_data.db")
+        ScenarioEngineV4().export_results(results, output_dir)
+        print("\n--- Data Preparation Complete ---")
+        return
     
     # 1. ETL
     etl = ETLPipeline(db_path="neuro_data.db")
@@ -24,10 +35,18 @@ def prepare_data():
     results = engine.run(aggregated_frame)
     
     # 5. Export
-    output_dir = "data/derived/scenarios"
     engine.export_results(results, output_dir)
     
     print("\n--- Data Preparation Complete ---")
 
 if __name__ == "__main__":
-    prepare_data()
+    use_cache = "--no-cache" not in sys.argv
+    if "--profile" in sys.argv:
+        # Per-stage timing/memory spans, appended to the run log next to the exported scenarios
+        log_path = os.path.join("data/derived/scenarios", RUN_LOG_FILE)
+        with profile_run(log_path=log_path, trace_memory="--trace-memory" in sys.argv) as profiler:
+            prepare_data(use_cache=use_cache)
+        print(profiler.summary())
+        print(f"Run log appended to {log_path}")
+    else:
+        prepare_data(use_cache=use_cache)
@@ -0,0 +1,30 @@
+"""
+scripts/build_trial_events.py
+
+Builds (or refreshes) the materialized long-format trial table next to a
+neuro_data.db-style source database:
+
+    python scripts/build_trial_events.py [path/to/neuro_data.db] [--force]
+
+Without --force the derived file is only rebuilt when the source fingerprint
+differs from the one it was built from.
+"""
+
+import sys
+import time
+sys.path.append('.')
+
+from src.shared.trial_events import build_trial_events, ensure_trial_events
+
+def main():
+    args = sys.argv[1:]
+    force = "--force" in args
+    paths = [a for a in args if not a.startswith("--")]
+    source = paths[0] if paths else "neuro_data.db"
+
+    start = time.perf_counter()
+    derived = build_trial_events(source) if force else ensure_trial_events(source)
+    print(f"trial_events ready: {derived} ({time.perf_counter() - start:.2f}s)")
+
+if __name__ == "__main__":
+    main()
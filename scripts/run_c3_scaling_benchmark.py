@@ -0,0 +1,31 @@
+"""
+scripts/run_c3_scaling_benchmark.py
+
+Runs the C3 pipeline scaling benchmark on synthetic neuro_data.db databases.
+Sizes (sessions) can be passed as arguments, e.g.:
+
+    python scripts/run_c3_scaling_benchmark.py 10000 100000 1000000
+
+Add --no-memory to skip the tracemalloc pass. Reports are written to
+results/c3_scaling_benchmark/scaling_report.{json,md}.
+"""
+
+import sys
+sys.path.append('.')
+
+from src.c3_core.benchmark.scaling import run_scaling_benchmark, DEFAULT_SIZES
+
+def main():
+    args = sys.argv[1:]
+    profile_memory = "--no-memory" not in args
+    sizes = [int(a) for a in args if not a.startswith("--")] or list(DEFAULT_SIZES)
+
+    report = run_scaling_benchmark(sizes=sizes, profile_memory=profile_memory)
+
+    for run in report["runs"]:
+        stage_times = ", ".join(f"{name}={s['seconds']:.2f}s" for name, s in run["stages"].items())
+        print(f"{run['n_sessions']:>9} sessions: {run['total_seconds']:.2f}s ({stage_times})")
+    print("\nReport written to results/c3_scaling_benchmark/")
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ Output:
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import numpy as np
@@ -20,7 +21,7 @@ import pandas as pd
 from scipy import stats as sp_stats
 from sklearn.preprocessing import StandardScaler
 
-from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor
+from exploratory_lab.feature_engineering.feature_store import FeatureStore, DEFAULT_STORE_DIR
 
 
 # ============================================================================
@@ -58,35 +59,9 @@ EXTENDED_FEATURES = CORE_RESIDUALS + ["asym_dv1_abs", "asym_dv1_rel", "psi_tau"]
 
 def load_first_visit_features(database_path: str):
     """Load features using only the first visit per subject."""
-    import sqlite3
+    from exploratory_lab.data_loader import load_trials_wide, load_stimulus_metadata, trials_to_long
     print("[1/5] Loading trial data from neuro_data.db...")
-    conn = sqlite3.connect(database_path)
-
-    trials_query = """
-    SELECT 
-        t.trial_id, t.subject_id, t.test_date,
-        t.tst1_1, t.tst1_2, t.tst1_3, t.tst1_4, t.tst1_5, t.tst1_6,
-        t.tst1_7, t.tst1_8, t.tst1_9, t.tst1_10, t.tst1_11, t.tst1_12,
-        t.tst1_13, t.tst1_14, t.tst1_15, t.tst1_16, t.tst1_17, t.tst1_18,
-        t.tst1_19, t.tst1_20, t.tst1_21, t.tst1_22, t.tst1_23, t.tst1_24,
-        t.tst1_25, t.tst1_26, t.tst1_27, t.tst1_28, t.tst1_29, t.tst1_30,
-        t.tst1_31, t.tst1_32, t.tst1_33, t.tst1_34, t.tst1_35, t.tst1_36,
-        t.tst2_1, t.tst2_2, t.tst2_3, t.tst2_4, t.tst2_5, t.tst2_6,
-        t.tst2_7, t.tst2_8, t.tst2_9, t.tst2_10, t.tst2_11, t.tst2_12,
-        t.tst2_13, t.tst2_14, t.tst2_15, t.tst2_16, t.tst2_17, t.tst2_18,
-        t.tst2_19, t.tst2_20, t.tst2_21, t.tst2_22, t.tst2_23, t.tst2_24,
-        t.tst2_25, t.tst2_26, t.tst2_27, t.tst2_28, t.tst2_29, t.tst2_30,
-        t.tst2_31, t.tst2_32, t.tst2_33, t.tst2_34, t.tst2_35, t.tst2_36,
-        t.tst3_1, t.tst3_2, t.tst3_3, t.tst3_4, t.tst3_5, t.tst3_6,
-        t.tst3_7, t.tst3_8, t.tst3_9, t.tst3_10, t.tst3_11, t.tst3_12,
-        t.tst3_13, t.tst3_14, t.tst3_15, t.tst3_16, t.tst3_17, t.tst3_18,
-        t.tst3_19, t.tst3_20, t.tst3_21, t.tst3_22, t.tst3_23, t.tst3_24,
-        t.tst3_25, t.tst3_26, t.tst3_27, t.tst3_28, t.tst3_29, t.tst3_30,
-        t.tst3_31, t.tst3_32, t.tst3_33, t.tst3_34, t.tst3_35, t.tst3_36
-    FROM trials t
-    INNER JOIN users u ON t.subject_id = u.subject_id
-    """
-    trials_wide = pd.read_sql_query(trials_query, conn)
+    trials_wide = load_trials_wide(database_path)
     n_total_sessions = len(trials_wide)
     n_total_subjects = trials_wide['subject_id'].nunique()
     print(f"  → Loaded {n_total_sessions} sessions from {n_total_subjects} subjects")
@@ -100,55 +75,16 @@ def load_first_visit_features(database_path: str):
     print(f"  → First visits: {n_first_visit} (from {n_total_sessions} sessions, {pct_reduction:.1f}% reduction)")
 
     print("[3/5] Loading stimulus metadata...")
-    metadata_simple = pd.read_sql_query("SELECT * FROM metadata_simple", conn)
-    metadata_color = pd.read_sql_query("SELECT * FROM metadata_color_red", conn)
-    metadata_shift = pd.read_sql_query("SELECT * FROM metadata_shift", conn)
-    conn.close()
+    metadata = load_stimulus_metadata(database_path)
 
     print("[4/5] Reshaping to trial-level format...")
-    trial_level_data = []
-    for _, sr in first_visits.iterrows():
-        sid, tid = sr['subject_id'], sr['trial_id']
-        for stim in range(1, 37):
-            rt = sr[f'tst1_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = metadata_simple[metadata_simple['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_type': 'Tst1',
-                    'stimulus_id': stim, 'stimulus_location': m['position'],
-                    'stimulus_color': m['color'], 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False})
-        for stim in range(1, 37):
-            rt = sr[f'tst2_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = metadata_color[metadata_color['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_type': 'Tst2',
-                    'stimulus_id': stim, 'stimulus_location': m['position'],
-                    'stimulus_color': 'red', 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False})
-        for stim in range(1, 37):
-            rt = sr[f'tst3_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = metadata_shift[metadata_shift['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_type': 'Tst3',
-                    'stimulus_id': stim, 'stimulus_location': m['position'],
-                    'stimulus_color': m['color'], 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False})
-
-    trials_df = pd.DataFrame(trial_level_data)
+    trials_df = trials_to_long(first_visits, metadata)
     print(f"  → Reshaped to {len(trials_df)} trial-level observations")
 
     print("[5/5] Extracting features per subject...")
-    extractor = BaselineFeatureExtractor()
-    features_list = []
-    for subject_id in trials_df['subject_id'].unique():
-        try:
-            features = extractor.extract_subject_features(
-                trials_df[trials_df['subject_id'] == subject_id].copy())
-            if isinstance(features, dict):
-                features['subject_id'] = subject_id
-                features_list.append(features)
-        except Exception:
-            continue
-    features_df = pd.DataFrame(features_list)
-    if 'subject_id' in features_df.columns:
-        features_df = features_df.set_index('subject_id')
+    store = FeatureStore(PROJECT_ROOT / DEFAULT_STORE_DIR, name="first_visit_subject_features")
+    features_df = store.extract(trials_df, group_col='subject_id',
+                                database_path=database_path).set_index('subject_id')
     print(f"  → Extracted features for {len(features_df)} subjects")
 
     sample_info = {
@@ -593,52 +529,10 @@ def main():
     reg_orig = pd.read_csv(LINEAR_CSV, index_col=0)
 
     # Reload full data for fair comparison (recompute from DB)
-    import sqlite3 as _sq
-    _conn = _sq.connect(str(DATABASE_PATH))
-    _tw = pd.read_sql_query("""
-        SELECT t.trial_id, t.subject_id, t.test_date,
-        """ + ", ".join(f"t.tst{t}_{s}" for t in [1,2,3] for s in range(1,37)) + """
-        FROM trials t INNER JOIN users u ON t.subject_id = u.subject_id
-    """, _conn)
-    _ms = pd.read_sql_query("SELECT * FROM metadata_simple", _conn)
-    _mc = pd.read_sql_query("SELECT * FROM metadata_color_red", _conn)
-    _msh = pd.read_sql_query("SELECT * FROM metadata_shift", _conn)
-    _conn.close()
-    _tld = []
-    for _, _sr in _tw.iterrows():
-        _sid, _tid = _sr['subject_id'], _sr['trial_id']
-        for _stim in range(1, 37):
-            rt = _sr[f'tst1_{_stim}']
-            if pd.notna(rt) and rt > 0:
-                _m = _ms[_ms['stimulus_id'] == _stim].iloc[0]
-                _tld.append({'subject_id': _sid, 'session_id': _tid, 'test_type': 'Tst1',
-                    'stimulus_id': _stim, 'stimulus_location': _m['position'],
-                    'stimulus_color': _m['color'], 'psi': _m['psi_ms'], 'rt': rt, 'is_outlier': False})
-        for _stim in range(1, 37):
-            rt = _sr[f'tst2_{_stim}']
-            if pd.notna(rt) and rt > 0:
-                _m = _mc[_mc['stimulus_id'] == _stim].iloc[0]
-                _tld.append({'subject_id': _sid, 'session_id': _tid, 'test_type': 'Tst2',
-                    'stimulus_id': _stim, 'stimulus_location': _m['position'],
-                    'stimulus_color': 'red', 'psi': _m['psi_ms'], 'rt': rt, 'is_outlier': False})
-        for _stim in range(1, 37):
-            rt = _sr[f'tst3_{_stim}']
-            if pd.notna(rt) and rt > 0:
-                _m = _msh[_msh['stimulus_id'] == _stim].iloc[0]
-                _tld.append({'subject_id': _sid, 'session_id': _tid, 'test_type': 'Tst3',
-                    'stimulus_id': _stim, 'stimulus_location': _m['position'],
-                    'stimulus_color': _m['color'], 'psi': _m['psi_ms'], 'rt': rt, 'is_outlier': False})
-    _tdf = pd.DataFrame(_tld)
-    _ext = BaselineFeatureExtractor()
-    _fl = []
-    for _sid in _tdf['subject_id'].unique():
-        try:
-            _f = _ext.extract_subject_features(_tdf[_tdf['subject_id'] == _sid].copy())
-            if isinstance(_f, dict): _f['subject_id'] = _sid; _fl.append(_f)
-        except Exception: continue
-    features_full = pd.DataFrame(_fl)
-    if 'subject_id' in features_full.columns:
-        features_full = features_full.set_index('subject_id')
+    from exploratory_lab.data_loader import load_trials_long
+    _tdf = load_trials_long(str(DATABASE_PATH))
+    features_full = FeatureStore(PROJECT_ROOT / DEFAULT_STORE_DIR, name="subject_features").extract(
+        _tdf, group_col='subject_id', database_path=DATABASE_PATH).set_index('subject_id')
     print(f"  → Full population: {len(features_full)} subjects")
     residuals_full = pd.DataFrame(index=features_full.index)
     for outcome, predictor in MODEL_MAP.items():
@@ -14,13 +14,14 @@ Output: Task_27_3E_Latent_Dimensionality_Report.md
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 
-from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor
+from exploratory_lab.feature_engineering.feature_store import FeatureStore, DEFAULT_STORE_DIR
 
 
 # ============================================================================
@@ -62,105 +63,23 @@ EXTENDED_FEATURES = CORE_RESIDUALS + ["asym_dv1_abs", "asym_dv1_rel", "psi_tau"]
 
 def load_features(database_path: str) -> pd.DataFrame:
     """Load features from neuro_data.db via BaselineFeatureExtractor."""
-    import sqlite3
+    from exploratory_lab.data_loader import load_trials_wide, load_stimulus_metadata, trials_to_long
 
     print("[1/4] Loading trial data from neuro_data.db...")
-    conn = sqlite3.connect(database_path)
-
-    trials_query = """
-    SELECT 
-        t.trial_id, t.subject_id, t.test_date,
-        t.tst1_1, t.tst1_2, t.tst1_3, t.tst1_4, t.tst1_5, t.tst1_6,
-        t.tst1_7, t.tst1_8, t.tst1_9, t.tst1_10, t.tst1_11, t.tst1_12,
-        t.tst1_13, t.tst1_14, t.tst1_15, t.tst1_16, t.tst1_17, t.tst1_18,
-        t.tst1_19, t.tst1_20, t.tst1_21, t.tst1_22, t.tst1_23, t.tst1_24,
-        t.tst1_25, t.tst1_26, t.tst1_27, t.tst1_28, t.tst1_29, t.tst1_30,
-        t.tst1_31, t.tst1_32, t.tst1_33, t.tst1_34, t.tst1_35, t.tst1_36,
-        t.tst2_1, t.tst2_2, t.tst2_3, t.tst2_4, t.tst2_5, t.tst2_6,
-        t.tst2_7, t.tst2_8, t.tst2_9, t.tst2_10, t.tst2_11, t.tst2_12,
-        t.tst2_13, t.tst2_14, t.tst2_15, t.tst2_16, t.tst2_17, t.tst2_18,
-        t.tst2_19, t.tst2_20, t.tst2_21, t.tst2_22, t.tst2_23, t.tst2_24,
-        t.tst2_25, t.tst2_26, t.tst2_27, t.tst2_28, t.tst2_29, t.tst2_30,
-        t.tst2_31, t.tst2_32, t.tst2_33, t.tst2_34, t.tst2_35, t.tst2_36,
-        t.tst3_1, t.tst3_2, t.tst3_3, t.tst3_4, t.tst3_5, t.tst3_6,
-        t.tst3_7, t.tst3_8, t.tst3_9, t.tst3_10, t.tst3_11, t.tst3_12,
-        t.tst3_13, t.tst3_14, t.tst3_15, t.tst3_16, t.tst3_17, t.tst3_18,
-        t.tst3_19, t.tst3_20, t.tst3_21, t.tst3_22, t.tst3_23, t.tst3_24,
-        t.tst3_25, t.tst3_26, t.tst3_27, t.tst3_28, t.tst3_29, t.tst3_30,
-        t.tst3_31, t.tst3_32, t.tst3_33, t.tst3_34, t.tst3_35, t.tst3_36
-    FROM trials t
-    INNER JOIN users u ON t.subject_id = u.subject_id
-    """
-
-    trials_wide = pd.read_sql_query(trials_query, conn)
+    trials_wide = load_trials_wide(database_path)
     print(f"  → Loaded {len(trials_wide)} sessions from {trials_wide['subject_id'].nunique()} subjects")
 
     print("[2/4] Loading stimulus metadata...")
-    metadata_simple = pd.read_sql_query("SELECT * FROM metadata_simple", conn)
-    metadata_color = pd.read_sql_query("SELECT * FROM metadata_color_red", conn)
-    metadata_shift = pd.read_sql_query("SELECT * FROM metadata_shift", conn)
-    conn.close()
+    metadata = load_stimulus_metadata(database_path)
 
     print("[3/4] Reshaping to trial-level format...")
-    trial_level_data = []
-
-    for _, session_row in trials_wide.iterrows():
-        subject_id = session_row['subject_id']
-        trial_id = session_row['trial_id']
-
-        for stimulus_id in range(1, 37):
-            rt = session_row[f'tst1_{stimulus_id}']
-            if pd.notna(rt) and rt > 0:
-                meta = metadata_simple[metadata_simple['stimulus_id'] == stimulus_id].iloc[0]
-                trial_level_data.append({
-                    'subject_id': subject_id, 'session_id': trial_id,
-                    'test_type': 'Tst1', 'stimulus_id': stimulus_id,
-                    'stimulus_location': meta['position'], 'stimulus_color': meta['color'],
-                    'psi': meta['psi_ms'], 'rt': rt, 'is_outlier': False
-                })
-
-        for stimulus_id in range(1, 37):
-            rt = session_row[f'tst2_{stimulus_id}']
-            if pd.notna(rt) and rt > 0:
-                meta = metadata_color[metadata_color['stimulus_id'] == stimulus_id].iloc[0]
-                trial_level_data.append({
-                    'subject_id': subject_id, 'session_id': trial_id,
-                    'test_type': 'Tst2', 'stimulus_id': stimulus_id,
-                    'stimulus_location': meta['position'], 'stimulus_color': 'red',
-                    'psi': meta['psi_ms'], 'rt': rt, 'is_outlier': False
-                })
-
-        for stimulus_id in range(1, 37):
-            rt = session_row[f'tst3_{stimulus_id}']
-            if pd.notna(rt) and rt > 0:
-                meta = metadata_shift[metadata_shift['stimulus_id'] == stimulus_id].iloc[0]
-                trial_level_data.append({
-                    'subject_id': subject_id, 'session_id': trial_id,
-                    'test_type': 'Tst3', 'stimulus_id': stimulus_id,
-                    'stimulus_location': meta['position'], 'stimulus_color': meta['color'],
-                    'psi': meta['psi_ms'], 'rt': rt, 'is_outlier': False
-                })
-
-    trials_df = pd.DataFrame(trial_level_data)
+    trials_df = trials_to_long(trials_wide, metadata)
     print(f"  → Reshaped to {len(trials_df)} trial-level observations")
 
     print("[4/4] Extracting features per subject...")
-    extractor = BaselineFeatureExtractor()
-    features_list = []
-
-    for subject_id in trials_df['subject_id'].unique():
-        subject_trials = trials_df[trials_df['subject_id'] == subject_id].copy()
-        try:
-            features = extractor.extract_subject_features(subject_trials)
-            if isinstance(features, dict):
-                features['subject_id'] = subject_id
-                features_list.append(features)
-        except Exception:
-            continue
-
-    features_df = pd.DataFrame(features_list)
-    if 'subject_id' in features_df.columns:
-        features_df = features_df.set_index('subject_id')
+    store = FeatureStore(PROJECT_ROOT / DEFAULT_STORE_DIR, name="subject_features")
+    features_df = store.extract(trials_df, group_col='subject_id',
+                                database_path=database_path).set_index('subject_id')
     print(f"  → Extracted features for {len(features_df)} subjects")
 
     return features_df
@@ -18,6 +18,7 @@ from pathlib import Path
 sys.path.append('.')
 
 from src.c3x_exploratory.microdynamics import MicrodynamicAnalysis
+from src.shared.data_access import connect_readonly
 
 
 DB_PATH = Path("data/nt_analytics_v4.db")
@@ -25,7 +26,7 @@ DB_PATH = Path("data/nt_analytics_v4.db")
 
 def get_connection():
     """Returns a connection to the SQLite database."""
-    return sqlite3.connect(DB_PATH)
+    return connect_readonly(DB_PATH)
 
 
 def fetch_subject_macro_features(conn):
@@ -227,13 +228,19 @@ def execute_analysis(subjects_macro, subject_rts):
     """Executes the exploratory blocks and computes correlations."""
     analyzer = MicrodynamicAnalysis()
     
-    micro_results = {}
-    for sid, rts in subject_rts.items():
-        if len(rts) == 36:
-            micro_results[sid] = analyzer.execute(rts, seed=hash(sid) % (2**32))
+    valid_sids = [sid for sid, rts in subject_rts.items() if len(rts) == 36]
+    if not valid_sids:
+        print("No 36-trial sequences to process.")
+        return
+    rt_tensor = np.array([subject_rts[sid] for sid in valid_sids], dtype=float)
+    micro_results = analyzer.execute_population(
+        rt_tensor,
+        seeds=[hash(sid) % (2**32) for sid in valid_sids],
+        index=valid_sids,
+        n_jobs=-1
+    )
             
     # Compile Arrays for Correlation
-    valid_sids = list(micro_results.keys())
     print(f"Successfully processed {len(valid_sids)} sequences.")
     
     macro_df = {
@@ -243,9 +250,9 @@ def execute_analysis(subjects_macro, subject_rts):
     }
     
     micro_df = {
-        'trend_slope': np.array([micro_results[sid]['block_decomposition']['trend_slope'] for sid in valid_sids]),
-        'acf_lag1': np.array([micro_results[sid]['autocorrelation']['acf_lag1'] for sid in valid_sids]),
-        'burst_frequency': np.array([micro_results[sid]['burst_analysis']['total_burst_frequency'] for sid in valid_sids])
+        'trend_slope': micro_results['trend_slope'].to_numpy(),
+        'acf_lag1': micro_results['acf_lag1'].to_numpy(),
+        'burst_frequency': micro_results['total_burst_frequency'].to_numpy()
     }
     
     print("\n--- Stage 2: Correlation with 3D Geometry ---")
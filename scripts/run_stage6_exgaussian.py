@@ -1,5 +1,5 @@
 import os
-import sqlite3
+from src.shared.data_access import connect_readonly
 import pandas as pd
 import numpy as np
 from src.c3x_exploratory.exgaussian_integration import ExGaussianIntegrationAnalysis
@@ -13,7 +13,7 @@ def fetch_real_data(db_path: str) -> pd.DataFrame:
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database not found at {db_path}")
         
-    conn = sqlite3.connect(db_path)
+    conn = connect_readonly(db_path)
     
     query = "SELECT subject_id, "
     cols = [f"tst{test}_{trial}" for test in [1, 2, 3] for trial in range(1, 37)]
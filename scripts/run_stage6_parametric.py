@@ -1,5 +1,5 @@
 import os
-import sqlite3
+from src.shared.data_access import connect_readonly
 import pandas as pd
 import numpy as np
 
@@ -12,7 +12,7 @@ def fetch_real_data(db_path: str) -> pd.DataFrame:
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database not found at {db_path}")
         
-    conn = sqlite3.connect(db_path)
+    conn = connect_readonly(db_path)
     
     # Query all valid test values
     query = "SELECT subject_id, "
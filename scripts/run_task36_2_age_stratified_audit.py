@@ -8,7 +8,6 @@ classification breaks down into discrete `k>1` clusters within specific age corr
 
 import sys
 import os
-import sqlite3
 import json
 import warnings
 import numpy as np
@@ -23,11 +22,13 @@ from sklearn.metrics import silhouette_score
 from scipy.spatial.distance import cdist
 from scipy.sparse.csgraph import minimum_spanning_tree
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
 from run_stage7_population_real import load_features, reconstruct_residuals, DATABASE_PATH, LINEAR_CSV, CORE_RESIDUALS
 from run_task36_1_hopkins_audit import calculate_hopkins
+from src.shared.data_access import connect_readonly
 
 # Output Directory
 OUT_DIR = Path(__file__).parent.parent / "results" / "task36_2_age_stratified_audit"
@@ -39,7 +40,7 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 def load_demographics(database_path: str, features_df: pd.DataFrame) -> pd.DataFrame:
     """Merges demographic data from the users table and computes age."""
-    conn = sqlite3.connect(database_path)
+    conn = connect_readonly(database_path)
     users_df = pd.read_sql_query("SELECT subject_id, birth_date, first_test_date FROM users", conn)
     conn.close()
     
@@ -8,7 +8,6 @@ Calculates ICC, Path Trajectories, Temporal Structure (Hurst), and Noise Toleran
 
 import sys
 import os
-import sqlite3
 import json
 import warnings
 import numpy as np
@@ -19,8 +18,10 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from scipy.spatial.distance import euclidean
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor
+from src.shared.data_access import connect_readonly
 
 # ============================================================================
 # CONFIG / HARDCODED VARIABLES (FROM STAGE 7)
@@ -47,7 +48,7 @@ CORE_RESIDUALS = [
 
 def load_demographics_and_trials():
     """Load trials and merge sex/gender from the users table."""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = connect_readonly(DATABASE_PATH)
     trials_query = "SELECT * FROM trials"
     trials_wide = pd.read_sql_query(trials_query, conn)
     
@@ -0,0 +1,10 @@
+"""
+c3_core.benchmark
+
+Synthetic database generation and scaling benchmarks for the C3 pipeline.
+"""
+
+from .synthetic_db import generate_synthetic_db
+from .scaling import run_scaling_benchmark, benchmark_database
+
+__all__ = ["generate_synthetic_db", "run_scaling_benchmark", "benchmark_database"]
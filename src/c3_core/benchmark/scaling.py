@@ -0,0 +1,165 @@
+"""
+c3_core.benchmark.scaling
+
+Scaling benchmark for the C3 pipeline (ETL -> ComponentTimingV4 -> QCAggregationV4
+-> ScenarioEngineV4) on synthetic databases of increasing size.
+
+Every stage is timed on its own (wall clock, no tracing). When memory profiling is
+enabled the stage is run a second time under tracemalloc to record the peak of
+Python/numpy allocations, so the timings are not distorted by tracing overhead.
+Results are written as scaling_report.json and scaling_report.md.
+"""
+
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.c3_core.pipeline_config import PIPELINE_VERSIONS
+from src.c3_core.etl.etl_v4 import ETLPipeline
+from src.c3_core.component_timing.component_v4 import ComponentTimingV4
+from src.c3_core.qc_aggregation.qc_aggregation_v4 import QCAggregationV4
+from src.c3_core.scenario_engine.scenario_v4 import ScenarioEngineV4
+from src.c3_core.benchmark.synthetic_db import generate_synthetic_db
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+STAGES = ("etl", "component_timing", "qc_aggregation", "scenarios")
+
+
+def _measure(func: Callable[[], Any], profile_memory: bool) -> Dict[str, Any]:
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if profile_memory:
+        del result
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = peak / 2**20
+
+    return {"result": result, "seconds": seconds, "peak_mb": peak_mb}
+
+
+def _output_rows(result) -> int:
+    if isinstance(result, dict):
+        return int(sum(len(df) for df in result.values()))
+    return int(len(result))
+
+
+def benchmark_database(db_path: str, profile_memory: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Times (and optionally memory-profiles) every C3 stage on one database."""
+    stages = {}
+    frame = None
+    runners = {
+        "etl": lambda _: ETLPipeline(db_path=db_path).run(),
+        "component_timing": lambda df: ComponentTimingV4().run(df),
+        "qc_aggregation": lambda df: QCAggregationV4().run(df),
+        "scenarios": lambda df: ScenarioEngineV4().run(df),
+    }
+    for stage in STAGES:
+        upstream = frame
+        measured = _measure(lambda: runners[stage](upstream), profile_memory)
+        frame = measured["result"]
+        stages[stage] = {
+            "seconds": round(measured["seconds"], 4),
+            "peak_mb": round(measured["peak_mb"], 1) if measured["peak_mb"] is not None else None,
+            "output_rows": _output_rows(frame),
+        }
+    return stages
+
+
+def run_scaling_benchmark(sizes: Sequence[int] = DEFAULT_SIZES, work_dir: str = "results/c3_scaling_benchmark",
+                          template_path: str = "neuro_data.db", profile_memory: bool = True,
+                          seed: int = 0, reuse_databases: bool = True) -> Dict[str, Any]:
+    """
+    Generates a synthetic database per size (kept in work_dir for reuse) and benchmarks every stage.
+
+    Returns:
+        The report dictionary (also written to work_dir as JSON and markdown).
+    """
+    out = Path(work_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    runs = []
+    for n_sessions in sizes:
+        db_path = out / f"synthetic_{n_sessions}.db"
+        gen_start = time.perf_counter()
+        if not (reuse_databases and db_path.exists()):
+            generate_synthetic_db(str(db_path), n_sessions, template_path=template_path,
+                                  seed=seed, overwrite=True)
+        gen_seconds = time.perf_counter() - gen_start
+
+        print(f"Benchmarking {n_sessions} sessions ...")
+        stages = benchmark_database(str(db_path), profile_memory=profile_memory)
+        total = sum(s["seconds"] for s in stages.values())
+        runs.append({
+            "n_sessions": int(n_sessions),
+            "db_mb": round(db_path.stat().st_size / 2**20, 1),
+            "generation_seconds": round(gen_seconds, 2),
+            "total_seconds": round(total, 4),
+            "sessions_per_second": round(n_sessions / total, 1) if total > 0 else None,
+            "stages": stages,
+        })
+
+    report = {
+        "pipeline_versions": dict(PIPELINE_VERSIONS),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "profile_memory": profile_memory,
+        "runs": runs,
+    }
+    with open(out / "scaling_report.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    (out / "scaling_report.md").write_text(format_markdown(report), encoding="utf-8")
+    return report
+
+
+def format_markdown(report: Dict[str, Any]) -> str:
+    """Renders a scaling report as markdown tables (time and peak memory per stage)."""
+    versions = ", ".join(report["pipeline_versions"].values())
+    lines = [
+        "# C3 Pipeline Scaling Report",
+        "",
+        f"Pipeline: {versions}  ",
+        f"Environment: Python {report['environment']['python']}, pandas {report['environment']['pandas']}, "
+        f"numpy {report['environment']['numpy']}",
+        "",
+        "## Wall time (s)",
+        "",
+        "| Sessions | " + " | ".join(STAGES) + " | total | sessions/s |",
+        "|---" * (len(STAGES) + 3) + "|",
+    ]
+    for run in report["runs"]:
+        cells = [f"{run['stages'][s]['seconds']:.3f}" for s in STAGES]
+        lines.append(f"| {run['n_sessions']} | " + " | ".join(cells) +
+                     f" | {run['total_seconds']:.3f} | {run['sessions_per_second']} |")
+
+    if report["profile_memory"]:
+        lines += [
+            "",
+            "## Peak traced memory (MB)",
+            "",
+            "| Sessions | " + " | ".join(STAGES) + " |",
+            "|---" * (len(STAGES) + 1) + "|",
+        ]
+        for run in report["runs"]:
+            cells = [f"{run['stages'][s]['peak_mb']:.1f}" for s in STAGES]
+            lines.append(f"| {run['n_sessions']} | " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,201 @@
+"""
+c3_core.benchmark.synthetic_db
+
+Generates schema-identical synthetic neuro_data.db databases of arbitrary size
+for scaling benchmarks of the C3 pipeline.
+
+The schema (tables and indexes) and the static tables (metadata_*, warmup_*,
+system_parameters) are copied verbatim from a template database; users and
+trials are synthesized. RT distributions follow neuro_data.db: per-test means
+and spreads, a per-session speed offset and ~3% zero (lapse) responses. The
+per-test summary columns (premature, late, mean, std) are filled in as well.
+"""
+
+import sqlite3
+import warnings
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Tables copied unchanged from the template database
+STATIC_TABLES = [
+    "metadata_simple", "metadata_color_red", "metadata_shift",
+    "warmup_simple", "warmup_color_red", "warmup_shift",
+    "system_parameters",
+]
+
+STIMULI_PER_TEST = 36
+# Per-test block of trials columns: tstN_1..tstN_36, tstN_premature, tstN_late, tstN_mean, tstN_std
+TEST_BLOCK_COLUMNS = STIMULI_PER_TEST + 4
+
+# RT model (ms) fitted to neuro_data.db: (mean, within-session sd) per test
+RT_PARAMS = {1: (245.0, 75.0), 2: (350.0, 115.0), 3: (375.0, 130.0)}
+SESSION_OFFSET_SD = 45.0
+ZERO_RT_RATE = 0.03
+MAX_RT_MS = 2000.0
+PREMATURE_MEAN = 3.0
+LATE_MEAN = 0.5
+
+SESSIONS_PER_SUBJECT = 1.25
+SESSION_CONDITION_P = {1: 0.63, 2: 0.26, 3: 0.11}
+FIRST_TEST_RANGE = ("2011-09-01", "2025-10-01")
+
+BATCH_SESSIONS = 50_000
+
+
+def _copy_schema(conn: sqlite3.Connection, template_path: str):
+    conn.execute("ATTACH DATABASE ? AS tpl", (str(template_path),))
+    objects = conn.execute(
+        "SELECT type, name, sql FROM tpl.sqlite_master WHERE sql IS NOT NULL ORDER BY type = 'index'"
+    ).fetchall()
+    tables = [(name, sql) for kind, name, sql in objects if kind == "table"]
+    indexes = [sql for kind, _, sql in objects if kind == "index"]
+
+    for name, sql in tables:
+        conn.execute(sql)
+        if name in STATIC_TABLES:
+            conn.execute(f"INSERT INTO main.{name} SELECT * FROM tpl.{name}")
+    conn.commit()
+    conn.execute("DETACH DATABASE tpl")
+    return indexes
+
+
+def _generate_users(rng: np.random.Generator, n_subjects: int) -> pd.DataFrame:
+    start, end = (pd.Timestamp(d) for d in FIRST_TEST_RANGE)
+    first_test = start + pd.to_timedelta(rng.integers(0, (end - start).days, n_subjects), unit="D")
+    age_days = rng.integers(18 * 365, 80 * 365, n_subjects)
+    birth = first_test - pd.to_timedelta(age_days, unit="D")
+
+    subject_ids = np.arange(1, n_subjects + 1)
+    return pd.DataFrame({
+        'subject_id': subject_ids,
+        'last_name': [f"SYN{sid:07d}" for sid in subject_ids],
+        'birth_date': birth.strftime("%Y-%m-%d"),
+        'first_test_date': first_test.strftime("%Y-%m-%d"),
+        'gender': rng.integers(0, 2, n_subjects),
+    })
+
+
+def _generate_sessions(rng: np.random.Generator, users: pd.DataFrame, n_sessions: int,
+                       orphan_rate: float) -> pd.DataFrame:
+    n_subjects = len(users)
+    # Every subject has a first session; repeat sessions go to random subjects
+    subject_idx = np.concatenate([
+        np.arange(n_subjects),
+        rng.integers(0, n_subjects, n_sessions - n_subjects),
+    ])
+    sessions = pd.DataFrame({'subject_idx': subject_idx})
+    sessions['visit'] = sessions.groupby('subject_idx').cumcount()
+
+    first_test = pd.to_datetime(users['first_test_date'].to_numpy()[subject_idx])
+    gap_days = np.where(sessions['visit'] > 0, rng.integers(30, 400, n_sessions), 0)
+    offsets = pd.Series(gap_days).groupby(sessions['subject_idx']).cumsum().to_numpy()
+    test_date = first_test + pd.to_timedelta(offsets, unit="D")
+
+    subject_ids = users['subject_id'].to_numpy()[subject_idx].copy()
+    # A few sessions reference subjects missing from users (as in neuro_data.db)
+    orphans = rng.random(n_sessions) < orphan_rate
+    subject_ids[orphans] = n_subjects + 1 + np.arange(orphans.sum())
+
+    conditions = list(SESSION_CONDITION_P)
+    sessions = pd.DataFrame({
+        'subject_id': subject_ids,
+        'test_date': test_date.strftime("%Y-%m-%d"),
+        'test_time': [f"{h}:{m:02d}:{s:02d}" for h, m, s in zip(
+            rng.integers(8, 19, n_sessions), rng.integers(0, 60, n_sessions), rng.integers(0, 60, n_sessions)
+        )],
+        'session_condition': rng.choice(conditions, n_sessions, p=list(SESSION_CONDITION_P.values())),
+    })
+    # trial_id follows test chronology, as in the source database
+    sessions = sessions.sort_values(['test_date', 'test_time'], kind="stable").reset_index(drop=True)
+    sessions.insert(0, 'trial_id', np.arange(1, n_sessions + 1))
+    return sessions
+
+
+def _generate_test_blocks(rng: np.random.Generator, n: int) -> np.ndarray:
+    """RT and summary columns of n sessions, in trials column order (n x 3 * TEST_BLOCK_COLUMNS)."""
+    offset = rng.normal(0.0, SESSION_OFFSET_SD, (n, 1))
+    blocks = []
+    for test in (1, 2, 3):
+        mean, sd = RT_PARAMS[test]
+        rts = np.clip(np.round(rng.normal(mean, sd, (n, STIMULI_PER_TEST)) + offset), 0.0, MAX_RT_MS)
+        rts[rng.random(rts.shape) < ZERO_RT_RATE] = 0.0
+
+        # Summary statistics of the source database exclude zero (lapse) responses
+        responses = np.where(rts > 0, rts, np.nan)
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            rt_mean = np.round(np.nanmean(responses, axis=1))
+            rt_std = np.round(np.nanstd(responses, axis=1, ddof=1))
+        blocks.extend([
+            rts,
+            rng.poisson(PREMATURE_MEAN, (n, 1)),
+            rng.poisson(LATE_MEAN, (n, 1)),
+            rt_mean[:, np.newaxis],
+            rt_std[:, np.newaxis],
+        ])
+    return np.hstack(blocks)
+
+
+def generate_synthetic_db(path: str, n_sessions: int, template_path: str = "neuro_data.db",
+                          seed: int = 0, orphan_rate: float = 0.003,
+                          n_subjects: Optional[int] = None, overwrite: bool = False) -> Path:
+    """
+    Writes a synthetic neuro_data.db-compatible database.
+
+    Args:
+        path: Output SQLite file.
+        n_sessions: Number of trials rows (sessions).
+        template_path: Database providing the schema and static tables.
+        seed: RNG seed; identical arguments produce identical databases.
+        orphan_rate: Share of sessions whose subject_id is missing from users.
+        n_subjects: Number of users (default: n_sessions / 1.25, as in neuro_data.db).
+        overwrite: Replace an existing file instead of raising.
+
+    Returns:
+        Path of the generated database.
+    """
+    out = Path(path)
+    if out.exists():
+        if not overwrite:
+            raise FileExistsError(f"{out} already exists")
+        out.unlink()
+    if n_subjects is None:
+        n_subjects = max(1, int(round(n_sessions / SESSIONS_PER_SUBJECT)))
+    if not 1 <= n_subjects <= n_sessions:
+        raise ValueError(f"n_subjects must be between 1 and n_sessions, got {n_subjects}")
+
+    rng = np.random.default_rng(seed)
+    users = _generate_users(rng, n_subjects)
+    sessions = _generate_sessions(rng, users, n_sessions, orphan_rate)
+
+    conn = sqlite3.connect(out)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        indexes = _copy_schema(conn, template_path)
+
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)",
+                         users.itertuples(index=False, name=None))
+
+        placeholders = ", ".join("?" * (5 + 3 * TEST_BLOCK_COLUMNS))
+        for start in range(0, n_sessions, BATCH_SESSIONS):
+            batch = sessions.iloc[start:start + BATCH_SESSIONS]
+            blocks = _generate_test_blocks(rng, len(batch))
+            # INTEGER affinity stores the integral premature/late counts as integers
+            rows = (
+                (*session, *values)
+                for session, values in zip(batch.itertuples(index=False, name=None), blocks.tolist())
+            )
+            conn.executemany(f"INSERT INTO trials VALUES ({placeholders})", rows)
+            conn.commit()
+
+        # Indexes are built after the bulk load
+        for sql in indexes:
+            conn.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+    return out
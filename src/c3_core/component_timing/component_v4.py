@@ -2,12 +2,20 @@
 c3_core.component_timing.component_v4
 
 Implementation of the C3.2 Component Timing Computation layer for model v4.
-Version: component_v4.0.0
+Version: component_v4.0.1
 Strictly read-only, deterministic, non-interpretative, and non-aggregative.
 """
 
 import pandas as pd
 import numpy as np
+from src.c3_core.schema_registry import validate_frame, to_compact, TEST_TYPES
+from src.c3_core.instrumentation import instrumented
+
+# Computation modes:
+# - "tensor": RTs are scattered into a (n_sessions, 3, 36) array, ΔV are computed by broadcasting
+# - "merge": reference implementation, Tst1 baseline is attached with a pd.merge
+COMPUTATION_MODES = ("tensor", "merge")
+STIMULI_PER_TEST = 36
 
 class ComponentTimingV4:
     """
@@ -15,9 +23,14 @@ class ComponentTimingV4:
     Calculates ΔV1, ΔV4, and ΔV5/MT based on EventFrame.
     """
     
-    def __init__(self):
-        pass
+    def __init__(self, compact_schema: bool = False, mode: str = "tensor"):
+        if mode not in COMPUTATION_MODES:
+            raise ValueError(f"Unknown mode '{mode}'. Expected one of {COMPUTATION_MODES}")
+        # Expect a compact EventFrame on entry and emit a compact ComponentFrame
+        self.compact_schema = compact_schema
+        self.mode = mode
 
+    @instrumented("component_timing")
     def run(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Executes the component timing computation.
@@ -28,6 +41,22 @@ class ComponentTimingV4:
         Returns:
             ComponentFrame (DataFrame) with added ΔV1, ΔV4, and ΔV5_MT columns.
         """
+        validate_frame(df, 'EventFrame', compact=self.compact_schema)
+        
+        res = None
+        if self.mode == "tensor":
+            res = self._run_tensor(df)
+        if res is None:
+            res = self._run_merge(df)
+        
+        if self.compact_schema:
+            res = to_compact(res, 'ComponentFrame')
+        
+        return res
+
+    @instrumented("merge")
+    def _run_merge(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Reference implementation: baseline attached through a merge on (session_id, stimulus_index)."""
         # Ensure we don't modify the input DataFrame
         res = df.copy()
         
@@ -59,3 +88,52 @@ class ComponentTimingV4:
         res = res.drop(columns=['delta_v1_base'])
         
         return res
+
+    @instrumented("merge")
+    def _run_tensor(self, df: pd.DataFrame):
+        """
+        Positional (join-free) computation.
+        
+        RTs are scattered into a (n_sessions, 3, 36) tensor indexed by
+        (session, test type, stimulus_index - 1); ΔV1 is the Tst1 plane and ΔV4 / ΔV5_MT
+        are obtained by broadcasting it over the Tst2 / Tst3 planes. Results are gathered
+        back per row and added as columns to a shallow copy of the input.
+        
+        Returns None when the EventFrame does not fit the tensor layout (stimulus_index
+        outside 1..36 or duplicated (session, test, stimulus) keys); the caller then
+        falls back to the merge path, which defines the semantics for such frames.
+        """
+        session_pos, sessions = pd.factorize(df['session_id'])
+        test_pos = pd.Categorical(df['test_type'], categories=TEST_TYPES).codes.astype(np.int64)
+        stim_pos = df['stimulus_index'].to_numpy(dtype=np.int64) - 1
+        rt = df['rt_ms'].to_numpy(dtype=np.float64)
+        
+        if len(df) and ((stim_pos < 0).any() or (stim_pos >= STIMULI_PER_TEST).any() or (session_pos < 0).any()):
+            return None
+        
+        known = test_pos >= 0
+        flat_key = (session_pos * len(TEST_TYPES) + test_pos) * STIMULI_PER_TEST + stim_pos
+        if len(np.unique(flat_key[known])) != int(known.sum()):
+            return None
+        
+        # 1. Scatter RTs into the (n_sessions, 3, 36) tensor
+        rt_tensor = np.full((len(sessions), len(TEST_TYPES), STIMULI_PER_TEST), np.nan)
+        rt_tensor[session_pos[known], test_pos[known], stim_pos[known]] = rt[known]
+        
+        # 2. ΔV1 is the Tst1 plane; component deltas by broadcasting it over all test planes
+        delta_v1 = rt_tensor[:, 0, :]
+        delta_tensor = rt_tensor - delta_v1[:, np.newaxis, :]
+        
+        # 3. Gather back per row
+        row_delta_v1 = delta_v1[session_pos, stim_pos]
+        row_delta = np.full(len(df), np.nan)
+        row_delta[known] = delta_tensor[session_pos[known], test_pos[known], stim_pos[known]]
+        
+        # Shallow copy: the input frame is left untouched, no column data is duplicated
+        res = df.copy(deep=False)
+        res.index = pd.RangeIndex(len(res))
+        res['ΔV1'] = row_delta_v1
+        res['ΔV4'] = np.where(test_pos == TEST_TYPES.index('Tst2'), row_delta, np.nan)
+        res['ΔV5_MT'] = np.where(test_pos == TEST_TYPES.index('Tst3'), row_delta, np.nan)
+        
+        return res
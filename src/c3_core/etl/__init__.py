@@ -6,5 +6,6 @@ Responsible for extracting data from SQLite and normalizing it into EventFrames.
 """
 
 from .etl_v4 import ETLPipeline
+from .event_store import EventFrameStore
 
-__all__ = ["ETLPipeline"]
+__all__ = ["ETLPipeline", "EventFrameStore"]
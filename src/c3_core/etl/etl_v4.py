@@ -2,71 +2,298 @@
 c3_core.etl.etl_v4
 
 Implementation of the C3.1 ETL Pipeline for model v4.
-Version: etl_v4.1.2
+Version: etl_v4.1.3
 Strictly read-only, deterministic, and non-interpretative.
 """
 
+import hashlib
 import sqlite3
+import numpy as np
 import pandas as pd
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Iterator, Tuple
 from pathlib import Path
 from datetime import datetime
 
+from src.c3_core.pipeline_config import PIPELINE_VERSIONS
+from src.c3_core.instrumentation import instrumented
+from src.shared.data_access import connect_readonly, read_connection, read_table, read_users
+from src.c3_core.schema_registry import to_compact
+from src.c3_core.etl.event_store import EventFrameStore
+
 # Architectural invariants
 MIN_RT_MS = 135  # Architectural invariant (MinRedLight, 25.12.2016)
 
+# Transform modes:
+# - "columnar": age is computed once per session (vectorized) and broadcast by the melt
+# - "rowwise": reference implementation, age is computed per event row
+TRANSFORM_MODES = ("columnar", "rowwise")
+DATE_FORMAT = '%Y-%m-%d'
+
+# EventFrame age dtype in every transform mode and extraction strategy. Fixed by the
+# schema rather than inferred from the data, so chunks, partitions and run() agree
+# whether or not the rows at hand include a missing age.
+AGE_DTYPE = np.float64
+
+# Extraction strategies:
+# - "pandas": reference implementation, wide trials table is melted in pandas
+# - "sql": the tstN_k columns are unpivoted and joined with metadata inside SQLite,
+#          rows are streamed into preallocated NumPy columns
+EXTRACTION_STRATEGIES = ("pandas", "sql")
+
+# Test type -> metadata table (36 stimuli per test)
+TEST_METADATA_TABLES = {
+    'Tst1': 'metadata_simple',
+    'Tst2': 'metadata_color_red',
+    'Tst3': 'metadata_shift'
+}
+STIMULI_PER_TEST = 36
+STREAM_BATCH_ROWS = 50000
+
 class ETLPipeline:
     """
     ETL Pipeline for extracting and normalizing neurotrans data from SQLite.
-    Version: etl_v4.1.2
+    Version: etl_v4.1.3
     """
     
-    def __init__(self, db_path: str = "neuro_data.db"):
+    def __init__(self, db_path: str = "neuro_data.db", transform_mode: str = "columnar",
+                 extraction_strategy: str = "pandas", compact_schema: bool = False):
+        if transform_mode not in TRANSFORM_MODES:
+            raise ValueError(f"Unknown transform_mode '{transform_mode}'. Expected one of {TRANSFORM_MODES}")
+        if extraction_strategy not in EXTRACTION_STRATEGIES:
+            raise ValueError(
+                f"Unknown extraction_strategy '{extraction_strategy}'. Expected one of {EXTRACTION_STRATEGIES}"
+            )
         self.db_path = db_path
+        self.transform_mode = transform_mode
+        self.extraction_strategy = extraction_strategy
+        # Emit the EventFrame with the compact dtypes of c3_core.schema_registry
+        self.compact_schema = compact_schema
 
+    @instrumented("etl")
     def run(self) -> pd.DataFrame:
         """
         Executes the full ETL pipeline.
         """
-        with sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True) as conn:
+        with read_connection(self.db_path) as conn:
             # 1. Extract
             users_df = self._extract_users(conn)
-            trials_df = self._extract_trials(conn)
-            meta_simple = self._extract_metadata(conn, "metadata_simple")
-            meta_color = self._extract_metadata(conn, "metadata_color_red")
-            meta_shift = self._extract_metadata(conn, "metadata_shift")
             
             # 2. Transform
-            event_frame = self._build_event_frame(
-                trials_df, 
-                users_df,
-                {"simple": meta_simple, "color": meta_color, "shift": meta_shift}
-            )
+            event_frame = self._extract_events(conn, users_df)
             
             # 3. Validate
             event_frame = self._validate_integrity(event_frame, users_df)
             
-            return event_frame
+            return self._apply_schema(event_frame)
+
+    def run_incremental(self, store_dir: str) -> pd.DataFrame:
+        """
+        Executes the ETL pipeline only for sessions added since the last run.
+        
+        New sessions (trial_id above the persisted watermark) are transformed,
+        validated and appended as a new partition of the EventFrameStore at store_dir.
+        The store is rebuilt from scratch when the users table (row count or content
+        digest of subject_id, birth_date, gender) or the ETL version differs from the
+        watermark, since both affect already ingested rows.
+        
+        Returns:
+            EventFrame rows of the newly ingested sessions (empty if nothing new).
+            The full EventFrame is available via EventFrameStore(store_dir).read().
+        """
+        store = EventFrameStore(store_dir)
+        etl_version = PIPELINE_VERSIONS["etl_version"]
+        
+        with read_connection(self.db_path) as conn:
+            users_df = self._extract_users(conn)
+            users_digest = self._users_digest(users_df)
+            
+            watermark = store.read_watermark()
+            if watermark is not None and (
+                watermark["users_count"] != len(users_df)
+                or watermark.get("users_digest") != users_digest
+                or watermark["etl_version"] != etl_version
+            ):
+                store.reset()
+                watermark = None
+            after_trial_id = watermark["max_trial_id"] if watermark is not None else None
+            
+            event_frame = self._extract_events(conn, users_df, after_trial_id=after_trial_id)
+            
+            # Integrity checks run on the new partition only
+            event_frame = self._apply_schema(self._validate_integrity(event_frame, users_df))
+            
+        if not event_frame.empty:
+            store.append_partition(event_frame)
+            store.write_watermark(event_frame['session_id'].max(), len(users_df), etl_version, users_digest)
+        elif watermark is None:
+            store.write_watermark(-1, len(users_df), etl_version, users_digest)
+        return event_frame
+
+    def _users_digest(self, users_df: pd.DataFrame) -> str:
+        """SHA-256 over the users columns the EventFrame depends on, independent of row order."""
+        columns = users_df[['subject_id', 'birth_date', 'gender']].sort_values('subject_id')
+        row_hashes = pd.util.hash_pandas_object(columns, index=False).to_numpy()
+        return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+    def iter_event_chunks(self, chunk_sessions: int = 1000) -> Iterator[pd.DataFrame]:
+        """
+        Streams the EventFrame in validated chunks of up to chunk_sessions sessions.
+        
+        trials is paged by trial_id range, so only the current chunk, the metadata
+        tables and the users lookup are resident. All integrity checks are session-local,
+        hence the concatenated chunks carry the same rows and QC flags as run()
+        (row order differs: chunks follow trial_id ranges).
+        """
+        if chunk_sessions < 1:
+            raise ValueError("chunk_sessions must be a positive integer")
+        
+        conn = connect_readonly(self.db_path)
+        try:
+            users_df = self._extract_users(conn)
+            meta_dfs = self._extract_metadata_tables(conn)
+            
+            after_trial_id = None
+            while True:
+                until_trial_id = self._next_chunk_bound(conn, after_trial_id, chunk_sessions)
+                if until_trial_id is None:
+                    break
+                
+                chunk = self._extract_events(
+                    conn, users_df, after_trial_id=after_trial_id,
+                    until_trial_id=until_trial_id, meta_dfs=meta_dfs
+                )
+                yield self._apply_schema(self._validate_integrity(chunk, users_df))
+                after_trial_id = until_trial_id
+        finally:
+            conn.close()
+
+    def _apply_schema(self, event_frame: pd.DataFrame) -> pd.DataFrame:
+        if self.compact_schema:
+            return to_compact(event_frame, 'EventFrame')
+        return event_frame
+
+    def _next_chunk_bound(self, conn: sqlite3.Connection, after_trial_id: Optional[int],
+                          chunk_sessions: int) -> Optional[int]:
+        """Returns the last trial_id of the next page of chunk_sessions sessions, None when exhausted."""
+        clause, params = self._trial_range_clause(after_trial_id, None)
+        row = conn.execute(
+            f"SELECT MAX(trial_id) FROM (SELECT trial_id FROM trials {clause} ORDER BY trial_id LIMIT ?)",
+            params + (int(chunk_sessions),)
+        ).fetchone()
+        return row[0]
+
+    def _trial_range_clause(self, after_trial_id: Optional[int], until_trial_id: Optional[int],
+                            alias: str = "") -> Tuple[str, tuple]:
+        """WHERE clause selecting after_trial_id < trial_id <= until_trial_id (both bounds optional)."""
+        column = f"{alias}.trial_id" if alias else "trial_id"
+        conditions, params = [], []
+        if after_trial_id is not None:
+            conditions.append(f"{column} > ?")
+            params.append(int(after_trial_id))
+        if until_trial_id is not None:
+            conditions.append(f"{column} <= ?")
+            params.append(int(until_trial_id))
+        if not conditions:
+            return "", ()
+        return "WHERE " + " AND ".join(conditions), tuple(params)
+
+    def _extract_events(self, conn: sqlite3.Connection, users_df: pd.DataFrame,
+                        after_trial_id: Optional[int] = None, until_trial_id: Optional[int] = None,
+                        meta_dfs: Optional[dict] = None) -> pd.DataFrame:
+        """
+        Extracts and normalizes sessions (optionally restricted to a trial_id range)
+        into an EventFrame using the configured extraction strategy.
+        """
+        if self.extraction_strategy == "sql":
+            return self._build_event_frame_sql(
+                conn, users_df, after_trial_id=after_trial_id, until_trial_id=until_trial_id
+            )
+        
+        trials_df = self._extract_trials(conn, after_trial_id=after_trial_id, until_trial_id=until_trial_id)
+        if meta_dfs is None:
+            meta_dfs = self._extract_metadata_tables(conn)
+        
+        return self._build_event_frame(trials_df, users_df, meta_dfs)
 
+    @instrumented("extract")
     def _extract_users(self, conn: sqlite3.Connection) -> pd.DataFrame:
-        return pd.read_sql_query("SELECT * FROM users", conn)
+        # Served from the in-process table cache of src.shared.data_access
+        return read_users(self.db_path)
+
+    @instrumented("extract")
+    def _extract_trials(self, conn: sqlite3.Connection, after_trial_id: Optional[int] = None,
+                        until_trial_id: Optional[int] = None) -> pd.DataFrame:
+        if after_trial_id is None and until_trial_id is None:
+            return pd.read_sql_query("SELECT * FROM trials", conn)
+        clause, params = self._trial_range_clause(after_trial_id, until_trial_id)
+        return pd.read_sql_query(f"SELECT * FROM trials {clause} ORDER BY trial_id", conn, params=params)
 
-    def _extract_trials(self, conn: sqlite3.Connection) -> pd.DataFrame:
-        return pd.read_sql_query("SELECT * FROM trials", conn)
+    @instrumented("extract")
+    def _extract_sessions(self, conn: sqlite3.Connection, after_trial_id: Optional[int] = None,
+                          until_trial_id: Optional[int] = None) -> pd.DataFrame:
+        """Session-level columns of trials (no RT columns), in trial_id order."""
+        clause, params = self._trial_range_clause(after_trial_id, until_trial_id)
+        return pd.read_sql_query(
+            f"SELECT trial_id, subject_id, test_date FROM trials {clause} ORDER BY trial_id", conn, params=params
+        )
 
     def _extract_metadata(self, conn: sqlite3.Connection, table_name: str) -> pd.DataFrame:
-        return pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
+        return read_table(self.db_path, table_name)
+
+    @instrumented("extract")
+    def _extract_metadata_tables(self, conn: sqlite3.Connection) -> dict:
+        return {
+            "simple": self._extract_metadata(conn, "metadata_simple"),
+            "color": self._extract_metadata(conn, "metadata_color_red"),
+            "shift": self._extract_metadata(conn, "metadata_shift")
+        }
 
     def _calculate_age(self, test_date_str: str, birth_date_str: str) -> Optional[int]:
         """Calculates age from test date and birth date. Returns None on error."""
         try:
-            test_date = datetime.strptime(test_date_str, '%Y-%m-%d')
-            birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d')
+            test_date = datetime.strptime(test_date_str, DATE_FORMAT)
+            birth_date = datetime.strptime(birth_date_str, DATE_FORMAT)
             age = test_date.year - birth_date.year - ((test_date.month, test_date.day) < (birth_date.month, birth_date.day))
             return int(age)
         except (ValueError, TypeError):
             return None
 
+    def _parse_dates(self, date_strs: pd.Series) -> pd.Series:
+        """
+        Vectorized counterpart of the strptime parsing in _calculate_age.
+        Values pandas cannot parse are retried with strptime so that the accepted
+        inputs stay identical to the row-wise path; failures become NaT.
+        """
+        parsed = pd.to_datetime(date_strs, format=DATE_FORMAT, errors='coerce')
+        retry = parsed.isna() & date_strs.notna()
+        if retry.any():
+            def _strptime(value):
+                try:
+                    return pd.Timestamp(datetime.strptime(value, DATE_FORMAT))
+                except (ValueError, TypeError, OverflowError):
+                    return pd.NaT
+            parsed = parsed.astype(object)
+            parsed[retry] = date_strs[retry].map(_strptime)
+            parsed = pd.to_datetime(parsed, errors='coerce')
+        return parsed
+
+    def _calculate_session_ages(self, trials_df: pd.DataFrame, users_df: pd.DataFrame) -> pd.Series:
+        """
+        Computes age once per session (row of trials_df). Returns a float Series
+        aligned with trials_df, NaN where _calculate_age would return None.
+        """
+        birth_dates = trials_df['subject_id'].map(users_df.set_index('subject_id')['birth_date'])
+        test_date = self._parse_dates(trials_df['test_date'])
+        birth_date = self._parse_dates(birth_dates)
+        
+        before_birthday = (
+            (test_date.dt.month < birth_date.dt.month) |
+            ((test_date.dt.month == birth_date.dt.month) & (test_date.dt.day < birth_date.dt.day))
+        )
+        age = test_date.dt.year - birth_date.dt.year - before_birthday.astype(int)
+        return age.where(test_date.notna() & birth_date.notna()).astype(float)
+
+    @instrumented("melt")
     def _build_event_frame(self, trials_df: pd.DataFrame, users_df: pd.DataFrame, meta_dfs: dict) -> pd.DataFrame:
         """
         Normalizes wide trials table into vertical EventFrame and includes subject attributes.
@@ -78,6 +305,13 @@ class ETLPipeline:
         # trial_id is renamed to session_id in EventFrame
         id_vars = ['subject_id', 'trial_id', 'test_date', 'test_time']
         
+        columnar = self.transform_mode == "columnar"
+        if columnar:
+            # Age is a session attribute: compute it on the wide frame and let the melt broadcast it
+            trials_df = trials_df.copy()
+            trials_df['age'] = self._calculate_session_ages(trials_df, users_df)
+            id_vars.append('age')
+        
         test_types = {
             'Tst1': 'simple',
             'Tst2': 'color',
@@ -96,6 +330,8 @@ class ETLPipeline:
                 var_name='stimulus_raw',
                 value_name='rt_ms'
             )
+            # An all-NULL column (possible in small chunks) would otherwise come back as object
+            melted['rt_ms'] = melted['rt_ms'].astype('float64')
             
             melted['stimulus_index'] = melted['stimulus_raw'].str.extract(r'tst\d+_(\d+)', expand=False).astype(int)
             melted['test_type'] = t_prefix
@@ -119,9 +355,11 @@ class ETLPipeline:
         event_frame = pd.merge(event_frame, users_df[['subject_id', 'birth_date', 'sex']], on='subject_id', how='left')
         
         # Calculate age
-        event_frame['age'] = event_frame.apply(
-            lambda x: self._calculate_age(x['test_date'], x['birth_date']), axis=1
-        )
+        if not columnar:
+            event_frame['age'] = [
+                self._calculate_age(t, b) for t, b in zip(event_frame['test_date'], event_frame['birth_date'])
+            ]
+        event_frame['age'] = event_frame['age'].astype(AGE_DTYPE)
         
         # Final Rename and Selection
         event_frame = event_frame.rename(columns={'trial_id': 'session_id'})
@@ -137,6 +375,123 @@ class ETLPipeline:
             
         return event_frame[keep_cols]
 
+    def _build_unpivot_query(self, conn: sqlite3.Connection, after_trial_id: Optional[int] = None,
+                             until_trial_id: Optional[int] = None):
+        """
+        Generates the SQL that unpivots the tstN_k columns and joins each stimulus with its
+        metadata row. Each trials row is read once and expanded against the 36 stimulus
+        indices; no ORDER BY is issued, rows are put in canonical order after streaming.
+        
+        Returns:
+            (query, params, has_shift_parameter)
+        """
+        meta_columns = {
+            table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for table in TEST_METADATA_TABLES.values()
+        }
+        has_shift = any('shift_parameter' in cols for cols in meta_columns.values())
+        
+        stim_values = ", ".join(f"({k})" for k in range(1, STIMULI_PER_TEST + 1))
+        where, where_params = self._trial_range_clause(after_trial_id, until_trial_id, alias="t")
+        
+        selects = []
+        params = []
+        for code, (t_prefix, table) in enumerate(TEST_METADATA_TABLES.items()):
+            rt_case = " ".join(
+                f"WHEN {k} THEN t.{t_prefix.lower()}_{k}" for k in range(1, STIMULI_PER_TEST + 1)
+            )
+            shift = "m.shift_parameter" if 'shift_parameter' in meta_columns[table] else "NULL"
+            selects.append(
+                f"SELECT {code} AS test_code, s.k AS stimulus_index, t.trial_id, "
+                f"CASE s.k {rt_case} END AS rt_ms, "
+                f"m.psi_ms, m.color, m.position, {shift} AS shift_parameter "
+                f"FROM trials t CROSS JOIN stim s "
+                f"LEFT JOIN {table} m ON m.stimulus_id = s.k "
+                f"{where}"
+            )
+            params.extend(where_params)
+        
+        query = f"WITH stim(k) AS (VALUES {stim_values}) " + " UNION ALL ".join(selects)
+        return query, tuple(params), has_shift
+
+    @instrumented("melt")
+    def _build_event_frame_sql(self, conn: sqlite3.Connection, users_df: pd.DataFrame,
+                               after_trial_id: Optional[int] = None,
+                               until_trial_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Builds the EventFrame with the unpivot performed inside SQLite.
+        Long rows are streamed into preallocated typed columns; session attributes
+        (subject, age, sex) are computed once per session and broadcast positionally.
+        """
+        sessions = self._extract_sessions(conn, after_trial_id=after_trial_id, until_trial_id=until_trial_id)
+        query, params, has_shift = self._build_unpivot_query(
+            conn, after_trial_id=after_trial_id, until_trial_id=until_trial_id
+        )
+        
+        n_rows = len(sessions) * STIMULI_PER_TEST * len(TEST_METADATA_TABLES)
+        test_code = np.empty(n_rows, dtype=np.int64)
+        stimulus_index = np.empty(n_rows, dtype=np.int64)
+        trial_id = np.empty(n_rows, dtype=np.int64)
+        rt_ms = np.empty(n_rows, dtype=np.float64)
+        psi_ms = np.empty(n_rows, dtype=np.float64)
+        color = np.empty(n_rows, dtype=object)
+        position = np.empty(n_rows, dtype=object)
+        shift_parameter = np.empty(n_rows, dtype=np.float64)
+        
+        cursor = conn.execute(query, params)
+        offset = 0
+        while True:
+            batch = cursor.fetchmany(STREAM_BATCH_ROWS)
+            if not batch:
+                break
+            end = offset + len(batch)
+            cols = list(zip(*batch))
+            test_code[offset:end] = cols[0]
+            stimulus_index[offset:end] = cols[1]
+            trial_id[offset:end] = cols[2]
+            rt_ms[offset:end] = np.array(cols[3], dtype=np.float64)
+            psi_ms[offset:end] = np.array(cols[4], dtype=np.float64)
+            color[offset:end] = cols[5]
+            position[offset:end] = cols[6]
+            shift_parameter[offset:end] = np.array(cols[7], dtype=np.float64)
+            offset = end
+        
+        # Canonical row order of the pandas path: test type, stimulus index, trial_id
+        order = np.lexsort((trial_id, stimulus_index, test_code))
+        test_code, stimulus_index, trial_id = test_code[order], stimulus_index[order], trial_id[order]
+        rt_ms, psi_ms, shift_parameter = rt_ms[order], psi_ms[order], shift_parameter[order]
+        color, position = color[order], position[order]
+        
+        # Session attributes, looked up positionally by trial_id
+        session_pos = pd.Index(sessions['trial_id']).get_indexer(trial_id)
+        if self.transform_mode == "columnar":
+            ages = self._calculate_session_ages(sessions, users_df).to_numpy()
+        else:
+            birth_dates = sessions['subject_id'].map(users_df.set_index('subject_id')['birth_date'])
+            ages = np.array([
+                self._calculate_age(t, b) for t, b in zip(sessions['test_date'], birth_dates)
+            ], dtype=AGE_DTYPE)
+        sexes = sessions['subject_id'].map(users_df.set_index('subject_id')['gender'].map({0: 'F', 1: 'M'}))
+        
+        age = ages[session_pos]
+        event_frame = pd.DataFrame({
+            'subject_id': sessions['subject_id'].to_numpy()[session_pos],
+            'session_id': trial_id,
+            'age': age.astype(AGE_DTYPE),
+            'sex': sexes.to_numpy()[session_pos],
+            'test_type': np.array(list(TEST_METADATA_TABLES), dtype=object)[test_code],
+            'stimulus_index': stimulus_index,
+            'rt_ms': rt_ms,
+            'psi_pre_ms': psi_ms.astype(np.int64) if not np.isnan(psi_ms).any() else psi_ms,
+            'stimulus_color': color,
+            'stimulus_location': position,
+        })
+        if has_shift:
+            event_frame['shift_parameter'] = shift_parameter
+        
+        return event_frame
+
+    @instrumented("validate")
     def _validate_integrity(self, df: pd.DataFrame, users_df: pd.DataFrame) -> pd.DataFrame:
         """
         Performs technical QC checks.
@@ -0,0 +1,97 @@
+"""
+c3_core.etl.event_store
+
+Append-only, partitioned on-disk store for EventFrames produced by the C3.1 ETL.
+Used by ETLPipeline.run_incremental to avoid rebuilding the full EventFrame
+when only new sessions were added to neuro_data.db.
+
+Layout:
+    <store_dir>/watermark.json
+    <store_dir>/partitions/part_<first_trial_id>_<last_trial_id>.parquet
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import pandas as pd
+
+
+class EventFrameStore:
+    """
+    Partitioned EventFrame store with a persisted high-water mark.
+
+    The watermark records the max trial_id already ingested, the users row count and
+    content digest, and the ETL version that produced the partitions. Partitions are never rewritten;
+    a changed users table or ETL version invalidates the whole store.
+    """
+
+    WATERMARK_FILE = "watermark.json"
+    PARTITIONS_DIR = "partitions"
+
+    def __init__(self, store_dir: str):
+        self.store_dir = Path(store_dir)
+        self.partitions_dir = self.store_dir / self.PARTITIONS_DIR
+
+    def read_watermark(self) -> Optional[Dict[str, Any]]:
+        """Returns the persisted watermark, or None for an empty store."""
+        path = self.store_dir / self.WATERMARK_FILE
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def write_watermark(self, max_trial_id: int, users_count: int, etl_version: str,
+                        users_digest: Optional[str] = None):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        watermark = {
+            "max_trial_id": int(max_trial_id),
+            "users_count": int(users_count),
+            "users_digest": users_digest,
+            "etl_version": etl_version,
+        }
+        # Write-then-rename so an interrupted run never leaves a torn watermark
+        tmp_path = self.store_dir / f"{self.WATERMARK_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(watermark, f, indent=2)
+        tmp_path.replace(self.store_dir / self.WATERMARK_FILE)
+
+    def list_partitions(self) -> List[Path]:
+        """Partition files ordered by their first trial_id."""
+        if not self.partitions_dir.exists():
+            return []
+        parts = self.partitions_dir.glob("part_*.parquet")
+        return sorted(parts, key=lambda p: int(p.stem.split("_")[1]))
+
+    def append_partition(self, df: pd.DataFrame) -> Optional[Path]:
+        """Writes the EventFrame rows of new sessions as a new partition."""
+        if df.empty:
+            return None
+        self.partitions_dir.mkdir(parents=True, exist_ok=True)
+        first_id = int(df['session_id'].min())
+        last_id = int(df['session_id'].max())
+        path = self.partitions_dir / f"part_{first_id:010d}_{last_id:010d}.parquet"
+        df.to_parquet(path, index=False)
+        return path
+
+    def read(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Loads the full EventFrame by concatenating all partitions in trial_id order."""
+        parts = self.list_partitions()
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(p, columns=columns) for p in parts], ignore_index=True)
+        # Parquet readers return text columns as object; re-infer them to the dtype run() emits
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].infer_objects()
+        return df
+
+    def reset(self):
+        """
+        Drops all partitions and the watermark. Only the files the store owns are
+        removed, so store_dir itself and anything else in it are left in place.
+        """
+        if self.partitions_dir.exists():
+            shutil.rmtree(self.partitions_dir)
+        for name in (self.WATERMARK_FILE, f"{self.WATERMARK_FILE}.tmp"):
+            (self.store_dir / name).unlink(missing_ok=True)
@@ -0,0 +1,192 @@
+"""
+c3_core.instrumentation
+
+Opt-in timing and memory instrumentation for the C3 Computation Pipeline (v4).
+
+Stage run() methods and their major sub-steps are wrapped with @instrumented
+(or the span() context manager). Outside of profile_run() the wrappers only
+check a context variable and call through. Inside profile_run() every span
+records wall time, CPU time, the tracemalloc peak above its starting point
+(when trace_memory=True), the process peak RSS and row counts in and out.
+Spans nest by call stack ("etl/melt", "scenarios/A0.2/pivot"); the finished
+run is appended as one JSON line to the run log.
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.c3_core.pipeline_config import PIPELINE_VERSIONS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RUN_LOG_FILE = "run_log.jsonl"
+
+# Global span order (spans of worker threads interleave with the main thread)
+_SPAN_SEQ = itertools.count(1)
+
+_ACTIVE_PROFILER: contextvars.ContextVar[Optional["RunProfiler"]] = contextvars.ContextVar(
+    "c3_active_profiler", default=None
+)
+_SPAN_PATH: contextvars.ContextVar[tuple] = contextvars.ContextVar("c3_span_path", default=())
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _count_rows(obj) -> Optional[int]:
+    if isinstance(obj, pd.DataFrame):
+        return int(len(obj))
+    if isinstance(obj, dict) and obj and all(isinstance(v, pd.DataFrame) for v in obj.values()):
+        return int(sum(len(v) for v in obj.values()))
+    return None
+
+
+class RunProfiler:
+    """Collects span records of one pipeline run."""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.records: List[Dict[str, Any]] = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._lock = threading.Lock()
+        # Running tracemalloc peaks of open spans (peak is reset at every span boundary)
+        self._open_peaks: Dict[int, List[int]] = {}
+
+    def _mark_memory(self):
+        """Folds the peak since the last boundary into all open spans and resets it."""
+        current, peak = tracemalloc.get_traced_memory()
+        for marks in self._open_peaks.values():
+            marks[1] = max(marks[1], peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def _enter(self, record: Dict[str, Any]):
+        if self.trace_memory:
+            with self._lock:
+                current = self._mark_memory()
+                self._open_peaks[id(record)] = [current, current]
+        record["_wall"] = time.perf_counter()
+        record["_cpu"] = time.process_time()
+
+    def _exit(self, record: Dict[str, Any]):
+        record["wall_s"] = round(time.perf_counter() - record.pop("_wall"), 6)
+        # process_time covers all threads of the process
+        record["cpu_s"] = round(time.process_time() - record.pop("_cpu"), 6)
+        if self.trace_memory:
+            with self._lock:
+                self._mark_memory()
+                start, peak = self._open_peaks.pop(id(record))
+            record["tracemalloc_peak_mb"] = round((peak - start) / 2**20, 3)
+        record["peak_rss_mb"] = _peak_rss_mb()
+        with self._lock:
+            self.records.append(record)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "pipeline_versions": dict(PIPELINE_VERSIONS),
+            "trace_memory": self.trace_memory,
+            "spans": sorted(self.records, key=lambda r: r["seq"]),
+        }
+
+    def write(self, log_path: str):
+        """Appends this run as one JSON line to log_path."""
+        path = Path(log_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+    def summary(self) -> str:
+        lines = []
+        for r in self.to_dict()["spans"]:
+            indent = "  " * r["path"].count("/")
+            rows = f" rows {r['rows_in']} -> {r['rows_out']}" if r["rows_out"] is not None else ""
+            lines.append(f"{indent}{r['name']}: {r['wall_s']:.3f}s wall, {r['cpu_s']:.3f}s cpu{rows}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def span(name: str, rows_in: Optional[int] = None):
+    """
+    Records a named span while a profile_run() is active.
+    Yields the span record (or None when profiling is off); set record["rows_out"] inside the block.
+    """
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is None:
+        yield None
+        return
+
+    path = _SPAN_PATH.get() + (name,)
+    record = {"seq": next(_SPAN_SEQ), "name": name, "path": "/".join(path),
+              "thread": threading.current_thread().name, "rows_in": rows_in, "rows_out": None}
+    token = _SPAN_PATH.set(path)
+    profiler._enter(record)
+    try:
+        yield record
+    finally:
+        profiler._exit(record)
+        _SPAN_PATH.reset(token)
+
+
+def instrumented(name: str):
+    """
+    Method/function decorator wrapping each call in span(name).
+    Rows in are taken from the first DataFrame argument, rows out from the result.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE_PROFILER.get() is None:
+                return func(*args, **kwargs)
+            rows_in = next((_count_rows(a) for a in args if isinstance(a, pd.DataFrame)), None)
+            with span(name, rows_in=rows_in) as record:
+                result = func(*args, **kwargs)
+                record["rows_out"] = _count_rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile_run(log_path: Optional[str] = None, trace_memory: bool = False):
+    """
+    Activates instrumentation for the enclosed pipeline run.
+
+    Args:
+        log_path: JSON-lines run log to append the run to (None = keep in memory only).
+        trace_memory: Track tracemalloc peaks per span (slower).
+
+    Yields:
+        The RunProfiler collecting the spans.
+    """
+    profiler = RunProfiler(trace_memory=trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _ACTIVE_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILER.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+        if log_path is not None:
+            profiler.write(log_path)
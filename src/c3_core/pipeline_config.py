@@ -6,8 +6,8 @@ Used to maintain architectural integrity and provenance in exported artifacts.
 """
 
 PIPELINE_VERSIONS = {
-    "etl_version": "etl_v4.1.2",
-    "component_algo_version": "component_v4.0.0",
-    "qc_version": "qc_aggregation_v4.0.1",
-    "scenario_version": "scenario_v4.0.3"
+    "etl_version": "etl_v4.1.3",
+    "component_algo_version": "component_v4.0.1",
+    "qc_version": "qc_aggregation_v4.0.2",
+    "scenario_version": "scenario_v4.0.4"
 }
@@ -2,12 +2,20 @@
 c3_core.qc_aggregation.qc_aggregation_v4
 
 Implementation of the C3.3 QC & Aggregation layer for model v4.
-Version: qc_aggregation_v4.0.0
+Version: qc_aggregation_v4.0.2
 Robust statistical aggregation using Median, MAD, and IQR.
 """
 
 import pandas as pd
 import numpy as np
+from src.c3_core.schema_registry import validate_frame, to_compact
+from src.c3_core.instrumentation import instrumented
+from src.c3_core.qc_aggregation.robust_kernel import robust_group_stats
+
+# Aggregation engines:
+# - "kernel": single sort + vectorized median/MAD/IQR over padded group slices
+# - "pandas": reference implementation, groupby with per-group Python lambdas
+AGGREGATION_ENGINES = ("kernel", "pandas")
 
 class QCAggregationV4:
     """
@@ -15,9 +23,14 @@ class QCAggregationV4:
     Processes ComponentFrame into AggregatedFrame.
     """
     
-    def __init__(self):
-        pass
+    def __init__(self, compact_schema: bool = False, engine: str = "kernel"):
+        if engine not in AGGREGATION_ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Expected one of {AGGREGATION_ENGINES}")
+        # Expect a compact ComponentFrame on entry and emit a compact AggregatedFrame
+        self.compact_schema = compact_schema
+        self.engine = engine
 
+    @instrumented("qc_aggregation")
     def run(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Executes QC filtering and robust aggregation.
@@ -28,15 +41,53 @@ class QCAggregationV4:
         Returns:
             AggregatedFrame (DataFrame) with robust stats per session/test.
         """
+        validate_frame(df, 'ComponentFrame', compact=self.compact_schema)
+        
         # 1. Apply QC filter (only keep valid events for computation)
         # Note: We do NOT delete rows from the input, we just filter for aggregation
         valid_df = df[df['technical_qc_flag'] == True].copy()
         
         if valid_df.empty:
             # Return empty structure if no valid data
-            return self._create_empty_aggregated_frame()
+            return self._apply_schema(self._create_empty_aggregated_frame())
             
-        # 2. Define robust aggregation functions
+        # 2. Grouping
+        # subject_id, session_id, and stimulus_location are needed for symmetry analysis
+        group_cols = ['subject_id', 'session_id', 'test_type', 'stimulus_location']
+        val_cols = ['rt_ms', 'ΔV1', 'ΔV4', 'ΔV5_MT']
+        
+        # 3. Aggregate
+        if self.engine == "kernel":
+            agg_frame = robust_group_stats(valid_df, group_cols, val_cols)
+        else:
+            agg_frame = self._aggregate_pandas(valid_df, group_cols, val_cols)
+        
+        # Add basic subject metadata (age, sex) back to the aggregated frame
+        # These are constant per subject/session, so we can just grab the first value
+        metadata = valid_df.groupby(['subject_id', 'session_id'], observed=True).agg({
+            'age': 'first',
+            'sex': 'first'
+        }).reset_index()
+        
+        agg_frame = pd.merge(agg_frame, metadata, on=['subject_id', 'session_id'], how='left')
+        
+        # Final column reordering for readability
+        ordered_cols = [
+            'subject_id', 'session_id', 'age', 'sex', 'test_type', 'stimulus_location', 'count_valid',
+            'median_rt_ms', 'mad_rt_ms', 'iqr_rt_ms',
+            'median_ΔV1', 'mad_ΔV1', 'iqr_ΔV1',
+            'median_ΔV4', 'mad_ΔV4', 'iqr_ΔV4',
+            'median_ΔV5_MT', 'mad_ΔV5_MT', 'iqr_ΔV5_MT'
+        ]
+        
+        # Handle cases where some ΔV columns might be all NaN (e.g. if Tst1 baseline was missing)
+        present_cols = [c for c in ordered_cols if c in agg_frame.columns]
+        
+        return self._apply_schema(agg_frame[present_cols])
+
+    @instrumented("aggregate")
+    def _aggregate_pandas(self, valid_df: pd.DataFrame, group_cols: list, val_cols: list) -> pd.DataFrame:
+        """Reference aggregation: three groupby passes joined by merges."""
         def mad(x):
             m = x.median()
             return (x - m).abs().median()
@@ -44,13 +95,8 @@ class QCAggregationV4:
         def iqr(x):
             return x.quantile(0.75) - x.quantile(0.25)
 
-        # 3. Grouping
-        # subject_id, session_id, and stimulus_location are needed for symmetry analysis
-        group_cols = ['subject_id', 'session_id', 'test_type', 'stimulus_location']
-        val_cols = ['rt_ms', 'ΔV1', 'ΔV4', 'ΔV5_MT']
-        
-        # 4. Aggregate
-        grouped = valid_df.groupby(group_cols)
+        # observed=True: categorical keys (compact schema) must not expand to unseen combinations
+        grouped = valid_df.groupby(group_cols, observed=True)
         
         # Count valid responses per group
         counts = grouped.size().reset_index(name='count_valid')
@@ -67,33 +113,17 @@ class QCAggregationV4:
         iqrs = grouped[val_cols].agg(iqr).reset_index()
         iqrs = iqrs.rename(columns={c: f"iqr_{c}" for c in val_cols})
         
-        # 5. Merge all metrics
+        # Merge all metrics
         agg_frame = pd.merge(counts, medians, on=group_cols)
         agg_frame = pd.merge(agg_frame, mads, on=group_cols)
         agg_frame = pd.merge(agg_frame, iqrs, on=group_cols)
         
-        # Add basic subject metadata (age, sex) back to the aggregated frame
-        # These are constant per subject/session, so we can just grab the first value
-        metadata = valid_df.groupby(['subject_id', 'session_id']).agg({
-            'age': 'first',
-            'sex': 'first'
-        }).reset_index()
-        
-        agg_frame = pd.merge(agg_frame, metadata, on=['subject_id', 'session_id'], how='left')
-        
-        # Final column reordering for readability
-        ordered_cols = [
-            'subject_id', 'session_id', 'age', 'sex', 'test_type', 'stimulus_location', 'count_valid',
-            'median_rt_ms', 'mad_rt_ms', 'iqr_rt_ms',
-            'median_ΔV1', 'mad_ΔV1', 'iqr_ΔV1',
-            'median_ΔV4', 'mad_ΔV4', 'iqr_ΔV4',
-            'median_ΔV5_MT', 'mad_ΔV5_MT', 'iqr_ΔV5_MT'
-        ]
-        
-        # Handle cases where some ΔV columns might be all NaN (e.g. if Tst1 baseline was missing)
-        present_cols = [c for c in ordered_cols if c in agg_frame.columns]
-        
-        return agg_frame[present_cols]
+        return agg_frame
+
+    def _apply_schema(self, agg_frame: pd.DataFrame) -> pd.DataFrame:
+        if self.compact_schema:
+            return to_compact(agg_frame, 'AggregatedFrame')
+        return agg_frame
 
     def _create_empty_aggregated_frame(self) -> pd.DataFrame:
         cols = [
@@ -0,0 +1,108 @@
+"""
+c3_core.scenario_engine.execution_context
+
+Scenario execution context for the C3.4 Scenario Computation layer.
+Shared intermediates of the AggregatedFrame (Tst1 slice, pivots, subject-level
+medians) are computed once per run and handed to every scenario read-only.
+Scenarios declare the intermediates they use with the @requires decorator.
+Scenario results are published back into the context under their scenario ID,
+so downstream scenarios can require them like any other intermediate.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable
+
+import pandas as pd
+
+from src.c3_core.instrumentation import span
+
+
+# Metrics of the ΔV1 session pivot (superset of what A0.0 and A0.1 read)
+SESSION_PIVOT_VALUES = ['count_valid', 'median_ΔV1', 'mad_ΔV1', 'iqr_ΔV1']
+SUBJECT_LOCATION_VALUES = ['median_ΔV1', 'mad_ΔV1', 'iqr_ΔV1']
+
+
+def requires(*intermediates: str):
+    """Declares the shared intermediates a scenario method reads from its ScenarioContext."""
+    def decorator(func):
+        func.required_intermediates = tuple(intermediates)
+        return func
+    return decorator
+
+
+def _build_tst1(ctx: "ScenarioContext") -> pd.DataFrame:
+    df = ctx.frame
+    return df[df['test_type'] == 'Tst1']
+
+
+def _build_tst1_session_pivot(ctx: "ScenarioContext") -> pd.DataFrame:
+    tst1 = ctx.get("tst1")
+    return tst1.pivot(index=['subject_id', 'session_id'], columns='stimulus_location',
+                      values=SESSION_PIVOT_VALUES)
+
+
+def _build_tst1_subject_location_medians(ctx: "ScenarioContext") -> pd.DataFrame:
+    tst1 = ctx.get("tst1")
+    grouped = tst1.groupby(['subject_id', 'stimulus_location'], observed=True)
+    return grouped[SUBJECT_LOCATION_VALUES].median().reset_index()
+
+
+class ScenarioContext:
+    """
+    Lazily computed, memoized intermediates of one AggregatedFrame.
+
+    Intermediates are shared between scenarios and must be treated as read-only;
+    scenarios derive new frames from them instead of modifying them in place.
+    Access is thread-safe: concurrent scenarios requesting the same intermediate
+    wait for a single computation.
+    """
+
+    # Intermediate name -> builder(ctx)
+    INTERMEDIATES: Dict[str, Callable[["ScenarioContext"], pd.DataFrame]] = {
+        "tst1": _build_tst1,
+        "tst1_session_pivot": _build_tst1_session_pivot,
+        "tst1_subject_location_medians": _build_tst1_subject_location_medians,
+    }
+
+    def __init__(self, df: pd.DataFrame):
+        self.frame = df
+        self._cache: Dict[str, pd.DataFrame] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @classmethod
+    def register_intermediate(cls, name: str, builder: Callable[["ScenarioContext"], pd.DataFrame]):
+        """Registers a new shared intermediate (e.g. for A1 or B-level scenarios)."""
+        if name in cls.INTERMEDIATES:
+            raise ValueError(f"Intermediate '{name}' is already registered")
+        cls.INTERMEDIATES = {**cls.INTERMEDIATES, name: builder}
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> pd.DataFrame:
+        if name in self._cache:
+            return self._cache[name]
+        with self._lock_for(name):
+            if name not in self._cache:
+                if name not in self.INTERMEDIATES:
+                    raise KeyError(f"Unknown scenario intermediate '{name}'")
+                with span(name) as record:
+                    self._cache[name] = self.INTERMEDIATES[name](self)
+                    if record is not None:
+                        record["rows_out"] = len(self._cache[name])
+        return self._cache[name]
+
+    def publish(self, name: str, df: pd.DataFrame):
+        """Stores a scenario result so that downstream scenarios can require it."""
+        with self._lock_for(name):
+            self._cache[name] = df
+
+    def prepare(self, names: Iterable[str]):
+        """Computes the given intermediates up front."""
+        for name in names:
+            self.get(name)
+
+    def computed(self) -> list:
+        return list(self._cache)
@@ -0,0 +1,143 @@
+"""
+c3_core.scenario_engine.scenario_export
+
+Manifest-based scenario export for the C3.4 Scenario Computation layer.
+
+Each scenario is written as compressed Parquet with row groups and column
+statistics, optionally split into files by subject_id range, and described in
+a manifest.json (row counts, schema, PIPELINE_VERSIONS, per-file SHA-256, size
+and mtime). Consumers can read selected columns or subject ranges and skip files
+whose checksum has not changed since they last loaded them. A legacy export into
+the same directory removes the manifest (remove_manifest).
+
+Layout:
+    <output_dir>/manifest.json
+    <output_dir>/A0_0.parquet                              (unpartitioned)
+    <output_dir>/A0_0/subjects_<first>_<last>.parquet      (partitioned by subject range)
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+import pandas as pd
+
+from src.c3_core.pipeline_config import PIPELINE_VERSIONS
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = "c3_scenario_export/1"
+EXPORT_COMPRESSION = "ZSTD"
+EXPORT_ROW_GROUP_SIZE = 50_000
+
+
+def scenario_file_stem(scenario_id: str) -> str:
+    """Sanitized file name of a scenario (e.g. A0.0 -> A0_0)."""
+    return scenario_id.replace(".", "_")
+
+
+def file_checksum(path) -> str:
+    """SHA-256 of an exported file (scenario exports are small enough to hash in one read)."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, row_group_size: int, compression: str) -> Dict[str, Any]:
+    df.to_parquet(path, engine="fastparquet", index=False, compression=compression,
+                  row_group_offsets=row_group_size, stats=True)
+    stat = path.stat()
+    entry = {"rows": int(len(df)), "sha256": file_checksum(path),
+             "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if 'subject_id' in df.columns and len(df):
+        entry["subject_id_min"] = int(df['subject_id'].min())
+        entry["subject_id_max"] = int(df['subject_id'].max())
+    return entry
+
+
+def export_dataset(results: Dict[str, pd.DataFrame], output_dir: str,
+                   subjects_per_file: Optional[int] = None,
+                   row_group_size: int = EXPORT_ROW_GROUP_SIZE,
+                   compression: str = EXPORT_COMPRESSION) -> Dict[str, Any]:
+    """
+    Writes scenario results with a manifest.
+
+    Args:
+        results: Scenario ID -> DataFrame, as returned by ScenarioEngineV4.run.
+        output_dir: Target directory.
+        subjects_per_file: Width of the subject_id ranges to split each scenario into
+            (None = one file per scenario).
+        row_group_size: Rows per Parquet row group.
+        compression: Parquet codec supported by fastparquet.
+
+    Returns:
+        The manifest dictionary (also written to <output_dir>/manifest.json).
+    """
+    if subjects_per_file is not None and subjects_per_file < 1:
+        raise ValueError(f"subjects_per_file must be >= 1, got {subjects_per_file}")
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "pipeline_versions": dict(PIPELINE_VERSIONS),
+        "compression": compression,
+        "row_group_size": row_group_size,
+        "subjects_per_file": subjects_per_file,
+        "scenarios": {},
+    }
+
+    for scenario_id, df in results.items():
+        stem = scenario_file_stem(scenario_id)
+        files = []
+        # Empty scenarios are recorded without files, as export_results skips them
+        if not df.empty:
+            if subjects_per_file is None or 'subject_id' not in df.columns:
+                path = out / f"{stem}.parquet"
+                files.append({"path": path.name, **_write_parquet(df, path, row_group_size, compression)})
+            else:
+                part_dir = out / stem
+                part_dir.mkdir(exist_ok=True)
+                for stale in part_dir.glob("subjects_*.parquet"):
+                    stale.unlink()
+                bucket = df['subject_id'] // subjects_per_file
+                for b, part in df.groupby(bucket, sort=True):
+                    first = int(b) * subjects_per_file
+                    last = first + subjects_per_file - 1
+                    path = part_dir / f"subjects_{first:08d}_{last:08d}.parquet"
+                    part = part.reset_index(drop=True)
+                    entry = _write_parquet(part, path, row_group_size, compression)
+                    files.append({"path": f"{stem}/{path.name}", **entry})
+
+        manifest["scenarios"][scenario_id] = {
+            "rows": int(len(df)),
+            "schema": {col: str(dtype) for col, dtype in df.dtypes.items()},
+            "files": files,
+        }
+
+    # Manifest is replaced last; readers holding the old one detect rewritten files by checksum
+    tmp_path = out / f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    tmp_path.replace(out / MANIFEST_FILE)
+    return manifest
+
+
+def read_manifest(output_dir) -> Optional[Dict[str, Any]]:
+    """Returns the export manifest of a directory, or None for legacy (manifest-less) exports."""
+    path = Path(output_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def remove_manifest(output_dir) -> bool:
+    """
+    Deletes the manifest of a directory (before a legacy export overwrites its files,
+    so readers do not prefer a manifest describing older data). Returns True if one existed.
+    """
+    path = Path(output_dir) / MANIFEST_FILE
+    if not path.exists():
+        return False
+    path.unlink()
+    return True
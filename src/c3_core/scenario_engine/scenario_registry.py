@@ -0,0 +1,103 @@
+"""
+c3_core.scenario_engine.scenario_registry
+
+Scenario registry for the C3.4 Scenario Computation layer.
+Each scenario declares its inputs (shared intermediates of the ScenarioContext
+or results of upstream scenarios) and its output (the scenario ID). The registry
+resolves the dependency DAG into waves of mutually independent scenarios that the
+engine can execute concurrently.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    """Declaration of one scenario: the engine method computing it and its inputs."""
+    scenario_id: str
+    method: str
+    inputs: Tuple[str, ...] = ()
+    kwargs: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def output(self) -> str:
+        return self.scenario_id
+
+
+class ScenarioRegistry:
+    """
+    Ordered collection of ScenarioSpecs.
+    Registration order defines the order of results returned by the engine.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, ScenarioSpec] = {}
+
+    def register(self, spec: ScenarioSpec):
+        if spec.scenario_id in self._specs:
+            raise ValueError(f"Scenario '{spec.scenario_id}' is already registered")
+        self._specs[spec.scenario_id] = spec
+
+    def scenario(self, scenario_id: str, **kwargs):
+        """
+        Method decorator registering a scenario. Inputs are taken from the
+        required_intermediates declared with @requires (apply @requires first).
+        """
+        def decorator(func):
+            inputs = getattr(func, 'required_intermediates', ())
+            self.register(ScenarioSpec(scenario_id, func.__name__, tuple(inputs), dict(kwargs)))
+            return func
+        return decorator
+
+    def __contains__(self, scenario_id: str) -> bool:
+        return scenario_id in self._specs
+
+    def __getitem__(self, scenario_id: str) -> ScenarioSpec:
+        return self._specs[scenario_id]
+
+    def ids(self) -> List[str]:
+        return list(self._specs)
+
+    def upstream(self, scenario_id: str) -> List[str]:
+        """Scenario IDs whose outputs the given scenario consumes."""
+        return [name for name in self._specs[scenario_id].inputs if name in self._specs]
+
+    def resolve(self, only: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Returns the requested scenarios plus everything they transitively depend on,
+        in registration order. All scenarios are returned when only is None.
+        """
+        if only is None:
+            return self.ids()
+
+        unknown = [sid for sid in only if sid not in self._specs]
+        if unknown:
+            raise ValueError(f"Unknown scenario(s): {unknown}. Registered: {self.ids()}")
+
+        selected = set()
+        stack = list(only)
+        while stack:
+            sid = stack.pop()
+            if sid not in selected:
+                selected.add(sid)
+                stack.extend(self.upstream(sid))
+        return [sid for sid in self._specs if sid in selected]
+
+    def waves(self, scenario_ids: List[str]) -> List[List[str]]:
+        """
+        Topological layering of the given scenarios: every scenario of a wave only
+        depends on scenarios of earlier waves. Raises ValueError on cycles.
+        """
+        pending = list(scenario_ids)
+        done = set()
+        waves = []
+        while pending:
+            wave = [sid for sid in pending
+                    if all(dep in done or dep not in pending for dep in self.upstream(sid))]
+            if not wave:
+                raise ValueError(f"Cyclic scenario dependencies among: {pending}")
+            waves.append(wave)
+            done.update(wave)
+            pending = [sid for sid in pending if sid not in done]
+        return waves
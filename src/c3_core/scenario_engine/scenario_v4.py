@@ -2,14 +2,27 @@
 c3_core.scenario_engine.scenario_v4
 
 Implementation of the C3.4 Scenario Computation layer for model v4.
-Version: scenario_v4.0.0
+Version: scenario_v4.0.4
 Initiates A0 baseline scenarios based on AggregatedFrame data.
 """
 
+import contextvars
 import pandas as pd
 import numpy as np
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
 from src.c3_core.pipeline_config import PIPELINE_VERSIONS
+from src.c3_core.instrumentation import instrumented, span
+from src.c3_core.schema_registry import STIMULUS_LOCATIONS
+from src.c3_core.scenario_engine.execution_context import ScenarioContext, requires
+from src.c3_core.scenario_engine.scenario_registry import ScenarioRegistry
+from src.c3_core.scenario_engine.scenario_export import export_dataset, remove_manifest, scenario_file_stem
+
+# Export layouts: one plain fastparquet file per scenario, or compressed files with manifest.json
+EXPORT_MODES = ("legacy", "manifest")
+
+# Registered A0 scenarios (registration order = result order)
+SCENARIOS = ScenarioRegistry()
 
 class ScenarioEngineV4:
     """
@@ -17,58 +30,129 @@ class ScenarioEngineV4:
     Processes AggregatedFrame into scenario-specific outputs.
     """
     
-    def __init__(self):
-        pass
+    registry = SCENARIOS
 
-    def run(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    def __init__(self, max_workers: Optional[int] = None):
         """
-        Executes all active scenarios.
+        Args:
+            max_workers: Size of the thread pool running independent scenarios
+                concurrently (None = ThreadPoolExecutor default, 1 = serial).
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
+        self.max_workers = max_workers
+
+    @instrumented("scenarios")
+    def run(self, df: pd.DataFrame, only: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Executes all active scenarios, or only the requested ones plus their upstream scenarios.
+        
+        Scenarios are resolved from the registry into dependency waves; scenarios of one
+        wave are independent and run concurrently. Results are identical to serial execution
+        and returned in registration order.
         
         Args:
             df: AggregatedFrame from C3.3.
+            only: Optional list of scenario IDs (e.g. ["A0.2"]).
             
         Returns:
             Dictionary with scenario IDs as keys and DataFrames as values.
         """
-        results = {}
+        only = list(only) if only is not None else None
+        scenario_ids = self.registry.resolve(only)
+        
+        # Shared intermediates are computed once and handed to every scenario
+        context = ScenarioContext(df)
         
-        # Scenario A0.0
-        results["A0.0"] = self.run_a0_0(df)
+        # Fail-fast: spatial triad is validated once for all A0 scenarios
+        self.validate_location_triads(context.get("tst1"))
         
-        # Scenario A0.1
-        results["A0.1"] = self.run_a0_1(df)
+        results = {}
+        for wave in self.registry.waves(scenario_ids):
+            if self.max_workers == 1 or len(wave) == 1:
+                wave_results = [self._run_scenario(sid, df, context) for sid in wave]
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    # Each task runs in a copy of the caller's context so instrumentation spans nest under run()
+                    futures = [pool.submit(contextvars.copy_context().run, self._run_scenario, sid, df, context)
+                               for sid in wave]
+                    # Collected in submission order, so the first failing scenario is deterministic
+                    wave_results = [future.result() for future in futures]
+            for sid, result in zip(wave, wave_results):
+                context.publish(sid, result)
+                results[sid] = result
+        
+        return {sid: results[sid] for sid in scenario_ids if only is None or sid in only}
 
-        # Scenario A0.2
-        results["A0.2"] = self.run_a0_2(df)
+    def _run_scenario(self, scenario_id: str, df: pd.DataFrame, context: ScenarioContext) -> pd.DataFrame:
+        spec = self.registry[scenario_id]
+        with span(scenario_id, rows_in=len(df)) as record:
+            result = getattr(self, spec.method)(df, context=context, **spec.kwargs)
+            if record is not None:
+                record["rows_out"] = len(result)
+        return result
 
-        # Scenario A0.3
-        results["A0.3"] = self.run_a0_3(df)
+    @instrumented("validate")
+    def validate_location_triads(self, df: pd.DataFrame):
+        """
+        Fail-fast spatial check (v4.0.3): every Tst1 session must cover exactly the
+        left/center/right triad. All offending sessions are reported in a single ValueError.
+        """
+        tst1 = df[df['test_type'] == 'Tst1']
+        if tst1.empty:
+            return
+        
+        if 'stimulus_location' not in tst1.columns:
+            raise ValueError("Spatial dimension missing in AggregatedFrame (v4.0.1+ required)")
         
-        return results
+        in_triad = tst1['stimulus_location'].isin(STIMULUS_LOCATIONS)
+        per_session = pd.DataFrame({
+            'subject_id': tst1['subject_id'],
+            'session_id': tst1['session_id'],
+            'triad_location': tst1['stimulus_location'].where(in_triad),
+            'foreign_location': ~in_triad
+        }).groupby(['subject_id', 'session_id'], observed=True).agg(
+            n_locations=('triad_location', 'nunique'),
+            n_foreign=('foreign_location', 'sum')
+        )
+        
+        offending = per_session[
+            (per_session['n_locations'] != len(STIMULUS_LOCATIONS)) | (per_session['n_foreign'] > 0)
+        ].index
+        if len(offending) == 0:
+            return
+        
+        bad_rows = tst1.set_index(['subject_id', 'session_id']).loc[offending, 'stimulus_location']
+        details = [
+            f"Subject {sid}, Session {sess}: {set(group)}"
+            for (sid, sess), group in bad_rows.groupby(level=[0, 1], observed=True)
+        ]
+        raise ValueError(
+            f"Incomplete location triad for {len(details)} session(s): " + "; ".join(details)
+        )
 
-    def run_a0_0(self, df: pd.DataFrame) -> pd.DataFrame:
+    @SCENARIOS.scenario("A0.0", validate=False)
+    @requires("tst1", "tst1_session_pivot")
+    def run_a0_0(self, df: pd.DataFrame, validate: bool = True,
+                 context: Optional[ScenarioContext] = None) -> pd.DataFrame:
         """
         A0.0 — ΔV1 Baseline Stability.
         Uses Tst1 data to establish the baseline stability of the V1 component.
         """
+        context = context or ScenarioContext(df)
+        
         # 1. Select Tst1 only
-        tst1 = df[df['test_type'] == 'Tst1'].copy()
+        tst1 = context.get("tst1")
         
         if tst1.empty:
             return pd.DataFrame()
             
-        # 2. Fail-fast: Spatial dimension and triad check (v4.0.3)
-        if 'stimulus_location' not in tst1.columns:
-            raise ValueError("Spatial dimension missing in AggregatedFrame (v4.0.1+ required)")
-            
-        # Verify triad for each session
-        for (sid, sess), group in tst1.groupby(['subject_id', 'session_id']):
-            if set(group['stimulus_location']) != {'left', 'center', 'right'}:
-                raise ValueError(f"Incomplete location triad for Subject {sid}, Session {sess}: {set(group['stimulus_location'])}")
+        # 2. Fail-fast: Spatial dimension and triad check (v4.0.3), skipped when run() already validated
+        if validate:
+            self.validate_location_triads(tst1)
 
-        # 3. Pivot to wide format with strict mapping
-        pivot = tst1.pivot(index=['subject_id', 'session_id'], columns='stimulus_location', 
-                            values=['count_valid', 'median_ΔV1', 'mad_ΔV1', 'iqr_ΔV1'])
+        # 3. Pivot to wide format with strict mapping (shared session×location pivot)
+        pivot = context.get("tst1_session_pivot")
         
         mapping = {
             ('count_valid', 'left'): 'count_valid_left',
@@ -96,28 +180,28 @@ class ScenarioEngineV4:
         
         return res.sort_values(by=['subject_id', 'session_id']).reset_index(drop=True)
 
-    def run_a0_1(self, df: pd.DataFrame) -> pd.DataFrame:
+    @SCENARIOS.scenario("A0.1", validate=False)
+    @requires("tst1", "tst1_session_pivot")
+    def run_a0_1(self, df: pd.DataFrame, validate: bool = True,
+                 context: Optional[ScenarioContext] = None) -> pd.DataFrame:
         """
         A0.1 — ΔV1 Variability Profile.
         Focuses on the variability metrics of the V1 component.
         """
+        context = context or ScenarioContext(df)
+        
         # 1. Select Tst1 only
-        tst1 = df[df['test_type'] == 'Tst1'].copy()
+        tst1 = context.get("tst1")
         
         if tst1.empty:
             return pd.DataFrame()
             
-        # 2. Fail-fast: Spatial dimension and triad check (v4.0.3)
-        if 'stimulus_location' not in tst1.columns:
-            raise ValueError("Spatial dimension missing in AggregatedFrame (v4.0.1+ required)")
-            
-        for (sid, sess), group in tst1.groupby(['subject_id', 'session_id']):
-            if set(group['stimulus_location']) != {'left', 'center', 'right'}:
-                raise ValueError(f"Incomplete location triad for Subject {sid}, Session {sess}: {set(group['stimulus_location'])}")
+        # 2. Fail-fast: Spatial dimension and triad check (v4.0.3), skipped when run() already validated
+        if validate:
+            self.validate_location_triads(tst1)
 
-        # 3. Pivot to wide format with strict mapping
-        pivot = tst1.pivot(index=['subject_id', 'session_id'], columns='stimulus_location', 
-                            values=['mad_ΔV1', 'iqr_ΔV1'])
+        # 3. Pivot to wide format with strict mapping (shared session×location pivot)
+        pivot = context.get("tst1_session_pivot")
         
         mapping = {
             ('mad_ΔV1', 'left'): 'variability_mad_left',
@@ -139,13 +223,17 @@ class ScenarioEngineV4:
         
         return res.sort_values(by=['subject_id', 'session_id']).reset_index(drop=True)
 
-    def run_a0_2(self, df: pd.DataFrame) -> pd.DataFrame:
+    @SCENARIOS.scenario("A0.2")
+    @requires("tst1")
+    def run_a0_2(self, df: pd.DataFrame, context: Optional[ScenarioContext] = None) -> pd.DataFrame:
         """
         A0.2 — Population Structures of ΔV1.
         Aggregates session-level ΔV1 stats to subject-level structural profile.
         """
+        context = context or ScenarioContext(df)
+        
         # 1. Select Tst1 only
-        tst1 = df[df['test_type'] == 'Tst1'].copy()
+        tst1 = context.get("tst1")
         if tst1.empty:
             return pd.DataFrame()
 
@@ -168,13 +256,17 @@ class ScenarioEngineV4:
 
         return sub_stats
 
-    def run_a0_3(self, df: pd.DataFrame) -> pd.DataFrame:
+    @SCENARIOS.scenario("A0.3")
+    @requires("tst1", "tst1_subject_location_medians")
+    def run_a0_3(self, df: pd.DataFrame, context: Optional[ScenarioContext] = None) -> pd.DataFrame:
         """
         A0.3 — Architectural Symmetry (ΔV1).
         Analyzes differences in ΔV1 across left, center, and right fields.
         """
+        context = context or ScenarioContext(df)
+        
         # 1. Select Tst1 only
-        tst1 = df[df['test_type'] == 'Tst1'].copy()
+        tst1 = context.get("tst1")
         if tst1.empty:
             return pd.DataFrame()
 
@@ -182,9 +274,8 @@ class ScenarioEngineV4:
         # Columns in agg frame are median_ΔV1, mad_ΔV1, iqr_ΔV1
         # Each row is (subject, session, location)
         
-        # We first aggregate to subject-location level (median across sessions)
-        grouped = tst1.groupby(['subject_id', 'stimulus_location'])
-        stats = grouped[['median_ΔV1', 'mad_ΔV1', 'iqr_ΔV1']].median().reset_index()
+        # We first aggregate to subject-location level (median across sessions, shared intermediate)
+        stats = context.get("tst1_subject_location_medians")
 
         # 3. Pivot to wide format with strict mapping
         # Columns in 'stats' are subject_id, stimulus_location, median_ΔV1, mad_ΔV1, iqr_ΔV1
@@ -231,18 +322,36 @@ class ScenarioEngineV4:
 
         return pivot_final
 
-    def export_results(self, results: Dict[str, pd.DataFrame], output_dir: str):
+    def export_results(self, results: Dict[str, pd.DataFrame], output_dir: str,
+                       mode: str = "legacy", subjects_per_file: Optional[int] = None):
         """
         Exports scenario results to Parquet files using fastparquet.
+        
+        mode="manifest" writes compressed files with row groups and statistics, optionally
+        split by subject_id range (subjects_per_file), plus manifest.json
+        (see scenario_export.export_dataset). mode="legacy" removes an existing
+        manifest.json from output_dir.
         """
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export mode '{mode}'. Expected one of {EXPORT_MODES}")
+        
+        if mode == "manifest":
+            manifest = export_dataset(results, output_dir, subjects_per_file=subjects_per_file)
+            for name, entry in manifest["scenarios"].items():
+                print(f"Exported Scenario {name}: {entry['rows']} rows in {len(entry['files'])} file(s)")
+            return
+        
         import os
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        # A manifest from an earlier manifest-mode export would describe the old files
+        if remove_manifest(output_dir):
+            print(f"Removed stale {output_dir}/manifest.json")
             
         for name, df in results.items():
             if not df.empty:
                 # Sanitize name for filename (e.g. A0.0 -> A0_0)
-                safe_name = name.replace(".", "_")
+                safe_name = scenario_file_stem(name)
                 path = os.path.join(output_dir, f"{safe_name}.parquet")
                 df.to_parquet(path, engine="fastparquet", index=False)
                 print(f"Exported Scenario {name} to {path}")
@@ -0,0 +1,111 @@
+"""
+c3_core.schema_registry
+
+Centralized frame schema registry for the C3 Computation Pipeline (v4).
+Defines the columns each stage expects on entry and the compact dtypes
+(fixed-order categoricals, narrow ints, float32 values) used when a stage
+runs with compact_schema=True.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.c3_core.instrumentation import instrumented
+
+# Fixed category orders (shared by all stages so codes are stable across frames)
+TEST_TYPES = ['Tst1', 'Tst2', 'Tst3']
+SEX_VALUES = ['F', 'M']
+STIMULUS_COLORS = ['red', 'green', 'blue']
+STIMULUS_LOCATIONS = ['left', 'center', 'right']
+
+COMPACT_DTYPES = {
+    'subject_id': np.dtype('int32'),
+    'session_id': np.dtype('int32'),
+    'age': np.dtype('float32'),
+    'sex': pd.CategoricalDtype(SEX_VALUES, ordered=False),
+    'test_type': pd.CategoricalDtype(TEST_TYPES, ordered=False),
+    'stimulus_index': np.dtype('int16'),
+    'rt_ms': np.dtype('float32'),
+    'psi_pre_ms': np.dtype('float32'),
+    'stimulus_color': pd.CategoricalDtype(STIMULUS_COLORS, ordered=False),
+    'stimulus_location': pd.CategoricalDtype(STIMULUS_LOCATIONS, ordered=False),
+    'shift_parameter': np.dtype('float32'),
+    'technical_qc_flag': np.dtype('bool'),
+    'ΔV1': np.dtype('float32'),
+    'ΔV4': np.dtype('float32'),
+    'ΔV5_MT': np.dtype('float32'),
+    'count_valid': np.dtype('int16'),
+}
+
+_EVENT_COLUMNS = [
+    'subject_id', 'session_id', 'age', 'sex', 'test_type',
+    'stimulus_index', 'rt_ms', 'psi_pre_ms',
+    'stimulus_color', 'stimulus_location', 'technical_qc_flag'
+]
+
+_AGGREGATED_STATS = [
+    f"{stat}_{col}" for col in ['rt_ms', 'ΔV1', 'ΔV4', 'ΔV5_MT'] for stat in ['median', 'mad', 'iqr']
+]
+
+# Frame name -> required columns
+FRAME_SCHEMAS = {
+    'EventFrame': _EVENT_COLUMNS,
+    'ComponentFrame': _EVENT_COLUMNS + ['ΔV1', 'ΔV4', 'ΔV5_MT'],
+    'AggregatedFrame': [
+        'subject_id', 'session_id', 'age', 'sex', 'test_type', 'stimulus_location', 'count_valid'
+    ] + _AGGREGATED_STATS,
+}
+
+
+def compact_dtype(column: str):
+    """Compact dtype of a registered column (aggregated stats inherit float32)."""
+    if column in COMPACT_DTYPES:
+        return COMPACT_DTYPES[column]
+    if column in _AGGREGATED_STATS:
+        return np.dtype('float32')
+    return None
+
+
+def to_compact(df: pd.DataFrame, frame_name: str) -> pd.DataFrame:
+    """
+    Casts the registered columns of df to their compact dtypes.
+    Raises ValueError if a categorical column holds a value outside its fixed categories.
+    """
+    if frame_name not in FRAME_SCHEMAS:
+        raise ValueError(f"Unknown frame '{frame_name}'. Registered: {list(FRAME_SCHEMAS)}")
+
+    casts = {}
+    for col in df.columns:
+        dtype = compact_dtype(col)
+        if dtype is None or df[col].dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            unknown = set(df[col].dropna().unique()) - set(dtype.categories)
+            if unknown:
+                raise ValueError(f"{frame_name}: column '{col}' has values outside fixed categories: {sorted(unknown)}")
+        casts[col] = dtype
+
+    return df.astype(casts) if casts else df
+
+
+@instrumented("validate")
+def validate_frame(df: pd.DataFrame, frame_name: str, compact: bool = False):
+    """
+    Entry check for a pipeline stage.
+    Verifies that all required columns of frame_name are present and, when compact=True,
+    that every registered column carries its compact dtype.
+    """
+    if frame_name not in FRAME_SCHEMAS:
+        raise ValueError(f"Unknown frame '{frame_name}'. Registered: {list(FRAME_SCHEMAS)}")
+
+    missing = [c for c in FRAME_SCHEMAS[frame_name] if c not in df.columns]
+    if missing:
+        raise ValueError(f"{frame_name} is missing required columns: {missing}")
+
+    if compact:
+        mismatched = {
+            col: str(df[col].dtype) for col in df.columns
+            if compact_dtype(col) is not None and df[col].dtype != compact_dtype(col)
+        }
+        if mismatched:
+            raise TypeError(f"{frame_name} does not match the compact schema: {mismatched}")
@@ -0,0 +1,189 @@
+"""
+c3_core.stage_cache
+
+Content-addressed artifact cache for the C3 Computation Pipeline (v4).
+
+Every stage output is stored under a key derived from the upstream key and the
+stage's version string in PIPELINE_VERSIONS (plus the stage options that change
+its output). The ETL key starts the chain from a content hash of the source
+database. Any change to the database, a stage version or its options therefore
+changes the key of that stage and of everything downstream, while unchanged
+stages are loaded from disk instead of being recomputed.
+
+Layout:
+    <cache_dir>/<stage>/<key>/<frame_name>.parquet
+    <cache_dir>/<stage>/<key>/meta.json     (written last; marks a complete entry)
+"""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, Optional, Any
+
+import pandas as pd
+
+from src.c3_core.pipeline_config import PIPELINE_VERSIONS
+from src.c3_core.etl.etl_v4 import ETLPipeline
+from src.c3_core.component_timing.component_v4 import ComponentTimingV4
+from src.c3_core.qc_aggregation.qc_aggregation_v4 import QCAggregationV4
+from src.c3_core.scenario_engine.scenario_v4 import ScenarioEngineV4
+
+DEFAULT_CACHE_DIR = "data/derived/cache"
+
+# Stage name -> PIPELINE_VERSIONS entry
+STAGE_VERSION_KEYS = {
+    "etl": "etl_version",
+    "component_timing": "component_algo_version",
+    "qc_aggregation": "qc_version",
+    "scenarios": "scenario_version",
+}
+
+
+def fingerprint_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content (the input fingerprint of the ETL stage)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_key(stage: str, upstream: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key of a stage: hash of its upstream fingerprint, version and output-relevant options."""
+    payload = {
+        "stage": stage,
+        "version": PIPELINE_VERSIONS[STAGE_VERSION_KEYS[stage]],
+        "upstream": upstream,
+        "params": params or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class StageCache:
+    """
+    On-disk store of stage outputs, one directory per (stage, key).
+
+    An entry holds one or more named frames (a single frame for ETL, component
+    timing and QC, one frame per scenario for the scenario stage). Column dtypes
+    are recorded in meta.json and restored on load, so cached frames are
+    interchangeable with freshly computed ones.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _entry_dir(self, stage: str, key: str) -> Path:
+        return self.cache_dir / stage / key
+
+    def contains(self, stage: str, key: str) -> bool:
+        return (self._entry_dir(stage, key) / self.META_FILE).exists()
+
+    def load(self, stage: str, key: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Returns the cached frames of a stage, or None on a cache miss."""
+        entry = self._entry_dir(stage, key)
+        meta_path = entry / self.META_FILE
+        if not meta_path.exists():
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        frames = {}
+        for name, dtypes in meta["frames"].items():
+            path = entry / f"{self._file_stem(name)}.parquet"
+            if path.exists():
+                df = pd.read_parquet(path)
+            else:
+                df = pd.DataFrame()
+            frames[name] = self._restore_dtypes(df, dtypes)
+        return frames
+
+    def store(self, stage: str, key: str, frames: Dict[str, pd.DataFrame]):
+        """Writes the frames of a stage; meta.json is renamed into place last."""
+        entry = self._entry_dir(stage, key)
+        if entry.exists():
+            shutil.rmtree(entry)
+        entry.mkdir(parents=True)
+
+        meta = {
+            "stage": stage,
+            "version": PIPELINE_VERSIONS[STAGE_VERSION_KEYS[stage]],
+            "frames": {},
+        }
+        for name, df in frames.items():
+            # Empty frames (e.g. a scenario without Tst1 data) are recorded without a file
+            if not df.empty:
+                df.to_parquet(entry / f"{self._file_stem(name)}.parquet", index=False)
+            meta["frames"][name] = {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+        tmp_path = entry / f"{self.META_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(entry / self.META_FILE)
+
+    def get_or_compute(self, stage: str, key: str,
+                       compute: Callable[[], Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+        frames = self.load(stage, key)
+        if frames is None:
+            frames = compute()
+            self.store(stage, key, frames)
+        return frames
+
+    def clear(self):
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+
+    @staticmethod
+    def _file_stem(name: str) -> str:
+        # Scenario IDs contain dots (A0.0 -> A0_0), as in ScenarioEngineV4.export_results
+        return name.replace(".", "_")
+
+    @staticmethod
+    def _restore_dtypes(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+        # Parquet round-trips str columns as object; categoricals keep their categories
+        restore = {
+            col: dtype for col, dtype in dtypes.items()
+            if col in df.columns and dtype != "category" and str(df[col].dtype) != dtype
+        }
+        return df.astype(restore) if restore else df
+
+
+def run_cached_pipeline(db_path: str = "neuro_data.db", cache_dir: str = DEFAULT_CACHE_DIR,
+                        compact_schema: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    Runs ETL -> ComponentTimingV4 -> QCAggregationV4 -> ScenarioEngineV4 through the stage cache.
+
+    All keys are derived up front from the database fingerprint, so a hit on a
+    downstream stage skips loading the upstream frames altogether.
+
+    Returns:
+        Dictionary with scenario IDs as keys and DataFrames as values.
+    """
+    cache = StageCache(cache_dir)
+    params = {"compact_schema": compact_schema}
+
+    etl_key = stage_key("etl", fingerprint_file(db_path), params)
+    component_key = stage_key("component_timing", etl_key, params)
+    qc_key = stage_key("qc_aggregation", component_key, params)
+    scenario_key = stage_key("scenarios", qc_key)
+
+    def event_frame():
+        return cache.get_or_compute("etl", etl_key, lambda: {
+            "EventFrame": ETLPipeline(db_path=db_path, compact_schema=compact_schema).run()
+        })["EventFrame"]
+
+    def component_frame():
+        return cache.get_or_compute("component_timing", component_key, lambda: {
+            "ComponentFrame": ComponentTimingV4(compact_schema=compact_schema).run(event_frame())
+        })["ComponentFrame"]
+
+    def aggregated_frame():
+        return cache.get_or_compute("qc_aggregation", qc_key, lambda: {
+            "AggregatedFrame": QCAggregationV4(compact_schema=compact_schema).run(component_frame())
+        })["AggregatedFrame"]
+
+    return cache.get_or_compute("scenarios", scenario_key,
+                                lambda: ScenarioEngineV4().run(aggregated_frame()))
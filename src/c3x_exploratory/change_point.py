@@ -6,14 +6,51 @@ Follows Task 9 requirements.
 """
 
 import datetime
+from collections import deque
+
 import numpy as np
-from typing import Dict, Any
+from scipy.ndimage import maximum_filter1d
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
 from src.shared.artifacts import TemporalStructureResult
 
 
 PROCEDURE_VERSION = "1.1.0"
 
+_EPS = np.finfo(float).eps
+
+
+def _forward_max(x: np.ndarray, size: int) -> np.ndarray:
+    """out[..., j] = max(x[..., j:j + size]) along the last axis (-inf past the end)."""
+    return maximum_filter1d(x, size, axis=-1, mode="constant", cval=-np.inf, origin=-(size // 2))
+
+
+def _rolling_mean_difference(data: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    |mean(data[t-window:t]) - mean(data[t:t+window])| for every row of a 2-D array,
+    from prefix sums of the row-centered data.
+
+    Returns the statistic curves (zero outside [window, n - window)) and, per row,
+    a bound on their distance from the per-slice np.mean values.
+    """
+    n_series, n = data.shape
+    curve = np.zeros((n_series, n))
+    if n < 2 * window:
+        return curve, np.zeros(n_series)
+
+    centered = data - data.mean(axis=1, keepdims=True)
+    prefix = np.zeros((n_series, n + 1))
+    np.cumsum(centered, axis=1, out=prefix[:, 1:])
+    means = (prefix[:, window:] - prefix[:, :-window]) / window
+    curve[:, window:n - window] = np.abs(means[:, :n - 2 * window] - means[:, window:n - window])
+
+    # Cumulative rounding of the prefix sums plus that of the pairwise-summed slice means
+    tolerance = 2 * _EPS * (
+        4 * (n + 2) * np.abs(centered).sum(axis=1) / window
+        + 4 * (window + 1) * np.abs(data).max(axis=1)
+    )
+    return curve, tolerance
+
 
 class ChangePointDetection:
     """
@@ -64,6 +101,119 @@ class ChangePointDetection:
         Returns:
             TemporalStructureResult: Formal artifact containing identified structure.
         """
+        data = np.asarray(data)
+        curves, points = self._scan(data[np.newaxis, :])
+        return self._build_result(curves[0], points[0], seed, datetime.datetime.now().isoformat())
+
+    def execute_batch(
+        self,
+        data: np.ndarray,
+        seeds: int | Sequence[int] = 0
+    ) -> List[TemporalStructureResult]:
+        """
+        Executes change-point detection on every row of a 2-D array of equal-length series.
+
+        Args:
+            data: Array of shape (n_series, n_samples).
+            seeds: One seed for all series or one per series.
+
+        Returns:
+            List[TemporalStructureResult]: One artifact per row, in row order.
+        """
+        data = np.asarray(data)
+        if data.ndim != 2:
+            raise ValueError(f"Expected a 2-D array of series, got shape {data.shape}")
+        if np.ndim(seeds) == 0:
+            seeds = [seeds] * len(data)
+        elif len(seeds) != len(data):
+            raise ValueError(f"Expected {len(data)} seeds, got {len(seeds)}")
+
+        curves, points = self._scan(data)
+        timestamp = datetime.datetime.now().isoformat()
+        return [
+            self._build_result(curve, detected, int(seed), timestamp)
+            for curve, detected, seed in zip(curves, points, seeds)
+        ]
+
+    def _scan(self, data: np.ndarray) -> Tuple[np.ndarray, List[List[int]]]:
+        """
+        Statistic curves and change points of the rows of `data`.
+
+        The curve comes from prefix sums. Wherever the rounding bound could flip a
+        threshold or local-maximum decision, the affected values are recomputed with
+        np.mean over the same slices as _reference_scan, so the detected points are
+        identical to it.
+        """
+        n_series, n = data.shape
+        window = self.parameters["window_size"]
+        threshold = self.parameters["threshold"]
+        radius = self.parameters["search_radius"]
+
+        curves = np.zeros((n_series, n))
+        points: List[List[int]] = [[] for _ in range(n_series)]
+        finite = np.isfinite(data).all(axis=1)
+        # Non-finite values would poison the prefix sums
+        for row in np.flatnonzero(~finite):
+            curves[row], points[row] = self._reference_scan(data[row])
+        rows = np.flatnonzero(finite)
+        if len(rows) == 0 or n <= 2 * window:
+            return curves, points
+
+        values = data[rows].astype(float)
+        curve, tolerance = _rolling_mean_difference(values, window)
+        scale = np.ones(len(rows))
+        if self.parameters["normalize"]:
+            std_dev = np.array([np.std(data[row]) for row in rows])
+            scale = np.where(std_dev > 0, std_dev, 1.0)
+            curve /= scale[:, None]
+            tolerance = tolerance / scale + 4 * _EPS * curve.max(axis=1)
+
+        inner = curve[:, window:n - window]
+        tol = tolerance[:, None]
+        neighbours = self._neighbour_max(inner)
+        ambiguous = (np.abs(inner - threshold) <= tol) | (
+            (inner > threshold - tol) & (np.abs(neighbours - inner) <= 2 * tol)
+        )
+
+        # Recompute the values behind undecided comparisons exactly
+        for i in np.flatnonzero(ambiguous.any(axis=1)):
+            row = data[rows[i]]
+            patch = np.zeros(inner.shape[1] + 1, dtype=int)
+            undecided = np.flatnonzero(ambiguous[i])
+            np.add.at(patch, np.maximum(undecided - radius, 0), 1)
+            np.add.at(patch, np.minimum(undecided + radius + 1, inner.shape[1]), -1)
+            for t in np.flatnonzero(np.cumsum(patch[:-1]) > 0) + window:
+                exact = abs(np.mean(row[t - window:t]) - np.mean(row[t:t + window]))
+                curve[i, t] = exact / scale[i] if self.parameters["normalize"] else exact
+
+        is_peak = (inner > threshold) & (inner >= self._neighbour_max(inner))
+        for i, row in enumerate(rows):
+            curves[row] = curve[i]
+            points[row] = self._enforce_min_length(np.flatnonzero(is_peak[i]) + window)
+        return curves, points
+
+    def _neighbour_max(self, inner: np.ndarray) -> np.ndarray:
+        """Maximum over the other points within search_radius, clipped to the scanned range."""
+        radius = self.parameters["search_radius"]
+        if radius <= 0:
+            return np.full(inner.shape, -np.inf)
+        padded = np.pad(inner, ((0, 0), (radius, radius)), constant_values=-np.inf)
+        window_max = _forward_max(padded, radius)
+        length = inner.shape[1]
+        return np.maximum(window_max[:, :length], window_max[:, radius + 1:radius + 1 + length])
+
+    def _enforce_min_length(self, candidates: np.ndarray) -> List[int]:
+        min_len = self.parameters["minimum_segment_length"]
+        detected_points = []
+        last_cp = -min_len
+        for t in candidates:
+            if t - last_cp >= min_len:
+                detected_points.append(int(t))
+                last_cp = t
+        return detected_points
+
+    def _reference_scan(self, data: np.ndarray) -> Tuple[np.ndarray, List[int]]:
+        """Direct per-step evaluation; used for series with non-finite values."""
         n = len(data)
         window = self.parameters["window_size"]
         threshold = self.parameters["threshold"]
@@ -99,7 +249,11 @@ class ChangePointDetection:
                 if is_local_max and (t - last_cp >= min_len):
                     detected_points.append(int(t))
                     last_cp = t
-                    
+
+        return statistic_curve, detected_points
+
+    def _build_result(self, statistic_curve: np.ndarray, detected_points: List[int], seed: int,
+                      timestamp: str) -> TemporalStructureResult:
         # 4. Create Result Artifact
         result = TemporalStructureResult(
             procedure_version=PROCEDURE_VERSION,
@@ -107,7 +261,7 @@ class ChangePointDetection:
             statistic_curve=statistic_curve.tolist(),
             input_parameters=self.parameters,
             seed=seed,
-            timestamp=datetime.datetime.now().isoformat()
+            timestamp=timestamp
         )
         
         return result
@@ -120,3 +274,139 @@ class ChangePointDetection:
             "It is exploratory and descriptive, and does not imply interpretation "
             "or evaluation."
         )
+
+
+class StreamingChangePointDetection(ChangePointDetection):
+    """
+    Online counterpart of ChangePointDetection for series that arrive one value at a time.
+
+    Keeps the last 2 * window_size values and the last 2 * search_radius + 2 statistic
+    values. The statistic at t is available once the right-hand window data[t:t+window]
+    has filled. A point t is reported when value t + window_size + search_radius
+    arrives: that completes the statistic of its right-most neighbour t + search_radius,
+    plus one value that shows the series continues past it (execute() never
+    evaluates the statistic at the very end of a series). Pushing a whole series and
+    calling flush() gives the same points as execute(). With
+    normalize=True the statistic is divided by the running standard deviation of the
+    values seen so far.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 10,
+        threshold: float = 1.0,
+        minimum_segment_length: int = 10,
+        search_radius: int | None = None,
+        normalize: bool = False
+    ):
+        super().__init__(window_size, threshold, minimum_segment_length, search_radius, normalize)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the stream state."""
+        self._values = deque(maxlen=2 * self.parameters["window_size"])
+        self._statistics = deque(maxlen=2 * self.parameters["search_radius"] + 2)
+        self._n_seen = 0
+        self._next_decision = self.parameters["window_size"]
+        self._last_cp = -self.parameters["minimum_segment_length"]
+        # Welford running moments (for normalize)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def n_seen(self) -> int:
+        return self._n_seen
+
+    def push(self, value: float) -> Optional[int]:
+        """
+        Adds the next value of the series.
+
+        Returns:
+            The index of a newly confirmed change point, or None.
+        """
+        value = float(value)
+        window = self.parameters["window_size"]
+        self._n_seen += 1
+        delta = value - self._mean
+        self._mean += delta / self._n_seen
+        self._m2 += delta * (value - self._mean)
+        self._values.append(value)
+
+        if self._n_seen < 2 * window:
+            return None
+        values = np.fromiter(self._values, dtype=float, count=2 * window)
+        self._statistics.append(abs(np.mean(values[:window]) - np.mean(values[window:])))
+
+        # Newest statistic index is n_seen - window; decide the point whose neighbourhood
+        # ends just before it
+        last = self._n_seen - window - 1
+        if last - self.parameters["search_radius"] < self._next_decision:
+            return None
+        return self._decide(last)
+
+    def flush(self) -> List[int]:
+        """
+        Decides the pending points as if the series ended here (neighbourhoods are
+        clipped at the last available statistic, as in execute()).
+        """
+        last = self._n_seen - self.parameters["window_size"] - 1
+        points = []
+        while self._next_decision <= last:
+            point = self._decide(last)
+            if point is not None:
+                points.append(point)
+        return points
+
+    def _decide(self, last: int) -> Optional[int]:
+        """Decides self._next_decision given statistics up to index `last`."""
+        window = self.parameters["window_size"]
+        radius = self.parameters["search_radius"]
+        t = self._next_decision
+        self._next_decision += 1
+
+        # Statistic indices held in the buffer: [newest - len + 1, newest]
+        first = self._n_seen - window - len(self._statistics) + 1
+        stats = list(self._statistics)
+        current = stats[t - first]
+        neighbourhood = stats[max(window, t - radius) - first:min(last, t + radius) - first + 1]
+
+        scaled = current
+        if self.parameters["normalize"]:
+            std_dev = np.sqrt(self._m2 / self._n_seen)
+            if std_dev > 0:
+                scaled = current / std_dev
+
+        if scaled > self.parameters["threshold"] and max(neighbourhood) <= current \
+                and t - self._last_cp >= self.parameters["minimum_segment_length"]:
+            self._last_cp = t
+            return t
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable copy of the parameters and stream state."""
+        return {
+            "procedure_version": PROCEDURE_VERSION,
+            "parameters": dict(self.parameters),
+            "values": list(self._values),
+            "statistics": [float(s) for s in self._statistics],
+            "n_seen": self._n_seen,
+            "next_decision": self._next_decision,
+            "last_cp": self._last_cp,
+            "mean": self._mean,
+            "m2": self._m2,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Restores a state produced by snapshot() with the same parameters."""
+        if state["parameters"] != self.parameters:
+            raise ValueError(
+                f"Snapshot parameters {state['parameters']} do not match {self.parameters}"
+            )
+        self.reset()
+        self._values.extend(state["values"])
+        self._statistics.extend(state["statistics"])
+        self._n_seen = state["n_seen"]
+        self._next_decision = state["next_decision"]
+        self._last_cp = state["last_cp"]
+        self._mean = state["mean"]
+        self._m2 = state["m2"]
@@ -5,9 +5,71 @@ This module implements the Stage 5 Microdynamic Architecture exploratory procedu
 Follows Task 34 requirements.
 """
 
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import numpy as np
+import pandas as pd
 import scipy.stats as stats
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+
+# Permuted metrics closer than this (relative to the data scale) to the observed one
+# are re-evaluated with the scalar analysis functions before comparison
+_TIE_TOLERANCE = 1e3 * np.finfo(float).eps
+
+# Sessions per permutation batch in execute_population (bounds the
+# chunk_size x n_permutations x n_trials permutation tensor)
+POPULATION_CHUNK_SIZE = 128
+
+
+def permutation_indices(n_trials: int, n_permutations: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Index matrix of the cumulative in-place shuffles of MicrodynamicAnalysis.permutation_test.
+
+    Row k holds the order of the series after k + 1 successive rng.shuffle calls, so
+    rt_series[indices[k]] equals the k-th shuffled copy for the same generator state.
+    """
+    indices = np.empty((n_permutations, n_trials), dtype=np.intp)
+    order = np.arange(n_trials)
+    for k in range(n_permutations):
+        rng.shuffle(order)
+        indices[k] = order
+    return indices
+
+
+def burst_runs(fast: np.ndarray, slow: np.ndarray, min_length: int = 3) -> Tuple[np.ndarray, ...]:
+    """
+    Counts and total lengths of the fast and slow runs of at least `min_length` trials
+    in each row of two boolean (n_series, n_trials) masks.
+
+    Runs are found by run encoding: each row is padded with False and the
+    rising and falling edges of the flattened mask pair up in order.
+
+    Returns:
+        (fast_counts, fast_lengths, slow_counts, slow_lengths), each of shape (n_series,).
+    """
+    n_series, n_trials = fast.shape
+    results = []
+    for mask in (fast, slow):
+        padded = np.zeros((n_series, n_trials + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask
+        edges = np.diff(padded.ravel())
+        starts = np.flatnonzero(edges == 1)
+        lengths = np.flatnonzero(edges == -1) - starts
+        keep = lengths >= min_length
+        rows = starts[keep] // (n_trials + 2)
+        results.append(np.bincount(rows, minlength=n_series))
+        results.append(np.bincount(rows, weights=lengths[keep], minlength=n_series))
+    return tuple(results)
+
+
+def _population_chunk(analysis: "MicrodynamicAnalysis", series: np.ndarray,
+                      seeds: List[int | None]) -> pd.DataFrame:
+    """Worker for MicrodynamicAnalysis.execute_population (module level so it can be pickled)."""
+    return analysis._population_metrics(series, seeds)
 
 
 class MicrodynamicAnalysis:
@@ -114,17 +176,9 @@ class MicrodynamicAnalysis:
 
     def analyze_bursts(self, rt_series: np.ndarray) -> Dict[str, Any]:
         """Block XXII: Burst-analysis."""
-        threshold_factor = self.parameters["burst_threshold_mad"]
-        
-        global_median = np.median(rt_series)
-        global_mad = np.median(np.abs(rt_series - global_median))
-        if global_mad == 0:
-            global_mad = 1e-6
-            
-        # fast bursts: < median - mad*factor
-        fast_threshold = global_median - global_mad * threshold_factor
-        # slow bursts: > median + mad*factor
-        slow_threshold = global_median + global_mad * threshold_factor
+        # fast bursts: < median - mad*factor, slow bursts: > median + mad*factor
+        fast_thresholds, slow_thresholds = self.burst_thresholds(np.asarray(rt_series)[None, :])
+        fast_threshold, slow_threshold = fast_thresholds[0], slow_thresholds[0]
         
         fast_bursts = []
         slow_bursts = []
@@ -165,8 +219,169 @@ class MicrodynamicAnalysis:
             "total_burst_frequency": len(fast_bursts) + len(slow_bursts)
         }
 
+    def _blocks(self, series: np.ndarray) -> np.ndarray:
+        n_blocks = self.parameters["n_blocks"]
+        n_series, n_trials = series.shape
+        if n_trials % n_blocks != 0:
+            raise ValueError(f"Series length {n_trials} is not divisible by {n_blocks} blocks.")
+        return series.reshape(n_series, n_blocks, n_trials // n_blocks)
+
+    def block_medians(self, series: np.ndarray) -> np.ndarray:
+        """Block XX medians of every row of an (n_series, n_trials) array."""
+        return np.median(self._blocks(series), axis=2)
+
+    def block_statistics(self, series: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Block XX medians and MADs of every row of an (n_series, n_trials) array."""
+        blocks = self._blocks(series)
+        block_medians = np.median(blocks, axis=2)
+        block_mads = np.median(np.abs(blocks - block_medians[:, :, None]), axis=2)
+        return block_medians, block_mads
+
+    def block_trends(self, block_medians: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Slope and p-value of the linear trend of each row of block medians (as stats.linregress)."""
+        n_blocks = block_medians.shape[1]
+        block_indices = np.arange(1, n_blocks + 1)
+        x_centered = block_indices - block_indices.mean()
+        y_centered = block_medians - block_medians.mean(axis=1, keepdims=True)
+        ssxm = np.mean(x_centered ** 2)
+        ssxym = y_centered @ x_centered / n_blocks
+        ssym = np.mean(y_centered ** 2, axis=1)
+        slopes = ssxym / ssxm
+
+        if n_blocks == 2:
+            return slopes, np.where(block_medians[:, 0] == block_medians[:, 1], 1.0, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.clip(np.where(ssym == 0, np.nan, ssxym / np.sqrt(ssxm * ssym)), -1.0, 1.0)
+            df = n_blocks - 2
+            t = r * np.sqrt(df / ((1.0 - r + 1.0e-20) * (1.0 + r + 1.0e-20)))
+        return slopes, 2 * stats.t.sf(np.abs(t), df)
+
+    def autocorrelations(self, series: np.ndarray, lags: int) -> np.ndarray:
+        """Block XXI ACF at lags 1..lags of every row of an (n_series, n_trials) array."""
+        n = series.shape[1]
+        mean_rt = np.mean(series, axis=1, keepdims=True)
+        var_rt = np.var(series, axis=1)
+        centered = series - mean_rt
+        acf = np.zeros((len(series), lags))
+        for k in range(1, lags + 1):
+            cov = np.sum(centered[:, :-k] * centered[:, k:], axis=1) / n
+            np.divide(cov, var_rt, out=acf[:, k - 1], where=var_rt != 0)
+        return acf
+
+    def burst_thresholds(self, series: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Block XXII fast/slow thresholds (median -/+ factor * MAD) of every row."""
+        threshold_factor = self.parameters["burst_threshold_mad"]
+        global_median = np.median(series, axis=1)
+        global_mad = np.median(np.abs(series - global_median[:, None]), axis=1)
+        global_mad[global_mad == 0] = 1e-6
+        return global_median - global_mad * threshold_factor, global_median + global_mad * threshold_factor
+
+    def burst_statistics(self, series: np.ndarray, fast_threshold: np.ndarray,
+                         slow_threshold: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Block XXII burst counts and total lengths of every row, given per-row thresholds.
+
+        Returns:
+            (fast_counts, fast_lengths, slow_counts, slow_lengths).
+        """
+        fast = series < fast_threshold[:, None]
+        slow = ~fast & (series > slow_threshold[:, None])
+        return burst_runs(fast, slow)
+
     def permutation_test(self, rt_series: np.ndarray, seed: int | None = None) -> Dict[str, Any]:
-        """Block XXIII: Permutation test for structural stability."""
+        """
+        Block XXIII: Permutation test for structural stability.
+
+        All permutations are evaluated at once on the (n_permutations, n_trials) matrix of
+        shuffled copies (see permutation_p_values). The p-values are those of the
+        sequential version (_permutation_test_reference) for the same seed.
+        """
+        rt_series = np.asarray(rt_series)
+
+        # Original metrics
+        orig_trend = self.analyze_block_decomposition(rt_series)["trend_slope"]
+        orig_acf1 = self.analyze_autocorrelation(rt_series)["acf_lag1"]
+        orig_bursts = self.analyze_bursts(rt_series)["total_burst_frequency"]
+
+        if np.ptp(rt_series) == 0:
+            # Constant series: the ACF is rounding noise, keep the sequential definition
+            return self._permutation_test_reference(rt_series, seed)
+        p_val_trend, p_val_acf1, p_val_bursts = self.permutation_p_values(rt_series[None, :], [seed])[0]
+
+        return {
+            "orig_trend_slope": orig_trend,
+            "perm_p_trend": p_val_trend,
+            "orig_acf1": orig_acf1,
+            "perm_p_acf1": p_val_acf1,
+            "orig_burst_freq": orig_bursts,
+            "perm_p_bursts": p_val_bursts
+        }
+
+    def permutation_p_values(self, series: np.ndarray, seeds: Sequence[int | None]) -> np.ndarray:
+        """
+        Block XXIII p-values (trend, ACF lag 1, bursts) of every row of an
+        (n_series, n_trials) array of non-constant series, row i shuffled with seeds[i].
+
+        The shuffles are those of the sequential test. Burst thresholds depend only on
+        the multiset of RTs, which a shuffle preserves, so burst counts are exact.
+        Slopes and ACFs are computed in closed form; wherever one is within rounding
+        distance of deciding |permuted| >= |observed| differently, both sides are
+        re-evaluated with analyze_block_decomposition / analyze_autocorrelation.
+
+        Returns:
+            Array of shape (n_series, 3).
+        """
+        n_series, n_trials = series.shape
+        n_permutations = self.parameters["n_permutations"]
+        indices = np.empty((n_series, n_permutations, n_trials), dtype=np.intp)
+        for i, seed in enumerate(seeds):
+            indices[i] = permutation_indices(n_trials, n_permutations, np.random.default_rng(seed))
+        permuted = np.take_along_axis(series[:, None, :], indices, axis=2)
+        flat = permuted.reshape(n_series * n_permutations, n_trials)
+
+        trends = self.block_trends(self.block_medians(flat))[0].reshape(n_series, n_permutations)
+        orig_trends = self.block_trends(self.block_medians(series))[0]
+        self._resolve_ties(trends, orig_trends, _TIE_TOLERANCE * np.max(np.abs(series), axis=1),
+                           lambda rt: self.analyze_block_decomposition(rt)["trend_slope"], series, permuted)
+
+        acf1s = self.autocorrelations(flat, 1)[:, 0].reshape(n_series, n_permutations)
+        orig_acf1s = self.autocorrelations(series, 1)[:, 0]
+        scale = n_trials + np.abs(np.mean(series, axis=1)) / np.std(series, axis=1)
+        self._resolve_ties(acf1s, orig_acf1s, _TIE_TOLERANCE * scale,
+                           lambda rt: self.analyze_autocorrelation(rt)["acf_lag1"], series, permuted)
+
+        fast_threshold, slow_threshold = self.burst_thresholds(series)
+        fast_counts, _, slow_counts, _ = self.burst_statistics(
+            flat, np.repeat(fast_threshold, n_permutations), np.repeat(slow_threshold, n_permutations)
+        )
+        bursts = (fast_counts + slow_counts).reshape(n_series, n_permutations)
+        fast_counts, _, slow_counts, _ = self.burst_statistics(series, fast_threshold, slow_threshold)
+        orig_bursts = fast_counts + slow_counts
+
+        # calculate p-values (two-tailed for trend, one-tailed for others usually, but let's do absolute for trend)
+        return np.column_stack([
+            np.mean(np.abs(trends) >= np.abs(orig_trends)[:, None], axis=1),
+            np.mean(np.abs(acf1s) >= np.abs(orig_acf1s)[:, None], axis=1),
+            # bursts are integer counts
+            np.mean(bursts >= orig_bursts[:, None], axis=1),
+        ])
+
+    @staticmethod
+    def _resolve_ties(values: np.ndarray, observed: np.ndarray, tolerance: np.ndarray, exact,
+                      series: np.ndarray, permuted: np.ndarray) -> None:
+        """
+        Re-evaluates with exact() the observed value of each row, and the permuted values,
+        whose |value| >= |observed| comparison is within rounding (both sides carry
+        up to `tolerance` of error).
+        """
+        near = np.abs(np.abs(values) - np.abs(observed)[:, None]) <= 2 * tolerance[:, None]
+        for i in np.flatnonzero(near.any(axis=1)):
+            observed[i] = exact(series[i])
+            for k in np.flatnonzero(near[i]):
+                values[i, k] = exact(permuted[i, k])
+
+    def _permutation_test_reference(self, rt_series: np.ndarray, seed: int | None = None) -> Dict[str, Any]:
+        """Sequential permutation test (one shuffle and scalar analysis per permutation)."""
         n_permutations = self.parameters["n_permutations"]
         rng = np.random.default_rng(seed)
         
@@ -232,3 +447,112 @@ class MicrodynamicAnalysis:
             "burst_analysis": burst_metrics,
             "permutation_test": perm_metrics
         }
+
+    def execute_population(
+        self,
+        rt_tensor: np.ndarray,
+        seeds: int | None | Sequence[int | None] = None,
+        index: Optional[Sequence] = None,
+        chunk_size: Optional[int] = POPULATION_CHUNK_SIZE,
+        n_jobs: Optional[int] = 1
+    ) -> pd.DataFrame:
+        """
+        Executes the full microdynamic sequence on every session of a test type.
+
+        Args:
+            rt_tensor: Trial-level RT sequences, shape (n_sessions, n_trials).
+            seeds: RNG seed for the permutations of every session, or one per session.
+            index: Optional session labels for the rows (default: 0..n_sessions-1).
+            chunk_size: Sessions evaluated together (None = all at once).
+            n_jobs: Worker processes for the chunks (1 = in this process, -1 = all cores).
+
+        Returns:
+            pd.DataFrame with one row per session: block_median_<i>, block_mad_<i>,
+            trend_slope, trend_p_value, acf_lag<k>, ljung_box_stat, ljung_box_p_value,
+            the burst metrics of analyze_bursts, perm_p_trend, perm_p_acf1, perm_p_bursts
+            and seed. Values equal those of execute() up to rounding; the permutation
+            p-values are identical for the same seed.
+        """
+        rt_tensor = np.asarray(rt_tensor, dtype=float)
+        if rt_tensor.ndim != 2:
+            raise ValueError(f"Expected an (n_sessions, n_trials) array, got shape {rt_tensor.shape}")
+        n_sessions = len(rt_tensor)
+        if seeds is None or np.ndim(seeds) == 0:
+            seeds = [seeds] * n_sessions
+        elif len(seeds) != n_sessions:
+            raise ValueError(f"Expected {n_sessions} seeds, got {len(seeds)}")
+        seeds = list(seeds)
+
+        chunk_size = chunk_size or max(n_sessions, 1)
+        if n_jobs is None:
+            n_jobs = 1
+        elif n_jobs < 0:
+            n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+        elif n_jobs == 0:
+            raise ValueError("n_jobs must be non-zero")
+        if n_jobs > 1:
+            chunk_size = min(chunk_size, max(1, math.ceil(n_sessions / (n_jobs * 4))))
+
+        starts = range(0, n_sessions, chunk_size)
+        chunks = [rt_tensor[i:i + chunk_size] for i in starts]
+        chunk_seeds = [seeds[i:i + chunk_size] for i in starts]
+        if n_jobs == 1 or len(chunks) <= 1:
+            frames = list(map(_population_chunk, repeat(self), chunks, chunk_seeds))
+        else:
+            # map() yields chunks in submission order, so the result is deterministic
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as pool:
+                frames = list(pool.map(_population_chunk, repeat(self), chunks, chunk_seeds))
+
+        result = pd.concat(frames, ignore_index=True) if frames else self._population_metrics(rt_tensor, [])
+        if index is not None:
+            result.index = pd.Index(index)
+        return result
+
+    def _population_metrics(self, series: np.ndarray, seeds: List[int | None]) -> pd.DataFrame:
+        """Report metrics of every row of an (n_series, n_trials) array."""
+        n_series, n_trials = series.shape
+        n_blocks = self.parameters["n_blocks"]
+        lags = self.parameters["acf_lags"]
+        columns: Dict[str, Any] = {}
+
+        # Block XX
+        block_medians, block_mads = self.block_statistics(series)
+        for i in range(n_blocks):
+            columns[f"block_median_{i + 1}"] = block_medians[:, i]
+        for i in range(n_blocks):
+            columns[f"block_mad_{i + 1}"] = block_mads[:, i]
+        columns["trend_slope"], columns["trend_p_value"] = self.block_trends(block_medians)
+
+        # Block XXI
+        acf = self.autocorrelations(series, lags)
+        for k in range(1, lags + 1):
+            columns[f"acf_lag{k}"] = acf[:, k - 1]
+        lb_stat = n_trials * (n_trials + 2) * np.sum(acf ** 2 / (n_trials - np.arange(1, lags + 1)), axis=1)
+        columns["ljung_box_stat"] = lb_stat
+        columns["ljung_box_p_value"] = np.where(np.var(series, axis=1) == 0, 1.0, stats.chi2.sf(lb_stat, lags))
+
+        # Block XXII
+        fast_counts, fast_lengths, slow_counts, slow_lengths = self.burst_statistics(
+            series, *self.burst_thresholds(series)
+        )
+        columns["fast_burst_count"] = fast_counts
+        columns["fast_burst_mean_len"] = np.divide(fast_lengths, fast_counts, out=np.zeros(n_series),
+                                                   where=fast_counts > 0)
+        columns["slow_burst_count"] = slow_counts
+        columns["slow_burst_mean_len"] = np.divide(slow_lengths, slow_counts, out=np.zeros(n_series),
+                                                   where=slow_counts > 0)
+        columns["total_burst_frequency"] = fast_counts + slow_counts
+
+        # Block XXIII
+        p_values = np.full((n_series, 3), np.nan)
+        constant = np.ptp(series, axis=1) == 0 if n_trials else np.ones(n_series, dtype=bool)
+        varying = np.flatnonzero(~constant)
+        if len(varying):
+            p_values[varying] = self.permutation_p_values(series[varying], [seeds[i] for i in varying])
+        for i in np.flatnonzero(constant):
+            perm = self._permutation_test_reference(series[i], seeds[i])
+            p_values[i] = perm["perm_p_trend"], perm["perm_p_acf1"], perm["perm_p_bursts"]
+        columns["perm_p_trend"], columns["perm_p_acf1"], columns["perm_p_bursts"] = p_values.T
+        columns["seed"] = pd.array(seeds, dtype="Int64")
+
+        return pd.DataFrame(columns)
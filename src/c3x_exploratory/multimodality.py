@@ -7,14 +7,137 @@ Follows Task 5 Specification and Task 8 Implementation requirements.
 
 import datetime
 import numpy as np
-from scipy import stats, signal
-from typing import List, Optional
+from scipy import stats, signal, fft
+from typing import List, Sequence, Tuple
 
 from src.shared.artifacts import DistributionStructureResult
 
 
 PROCEDURE_VERSION = "1.1.0"
 
+# KDE backends: 'exact' evaluates scipy's gaussian_kde on the grid (O(n * grid));
+# 'fft' bins the data linearly and convolves with the kernel via FFT.
+KDE_METHODS = ("exact", "fft")
+
+# The FFT backend bins onto a grid this many times finer than the evaluation grid
+# (the evaluation grid is every BIN_OVERSAMPLING-th bin point)
+BIN_OVERSAMPLING = 8
+
+# Distributions convolved per FFT call (bounds memory of the batch)
+FFT_CHUNK_SIZE = 1024
+
+
+def _bandwidth_factor(bandwidth: str | float, n: np.ndarray) -> np.ndarray:
+    """Kernel width relative to the sample standard deviation (gaussian_kde rules for 1-D data)."""
+    if bandwidth == "scott":
+        return np.power(n, -1.0 / 5)
+    if bandwidth == "silverman":
+        return np.power(n * 3.0 / 4.0, -1.0 / 5)
+    if isinstance(bandwidth, (int, float)) and not isinstance(bandwidth, bool):
+        return np.full(len(n), float(bandwidth))
+    raise ValueError("`bandwidth` should be 'scott', 'silverman', or a scalar")
+
+
+def degenerate_samples(samples: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Boolean mask of the samples no KDE can be computed for: fewer than two points,
+    non-finite values, or a single distinct value (zero variance).
+    """
+    samples = [np.asarray(s, dtype=float).ravel() for s in samples]
+    sizes = np.array([len(s) for s in samples], dtype=np.int64)
+    degenerate = sizes < 2
+    if len(samples) == 0 or sizes.sum() == 0:
+        return degenerate
+
+    values = np.concatenate(samples)
+    owner = np.repeat(np.arange(len(samples)), sizes)
+    degenerate |= np.bincount(owner, weights=~np.isfinite(values), minlength=len(samples)) > 0
+    # reduceat over the non-empty samples only (empty segments would repeat a neighbour)
+    nonempty = sizes > 0
+    starts = (np.cumsum(sizes) - sizes)[nonempty]
+    spread = np.zeros(len(samples))
+    with np.errstate(invalid="ignore"):
+        spread[nonempty] = np.maximum.reduceat(values, starts) - np.minimum.reduceat(values, starts)
+    return degenerate | ~(spread > 0)
+
+
+def binned_kde_batch(
+    samples: Sequence[np.ndarray],
+    bandwidth: str | float = "scott",
+    n_grid: int = 100
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gaussian KDE of many 1-D samples by linear binning and FFT convolution.
+
+    Each sample gets the grid of MultimodalityDetection.execute (its range padded by
+    10% on both sides) and the kernel width of scipy's gaussian_kde for the same
+    bandwidth rule. The cost per sample depends on the grid size, not on the sample size.
+
+    Args:
+        samples: Ragged collection of 1-D samples.
+        bandwidth: 'scott', 'silverman' or a scalar factor.
+        n_grid: Number of evaluation points per sample.
+
+    Returns:
+        (grids, densities, degenerate): grids and densities of shape (len(samples), n_grid),
+        NaN for the samples flagged in the boolean mask `degenerate` (see degenerate_samples).
+    """
+    samples = [np.asarray(s, dtype=float).ravel() for s in samples]
+    degenerate = degenerate_samples(samples)
+    grids = np.full((len(samples), n_grid), np.nan)
+    densities = np.full((len(samples), n_grid), np.nan)
+    valid = np.flatnonzero(~degenerate)
+    if len(valid):
+        grids[valid], densities[valid] = _binned_kde([samples[i] for i in valid], bandwidth, n_grid)
+    return grids, densities, degenerate
+
+
+def _binned_kde(samples: List[np.ndarray], bandwidth: str | float, n_grid: int) -> Tuple[np.ndarray, np.ndarray]:
+    """binned_kde_batch for non-degenerate float samples."""
+    n_samples = len(samples)
+    sizes = np.array([len(s) for s in samples])
+    values = np.concatenate(samples)
+    owner = np.repeat(np.arange(n_samples), sizes)
+    starts = np.cumsum(sizes) - sizes
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+
+    # Evaluation grids and bin grids
+    grid_pad = (maxs - mins) * 0.1
+    lo, hi = mins - grid_pad, maxs + grid_pad
+    grids = np.linspace(lo, hi, n_grid, axis=1)
+    n_bins = (n_grid - 1) * BIN_OVERSAMPLING + 1
+    delta = (hi - lo) / (n_bins - 1)
+
+    # Linear binning (each point split between its two neighbouring bins)
+    position = (values - lo[owner]) / delta[owner]
+    left = np.clip(np.floor(position).astype(np.int64), 0, n_bins - 2)
+    frac = position - left
+    flat = owner * n_bins + left
+    counts = (
+        np.bincount(flat, weights=1.0 - frac, minlength=n_samples * n_bins)
+        + np.bincount(flat + 1, weights=frac, minlength=n_samples * n_bins)
+    ).reshape(n_samples, n_bins)
+
+    # Kernel width: factor * sample standard deviation (ddof=1), as in gaussian_kde
+    means = np.bincount(owner, weights=values) / sizes
+    variances = np.bincount(owner, weights=(values - means[owner]) ** 2) / (sizes - 1)
+    kernel_sd = _bandwidth_factor(bandwidth, sizes) * np.sqrt(variances)
+
+    offsets = np.arange(-(n_bins - 1), n_bins)
+    fft_len = fft.next_fast_len(3 * n_bins - 2, real=True)
+    densities = np.empty((n_samples, n_grid))
+    for start in range(0, n_samples, FFT_CHUNK_SIZE):
+        chunk = slice(start, start + FFT_CHUNK_SIZE)
+        u = offsets[None, :] * (delta[chunk] / kernel_sd[chunk])[:, None]
+        kernel = np.exp(-0.5 * u * u) / (np.sqrt(2 * np.pi) * kernel_sd[chunk][:, None])
+        conv = fft.irfft(fft.rfft(counts[chunk], fft_len, axis=1) * fft.rfft(kernel, fft_len, axis=1),
+                         fft_len, axis=1)
+        fine = conv[:, n_bins - 1:2 * n_bins - 1:BIN_OVERSAMPLING]
+        densities[chunk] = np.maximum(fine, 0.0) / sizes[chunk, None]
+
+    return grids, densities
+
 
 class MultimodalityDetection:
     """
@@ -25,7 +148,8 @@ class MultimodalityDetection:
         self,
         bandwidth: str | float = "scott",
         prominence_ratio: float = 0.05,
-        n_grid: int = 100
+        n_grid: int = 100,
+        kde_method: str = "exact"
     ):
         """
         Initialization of the procedure with fixed parameters.
@@ -34,12 +158,17 @@ class MultimodalityDetection:
             bandwidth: KDE smoothing parameter ('scott', 'silverman', or float).
             prominence_ratio: Peak detection prominence relative to max density.
             n_grid: Number of points for the density grid.
+            kde_method: KDE backend, 'exact' (gaussian_kde) or 'fft' (binned, for large
+                samples and batches).
         """
+        if kde_method not in KDE_METHODS:
+            raise ValueError(f"kde_method must be one of {KDE_METHODS}, got '{kde_method}'")
         self.goal = "Identify structural deviations from unimodality in RT or components."
         self.parameters = {
             "bandwidth": bandwidth,
             "prominence_ratio": prominence_ratio,
             "n_grid": n_grid,
+            "kde_method": kde_method,
         }
         self.reproducibility_notes = "KDE and peak detection are deterministic for fixed data."
 
@@ -55,6 +184,72 @@ class MultimodalityDetection:
             DistributionStructureResult: Formal artifact containing identified structure.
         """
         # 1. Compute Kernel Density Estimate
+        if self.parameters["kde_method"] == "fft":
+            grids, densities, degenerate = binned_kde_batch(
+                [data], self.parameters["bandwidth"], self.parameters["n_grid"]
+            )
+            if degenerate[0]:
+                raise ValueError("KDE needs at least two distinct finite values")
+            grid, density = grids[0], densities[0]
+        else:
+            grid, density = self._exact_kde(data)
+
+        return self._detect_structure(grid, density, seed, datetime.datetime.now().isoformat())
+
+    def execute_batch(
+        self,
+        samples: Sequence[np.ndarray],
+        seeds: int | Sequence[int] = 0
+    ) -> List[DistributionStructureResult]:
+        """
+        Executes multimodality detection on many distributions (e.g. every
+        subject x test x component).
+
+        With kde_method='fft' all densities are computed in one vectorized call.
+        Inputs without a density (fewer than two points, non-finite values or a
+        single distinct value, e.g. a constant-RT component) do not stop the batch:
+        their artifact has degenerate=True, 0 modes and an empty curve.
+
+        Args:
+            samples: Ragged collection of uni-dimensional inputs.
+            seeds: One seed for all inputs or one per input.
+
+        Returns:
+            List[DistributionStructureResult]: One artifact per input, in input order.
+        """
+        if np.ndim(seeds) == 0:
+            seeds = [seeds] * len(samples)
+        elif len(seeds) != len(samples):
+            raise ValueError(f"Expected {len(samples)} seeds, got {len(seeds)}")
+
+        if self.parameters["kde_method"] == "fft":
+            grids, densities, degenerate = binned_kde_batch(
+                samples, self.parameters["bandwidth"], self.parameters["n_grid"]
+            )
+        else:
+            degenerate = degenerate_samples(samples)
+            grids, densities = [None] * len(samples), [None] * len(samples)
+            for i in np.flatnonzero(~degenerate):
+                grids[i], densities[i] = self._exact_kde(samples[i])
+
+        timestamp = datetime.datetime.now().isoformat()
+        return [
+            self._degenerate_result(int(seed), timestamp) if is_degenerate
+            else self._detect_structure(grid, density, int(seed), timestamp)
+            for grid, density, is_degenerate, seed in zip(grids, densities, degenerate, seeds)
+        ]
+
+    def _degenerate_result(self, seed: int, timestamp: str) -> DistributionStructureResult:
+        return DistributionStructureResult(
+            procedure_version=PROCEDURE_VERSION,
+            number_of_modes=0,
+            degenerate=True,
+            input_parameters=self.parameters,
+            seed=seed,
+            timestamp=timestamp
+        )
+
+    def _exact_kde(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         # Deterministic Gaussian KDE
         kde = stats.gaussian_kde(data, bw_method=self.parameters["bandwidth"])
         
@@ -64,8 +259,10 @@ class MultimodalityDetection:
         grid_pad = (grid_max - grid_min) * 0.1
         grid = np.linspace(grid_min - grid_pad, grid_max + grid_pad, self.parameters["n_grid"])
         
-        density = kde.evaluate(grid)
-        
+        return grid, kde.evaluate(grid)
+
+    def _detect_structure(self, grid: np.ndarray, density: np.ndarray, seed: int,
+                          timestamp: str) -> DistributionStructureResult:
         # 2. Local Maxima Detection
         # Finds indices of local peaks in the density curve.
         # Use explicit prominence threshold relative to the max density.
@@ -90,7 +287,7 @@ class MultimodalityDetection:
             detected_peaks=detected_peaks,
             input_parameters=self.parameters,
             seed=seed,
-            timestamp=datetime.datetime.now().isoformat()
+            timestamp=timestamp
         )
         
         return result
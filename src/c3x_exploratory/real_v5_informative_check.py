@@ -5,7 +5,7 @@ Implements Task 48.6 - Real Empirical Verification of ∆V5/MT Informational Con
 """
 
 import os
-import sqlite3
+from src.shared.data_access import connect_readonly
 import numpy as np
 import pandas as pd
 from scipy import stats
@@ -50,7 +50,7 @@ class RealV5InformativeCheck:
         Loads the trials table from neuro_data.db, calculates means for Tst1, Tst2, Tst3,
         and computes the architectural metrics for v4 (Delta V4, Delta V5, etc).
         """
-        conn = sqlite3.connect(self.parameters["db_path"])
+        conn = connect_readonly(self.parameters["db_path"])
         
         # Load Trials
         trials_df = pd.read_sql("SELECT * FROM trials", conn)
@@ -5,7 +5,7 @@ Implements Task 48.7 - Full Variance Partitioning and Revision of Channel Contri
 """
 
 import os
-import sqlite3
+from src.shared.data_access import connect_readonly
 import numpy as np
 import pandas as pd
 from scipy import stats
@@ -49,7 +49,7 @@ class VariancePartitionV4:
         Loads the trials table from neuro_data.db, calculates means for Tst1, Tst2, Tst3,
         and computes the architectural metrics for v4.
         """
-        conn = sqlite3.connect(self.parameters["db_path"])
+        conn = connect_readonly(self.parameters["db_path"])
         trials_df = pd.read_sql("SELECT * FROM trials", conn)
         conn.close()
         
@@ -5,10 +5,157 @@ Provides READ-ONLY access to trial-level data from SQLite database.
 Architecturally isolated from C3 computation layers.
 """
 
-import sqlite3
+from src.shared.data_access import connect_readonly, read_metadata_tables
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping, Sequence, Union
+
+
+TEST_TYPES = ('Tst1', 'Tst2', 'Tst3')
+STIMULI_PER_TEST = 36
+RT_COLUMNS = [f"{t.lower()}_{k}" for t in TEST_TYPES for k in range(1, STIMULI_PER_TEST + 1)]
+
+# Tst2 is the red-light test: its stimulus color is always 'red'
+FIXED_STIMULUS_COLOR = {'Tst2': 'red'}
+
+# Session columns of load_trials_wide carried to trial rows (trials.trial_id is the session)
+SESSION_ID_COLUMNS = {'subject_id': 'subject_id', 'trial_id': 'session_id'}
+
+
+def load_trials_wide(database_path) -> pd.DataFrame:
+    """
+    Load the wide trials table (one row per session) of subjects present in users.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: trial_id, subject_id, test_date, tst1_1 ... tst3_36
+    """
+    query = (
+        "SELECT t.trial_id, t.subject_id, t.test_date, "
+        + ", ".join(f"t.{col}" for col in RT_COLUMNS)
+        + " FROM trials t INNER JOIN users u ON t.subject_id = u.subject_id"
+    )
+    conn = connect_readonly(database_path)
+    try:
+        return pd.read_sql_query(query, conn)
+    finally:
+        conn.close()
+
+
+def load_stimulus_metadata(database_path) -> Dict[str, pd.DataFrame]:
+    """Stimulus metadata tables keyed by test type ('Tst1', 'Tst2', 'Tst3')."""
+    return read_metadata_tables(database_path)
+
+
+def _count_mask_triples(mask_str) -> int:
+    if not mask_str or pd.isna(mask_str):
+        return 0
+    return len(mask_str.strip().split(' '))
+
+
+def _stimulus_lookup(metadata: Dict[str, pd.DataFrame], stimulus_attributes: bool) -> Dict[str, pd.Series]:
+    """Per-cell metadata (one entry per RT column, in RT_COLUMNS order)."""
+    stimulus_ids = range(1, STIMULI_PER_TEST + 1)
+    parts = {name: [] for name in ('stimulus_location', 'stimulus_color', 'psi')}
+    if stimulus_attributes:
+        parts.update(shift_parameter=[], mask_triples_count=[])
+
+    for test_type in TEST_TYPES:
+        meta = metadata[test_type].set_index('stimulus_id').reindex(stimulus_ids)
+        parts['stimulus_location'].append(meta['position'])
+        if test_type in FIXED_STIMULUS_COLOR:
+            parts['stimulus_color'].append(
+                pd.Series(FIXED_STIMULUS_COLOR[test_type], index=meta.index, dtype=meta['position'].dtype))
+        else:
+            parts['stimulus_color'].append(meta['color'])
+        parts['psi'].append(meta['psi_ms'])
+        if stimulus_attributes:
+            zeros = pd.Series(0, index=meta.index, dtype='int64')
+            parts['shift_parameter'].append(meta['shift_parameter'] if test_type == 'Tst3' else zeros)
+            parts['mask_triples_count'].append(
+                meta['mask_triples'].map(_count_mask_triples).astype('int64') if 'mask_triples' in meta else zeros)
+
+    return {name: pd.concat(series, ignore_index=True) for name, series in parts.items()}
+
+
+def trials_to_long(
+    trials_wide: pd.DataFrame,
+    metadata: Dict[str, pd.DataFrame],
+    id_columns: Optional[Union[Sequence[str], Mapping[str, str]]] = None,
+    stimulus_attributes: bool = False
+) -> pd.DataFrame:
+    """
+    Reshape wide session rows into trial-level rows with stimulus metadata.
+
+    Vectorized replacement of the per-session/per-stimulus loops of the exploratory
+    pipelines: the 108 RT columns are flattened row-major and metadata is looked up
+    positionally, so rows come out in the same order (session, test type, stimulus)
+    and with the same values and dtypes.
+
+    Parameters
+    ----------
+    trials_wide : pd.DataFrame
+        One row per session with the tstN_k RT columns.
+    metadata : dict
+        Metadata table per test type (see load_stimulus_metadata).
+    id_columns : sequence or mapping, optional
+        Session columns copied to every trial row, in order. A mapping renames
+        them. Default: SESSION_ID_COLUMNS (subject_id, trial_id -> session_id).
+    stimulus_attributes : bool, default=False
+        Add shift_parameter and mask_triples_count (0 where the test has none).
+
+    Returns
+    -------
+    pd.DataFrame
+        id columns, test_type, stimulus_id, stimulus_location, stimulus_color,
+        psi, rt, is_outlier [, shift_parameter, mask_triples_count].
+        Only responses with RT > 0 are kept.
+    """
+    if id_columns is None:
+        id_columns = SESSION_ID_COLUMNS
+    elif not isinstance(id_columns, Mapping):
+        id_columns = {col: col for col in id_columns}
+
+    rt = trials_wide[RT_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(invalid='ignore'):
+        valid = rt > 0
+    session_pos, cell = np.nonzero(valid)
+
+    long_df = {
+        target: trials_wide[source].iloc[session_pos].reset_index(drop=True)
+        for source, target in id_columns.items()
+    }
+    long_df['test_type'] = pd.Series(np.array(TEST_TYPES, dtype=object)[cell // STIMULI_PER_TEST], dtype='str')
+    long_df['stimulus_id'] = cell % STIMULI_PER_TEST + 1
+
+    lookup = _stimulus_lookup(metadata, stimulus_attributes)
+    for name in ('stimulus_location', 'stimulus_color', 'psi'):
+        long_df[name] = lookup[name].iloc[cell].reset_index(drop=True)
+    long_df['rt'] = rt[session_pos, cell]
+    long_df['is_outlier'] = False
+    if stimulus_attributes:
+        long_df['shift_parameter'] = lookup['shift_parameter'].iloc[cell].reset_index(drop=True)
+        long_df['mask_triples_count'] = lookup['mask_triples_count'].iloc[cell].reset_index(drop=True)
+
+    return pd.DataFrame(long_df)
+
+
+def load_trials_long(database_path, with_test_date: bool = False,
+                     stimulus_attributes: bool = False) -> pd.DataFrame:
+    """
+    Load trial-level rows of all sessions (see load_trials_wide and trials_to_long).
+
+    Rows carry subject_id and session_id (trials.trial_id), plus test_date if requested.
+    """
+    id_columns = dict(SESSION_ID_COLUMNS)
+    if with_test_date:
+        id_columns['test_date'] = 'test_date'
+    return trials_to_long(
+        load_trials_wide(database_path), load_stimulus_metadata(database_path),
+        id_columns=id_columns, stimulus_attributes=stimulus_attributes
+    )
 
 
 class TrialLevelDataLoader:
@@ -64,7 +211,7 @@ class TrialLevelDataLoader:
             - is_correct
             - is_outlier
         """
-        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        conn = connect_readonly(self.db_path)
         
         try:
             query = """
@@ -120,7 +267,7 @@ class TrialLevelDataLoader:
         pd.DataFrame
             Subject metadata with columns: subject_id, birth_date, gender (if available)
         """
-        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        conn = connect_readonly(self.db_path)
         
         try:
             query = "SELECT id AS subject_id, birth_date FROM subjects"
@@ -16,13 +16,53 @@ Methodological Corrections (Task 27.1):
 - Exponential PSI recovery model added
 """
 
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from scipy import stats
 from scipy.optimize import curve_fit
 import warnings
 
+from .psi_recovery import fit_exponential_recovery_batch, fit_grouped_psi_recovery
+
+
+# Bump whenever a change alters extracted values (invalidates persisted feature stores)
+EXTRACTOR_VERSION = "baseline_features_v1.0.0"
+
+# Exponential PSI fit methods (see BaselineFeatureExtractor.__init__)
+PSI_FIT_METHODS = ('curve_fit', 'batch')
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """Number of worker processes for n_jobs (None/1 = serial, -1 = all cores, -2 = all but one, ...)."""
+    if n_jobs is None:
+        return 1
+    if n_jobs == 0:
+        raise ValueError("n_jobs must be non-zero")
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def _extract_batch(extractor: "BaselineFeatureExtractor",
+                   batch: List[Tuple[Any, pd.DataFrame]],
+                   fit_tau: bool = True) -> List[Tuple[Any, Optional[Dict[str, float]], Optional[str]]]:
+    """Worker task: (key, features, error) per group; a failing group does not abort the batch."""
+    # fit_tau is passed only when set, so subclasses overriding extract_subject_features keep working
+    kwargs = {} if fit_tau else {'fit_tau': False}
+    results = []
+    for key, group_df in batch:
+        try:
+            results.append((key, extractor.extract_subject_features(group_df, **kwargs), None))
+        except Exception as e:
+            results.append((key, None, f"{type(e).__name__}: {e}"))
+    return results
+
 
 class BaselineFeatureExtractor:
     """
@@ -32,11 +72,27 @@ class BaselineFeatureExtractor:
     computing features across spatial fields and temporal dynamics.
     """
     
-    def __init__(self):
-        """Initialize the feature extractor."""
-        pass
+    version = EXTRACTOR_VERSION
+    psi_fit = 'curve_fit'
+    
+    def __init__(self, psi_fit: str = 'curve_fit'):
+        """
+        Initialize the feature extractor.
+        
+        Parameters
+        ----------
+        psi_fit : {'curve_fit', 'batch'}, default='curve_fit'
+            Exponential PSI fit: bounded scipy curve_fit from a fixed start point, or the
+            profiled least-squares fitter of psi_recovery (global optimum; fits in the
+            step limit, where curve_fit stalls at an arbitrary τ, give NaN).
+        """
+        if psi_fit not in PSI_FIT_METHODS:
+            raise ValueError(f"psi_fit must be one of {PSI_FIT_METHODS}, got '{psi_fit}'")
+        self.psi_fit = psi_fit
+        if psi_fit != 'curve_fit':
+            self.version = f"{EXTRACTOR_VERSION}+psi_{psi_fit}"
     
-    def extract_subject_features(self, trials_df: pd.DataFrame) -> Dict[str, float]:
+    def extract_subject_features(self, trials_df: pd.DataFrame, fit_tau: bool = True) -> Dict[str, float]:
         """
         Extract all 11 corrected baseline features for a single subject.
         
@@ -50,6 +106,9 @@ class BaselineFeatureExtractor:
             - psi (pre-stimulus interval, ms)
             - is_outlier
             - test_type
+        fit_tau : bool, default=True
+            Fit the exponential PSI model. False leaves psi_tau NaN (used by
+            extract_grouped_features, which fits all groups at once for psi_fit='batch').
         
         Returns
         -------
@@ -122,7 +181,7 @@ class BaselineFeatureExtractor:
         features['delta_v5_right'] = dv5_by_field.get('right', np.nan)
         
         # 6. PSI - Cortical recovery (exponential + linear)
-        psi_results = self._compute_psi_models(df_clean)
+        psi_results = self._compute_psi_models(df_clean, fit_tau=fit_tau)
         features['psi_tau'] = psi_results['tau']
         features['psi_slope_linear'] = psi_results['slope_linear']
         
@@ -198,7 +257,7 @@ class BaselineFeatureExtractor:
         
         return dv5_by_field
     
-    def _compute_psi_models(self, df: pd.DataFrame) -> Dict[str, float]:
+    def _compute_psi_models(self, df: pd.DataFrame, fit_tau: bool = True) -> Dict[str, float]:
         """
         Compute PSI models - cortical recovery dynamics.
         
@@ -229,7 +288,7 @@ class BaselineFeatureExtractor:
         
         # 2. Exponential model (Task 27.1)
         # RT(PSI) = RT₀ + β * exp(-PSI / τ)
-        if len(valid_data) >= 15:  # Require more points for stable exponential fit
+        if fit_tau and len(valid_data) >= 15:  # Require more points for stable exponential fit
             try:
                 results['tau'] = self._fit_exponential_recovery(psi_values, rt_values)
             except:
@@ -248,6 +307,9 @@ class BaselineFeatureExtractor:
         float
             tau - recovery time constant (ms)
         """
+        if self.psi_fit == 'batch':
+            return float(fit_exponential_recovery_batch(psi[None, :], rt[None, :])['tau'][0])
+        
         def exp_recovery(psi, rt0, beta, tau):
             """Exponential recovery function."""
             return rt0 + beta * np.exp(-psi / tau)
@@ -302,7 +364,73 @@ class BaselineFeatureExtractor:
             'psi_slope_linear': np.nan
         }
     
-    def extract_population_features(self, trials_df: pd.DataFrame) -> pd.DataFrame:
+    def extract_grouped_features(
+        self,
+        trials_df: pd.DataFrame,
+        group_col: str = 'subject_id',
+        n_jobs: Optional[int] = 1,
+        chunk_size: Optional[int] = None,
+        sort: bool = True
+    ) -> pd.DataFrame:
+        """
+        Extract features for every group (subject or session) of trials_df.
+        
+        Parameters
+        ----------
+        trials_df : pd.DataFrame
+            Trial-level data for multiple groups.
+        group_col : str, default='subject_id'
+            Grouping column ('subject_id' or 'session_id').
+        n_jobs : int, default=1
+            Worker processes (1 = in this process, -1 = all cores). Groups are sent
+            to a ProcessPoolExecutor in batches of chunk_size. With psi_fit='batch',
+            psi_tau of all groups comes from one fit_grouped_psi_recovery call
+            in this process instead.
+        chunk_size : int, optional
+            Groups per batch (default: about four batches per worker).
+        sort : bool, default=True
+            Order groups by key; otherwise by first appearance.
+        
+        Returns
+        -------
+        pd.DataFrame
+            Index group_col, the 17 feature columns and 'error' (None, or
+            "ExceptionType: message" for groups whose extraction raised, with NaN
+            features). Row order and values do not depend on n_jobs.
+        """
+        groups = list(trials_df.groupby(group_col, sort=sort))
+        n_jobs = resolve_n_jobs(n_jobs)
+        
+        # The batched fitter handles all groups in one call, the workers skip the τ fit
+        fit_tau = self.psi_fit != 'batch'
+        
+        if n_jobs == 1 or len(groups) <= 1:
+            results = _extract_batch(self, groups, fit_tau)
+        else:
+            if chunk_size is None:
+                chunk_size = math.ceil(len(groups) / (n_jobs * 4))
+            batches = [groups[i:i + chunk_size] for i in range(0, len(groups), chunk_size)]
+            # map() yields batches in submission order, so the result is deterministic
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(batches))) as pool:
+                results = [r for batch in pool.map(_extract_batch, repeat(self), batches, repeat(fit_tau))
+                           for r in batch]
+        
+        feature_columns = list(self._empty_features())
+        rows = [dict(features or {}, error=error) for _, features, error in results]
+        features_df = pd.DataFrame(
+            rows,
+            index=pd.Index([key for key, _, _ in results], name=group_col),
+            columns=feature_columns + ['error']
+        )
+        features_df[feature_columns] = features_df[feature_columns].astype('float64')
+        features_df['error'] = features_df['error'].astype(object)
+        
+        if not fit_tau and len(features_df) > 0:
+            tau = fit_grouped_psi_recovery(trials_df, group_col=group_col)['tau']
+            features_df['psi_tau'] = tau.reindex(features_df.index).where(features_df['error'].isna())
+        return features_df
+    
+    def extract_population_features(self, trials_df: pd.DataFrame, n_jobs: Optional[int] = 1) -> pd.DataFrame:
         """
         Extract features for all subjects in the dataset.
         
@@ -310,22 +438,27 @@ class BaselineFeatureExtractor:
         ----------
         trials_df : pd.DataFrame
             Trial-level data for multiple subjects.
+        n_jobs : int, default=1
+            Worker processes (see extract_grouped_features).
         
         Returns
         -------
         pd.DataFrame
             Feature matrix with subjects as rows and features as columns.
             Index is subject_id.
-        """
-        features_list = []
         
-        for subject_id, subject_trials in trials_df.groupby('subject_id'):
-            features = self.extract_subject_features(subject_trials)
-            features['subject_id'] = subject_id
-            features_list.append(features)
+        Raises
+        ------
+        RuntimeError
+            If extraction failed for any subject (all failures are listed).
+        """
+        features_df = self.extract_grouped_features(trials_df, group_col='subject_id', n_jobs=n_jobs)
         
-        features_df = pd.DataFrame(features_list)
-        features_df = features_df.set_index('subject_id')
+        failed = features_df['error'].dropna()
+        if len(failed) > 0:
+            details = "; ".join(f"{subject_id}: {error}" for subject_id, error in failed.items())
+            raise RuntimeError(f"Feature extraction failed for {len(failed)} subject(s): {details}")
+        features_df = features_df.drop(columns='error')
         
         # Drop subjects with any NaN features  
         features_df = features_df.dropna()
@@ -0,0 +1,192 @@
+"""
+Persisted store of BaselineFeatureExtractor outputs.
+
+Feature extraction (including the per-session curve_fit of the PSI recovery
+model) is repeated by nearly every exploratory pipeline and script for the same
+sessions. The store keeps one row of features per group (session by default)
+in a Parquet file, together with a hash of the group's input trials:
+
+    <store_dir>/<name>.parquet   group key, input_hash, error, 17 features
+    <store_dir>/<name>.json      extractor version, group column, database fingerprint
+
+A group is recomputed only when its input trials changed or the store was built
+by a different extractor version. Groups absent from a request are kept, so
+one store can serve differently filtered requests over time; requests over
+different trial subsets of the same groups (e.g. stimulus strata) should use
+separate store names.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .baseline_features import BaselineFeatureExtractor, EXTRACTOR_VERSION
+
+
+DEFAULT_STORE_DIR = Path("data") / "derived" / "feature_store"
+
+# Trial columns the extractor reads; a group's input hash covers these
+INPUT_COLUMNS = ('test_type', 'stimulus_location', 'stimulus_color', 'rt', 'psi', 'is_outlier')
+
+FEATURE_COLUMNS = list(BaselineFeatureExtractor()._empty_features())
+
+
+def database_fingerprint(database_path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the database file content."""
+    digest = hashlib.sha256()
+    with open(database_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def group_input_hashes(trials_df: pd.DataFrame, group_col: str = 'session_id') -> pd.Series:
+    """
+    Hash of the input trials of each group, indexed by group key in order of first appearance.
+    """
+    columns = [c for c in INPUT_COLUMNS if c in trials_df.columns]
+    row_hashes = pd.util.hash_pandas_object(trials_df[columns], index=False).to_numpy()
+    codes, keys = pd.factorize(trials_df[group_col], sort=False)
+
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+    prefix = ",".join(columns).encode("utf-8")
+    hashes = [
+        hashlib.sha1(prefix + row_hashes[order[start:end]].tobytes()).hexdigest()
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+    return pd.Series(hashes, index=pd.Index(keys, name=group_col), dtype=object)
+
+
+class FeatureStore:
+    """
+    Parquet-backed cache of per-group baseline features.
+
+    Parameters
+    ----------
+    store_dir : str or Path
+        Directory of the store files (default: data/derived/feature_store).
+    name : str
+        Store name; one Parquet file per name.
+    extractor : BaselineFeatureExtractor, optional
+        Extractor used for groups that are not cached.
+    n_jobs : int
+        Worker processes for groups that are not cached (-1 = all cores).
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, name: str = "session_features",
+                 extractor: Optional[BaselineFeatureExtractor] = None, n_jobs: Optional[int] = 1):
+        self.store_dir = Path(store_dir)
+        self.name = name
+        self.extractor = extractor if extractor is not None else BaselineFeatureExtractor()
+        self.n_jobs = n_jobs
+        # Outcome of the last extract() call
+        self.failures: Dict = {}
+        self.stats = {'reused': 0, 'computed': 0}
+
+    @property
+    def data_path(self) -> Path:
+        return self.store_dir / f"{self.name}.parquet"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.store_dir / f"{self.name}.json"
+
+    def read_meta(self) -> Optional[dict]:
+        if not self.meta_path.exists():
+            return None
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load(self, group_col: str) -> Optional[pd.DataFrame]:
+        meta = self.read_meta()
+        if meta is None or not self.data_path.exists():
+            return None
+        if meta.get("extractor_version") != self.extractor.version or meta.get("group_col") != group_col:
+            return None
+        return pd.read_parquet(self.data_path).set_index(group_col)
+
+    def _write(self, stored: pd.DataFrame, group_col: str, database_path):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_data = self.data_path.with_name(self.data_path.name + ".tmp")
+        stored.reset_index().to_parquet(tmp_data, index=False)
+        os.replace(tmp_data, self.data_path)
+
+        meta = {
+            "extractor_version": self.extractor.version,
+            "group_col": group_col,
+            "database_fingerprint": database_fingerprint(database_path) if database_path is not None else None,
+            "n_groups": int(len(stored)),
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        tmp_meta = self.meta_path.with_name(self.meta_path.name + ".tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_meta, self.meta_path)
+
+    def _compute(self, trials_df: pd.DataFrame, group_col: str, keys) -> pd.DataFrame:
+        subset = trials_df[trials_df[group_col].isin(keys)]
+        computed = self.extractor.extract_grouped_features(subset, group_col=group_col, n_jobs=self.n_jobs, sort=False)
+        return computed[['error'] + FEATURE_COLUMNS]
+
+    def extract(self, trials_df: pd.DataFrame, group_col: str = 'session_id',
+                carry_columns: Sequence[str] = (), database_path=None) -> pd.DataFrame:
+        """
+        Features of every group of trials_df, reusing stored rows whose inputs are unchanged.
+
+        Parameters
+        ----------
+        trials_df : pd.DataFrame
+            Trial-level data (see exploratory_lab.data_loader.trials_to_long).
+        group_col : str
+            Grouping column ('session_id' or 'subject_id').
+        carry_columns : sequence of str
+            Columns copied from the first trial row of each group (e.g. subject_id, test_date).
+        database_path : optional
+            Source database, recorded as a fingerprint in the store metadata.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per group in order of first appearance: the 17 feature columns,
+            group_col and carry_columns. Groups whose extraction raised are omitted
+            and listed in self.failures.
+        """
+        hashes = group_input_hashes(trials_df, group_col)
+        stored = self._load(group_col)
+
+        if stored is not None:
+            known = hashes.index.intersection(stored.index)
+            fresh = known[stored.loc[known, 'input_hash'].to_numpy() == hashes.loc[known].to_numpy()]
+        else:
+            fresh = hashes.index[:0]
+        todo = hashes.index.difference(fresh, sort=False)
+
+        if len(todo) > 0 or stored is None:
+            computed = self._compute(trials_df, group_col, todo)
+            computed.insert(0, 'input_hash', hashes.loc[computed.index])
+            if stored is not None:
+                stored = pd.concat([stored.drop(index=computed.index, errors='ignore'), computed])
+            else:
+                stored = computed
+            self._write(stored, group_col, database_path)
+
+        self.stats = {'reused': int(len(fresh)), 'computed': int(len(todo))}
+        result = stored.loc[hashes.index]
+        failed = result['error'].notna()
+        self.failures = result.loc[failed, 'error'].to_dict()
+        result = result.loc[~failed, FEATURE_COLUMNS].reset_index()
+
+        features = result[FEATURE_COLUMNS].copy()
+        features[group_col] = result[group_col].to_numpy()
+        if carry_columns:
+            first_rows = trials_df.drop_duplicates(group_col).set_index(group_col)
+            for col in carry_columns:
+                features[col] = first_rows.loc[features[group_col], col].to_numpy()
+        return features
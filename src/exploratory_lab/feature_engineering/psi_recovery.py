@@ -0,0 +1,263 @@
+"""
+Batched fit of the exponential PSI recovery model (Task 27.1)
+
+    RT(PSI) = RT₀ + β * exp(-PSI / τ)
+
+BaselineFeatureExtractor._fit_exponential_recovery fits this model with one
+bounded curve_fit per session. PSI only takes the few values of the stimulus
+design (metadata_*), so every session reduces to per-PSI-level counts and RT
+sums, and all sessions can be fitted together:
+
+1. Profile τ on a shared log grid: for fixed τ, RT₀ and β follow from a 2×2
+   linear solve (with the RT₀ ≥ 0, β ≥ 0 bounds of the per-session fit).
+2. Refine τ inside the bracket around the best grid point by a vectorized
+   golden-section search on the profiled residual sum of squares.
+
+Because RT₀/β are optimal for every τ, the minimizer of the profile is the
+least-squares solution of the full 3-parameter problem (variable projection).
+The linear solve uses exp(-(PSI - PSI_min) / τ), i.e. the amplitude at the
+shortest PSI, which stays finite where β itself overflows.
+
+When τ is much shorter than the shortest PSI of the design, the model can only
+separate the shortest-PSI trials from the rest: the profile keeps decreasing
+towards the lower τ bound while β diverges. Such fits are reported with status
+'at_bound'. The per-session curve_fit stops somewhere on that slope (on
+neuro_data.db, PSI ≥ 800 ms, mostly at τ ≈ 30 ms), so the two agree only on
+sessions with an interior optimum.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+
+# Same bounds and sanity window as BaselineFeatureExtractor._fit_exponential_recovery
+TAU_BOUNDS = (1.0, 10000.0)
+TAU_VALID_RANGE = (10.0, 2000.0)
+MIN_POINTS = 15
+
+_GOLDEN = (np.sqrt(5.0) - 1.0) / 2.0
+_STEP_EPS = np.sqrt(np.finfo(float).eps)
+
+
+def _sufficient_statistics(psi: np.ndarray, rt: np.ndarray, mask: np.ndarray
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    PSI levels and per-session statistics of the RTs centered on the session mean:
+    counts and sums per level (sessions × levels), sum of squares and the mean.
+    """
+    levels, level_idx = np.unique(psi[mask], return_inverse=True)
+    n_sessions, n_levels = psi.shape[0], len(levels)
+    session_idx = np.nonzero(mask)[0]
+    flat = session_idx * n_levels + level_idx
+    y = rt[mask]
+
+    counts = np.bincount(flat, minlength=n_sessions * n_levels).reshape(n_sessions, n_levels).astype(float)
+    mean = np.bincount(session_idx, weights=y, minlength=n_sessions) / counts.sum(axis=1)
+    # Centering keeps the expanded residual sum of squares free of cancellation
+    y = y - mean[session_idx]
+    sums = np.bincount(flat, weights=y, minlength=n_sessions * n_levels).reshape(n_sessions, n_levels)
+    sum_sq = np.bincount(session_idx, weights=y * y, minlength=n_sessions)
+    return levels, counts, sums, sum_sq, mean
+
+
+def _solve_linear(counts, sums, sum_sq, mean, basis, nonnegative):
+    """
+    Optimal RT₀/β and residual sum of squares for the basis exp(-PSI/τ) of each τ.
+
+    counts/sums: (sessions, levels) of the centered RTs; basis: (sessions or 1, levels, taus).
+    Returns rt0, beta, sse of shape (sessions, taus).
+    """
+    a = counts.sum(axis=1)[:, None]
+    sy = sums.sum(axis=1)[:, None]
+    b = np.einsum('sk,skt->st', counts, basis) if basis.shape[0] > 1 else counts @ basis[0]
+    c = np.einsum('sk,skt->st', counts, basis * basis) if basis.shape[0] > 1 else counts @ (basis[0] ** 2)
+    sey = np.einsum('sk,skt->st', sums, basis) if basis.shape[0] > 1 else sums @ basis[0]
+    q = sum_sq[:, None]
+    m = mean[:, None]
+
+    # c0 is the intercept of the centered RTs (RT₀ = c0 + mean)
+    def sse(c0, beta):
+        return q - 2 * (c0 * sy + beta * sey) + c0 * c0 * a + 2 * c0 * beta * b + beta * beta * c
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        det = a * c - b * b
+        singular = ~(det > 1e-12 * np.maximum(a * c, 1e-300))
+        c0 = np.where(singular, sy / a, (c * sy - b * sey) / det)
+        beta = np.where(singular, 0.0, (a * sey - b * sy) / det)
+
+        if nonnegative:
+            # SSE is a convex quadratic in (RT₀, β): an infeasible unconstrained optimum
+            # moves to the better of the two boundary optima
+            infeasible = (c0 + m < 0) | (beta < 0)
+            edge_beta0 = (np.maximum(sy / a, -m), np.zeros_like(c0))
+            edge_rt00 = (np.broadcast_to(-m, c0.shape), np.where(c > 0, np.maximum((sey + m * b) / c, 0.0), 0.0))
+            use_beta0 = sse(*edge_beta0) <= sse(*edge_rt00)
+            c0 = np.where(infeasible, np.where(use_beta0, edge_beta0[0], edge_rt00[0]), c0)
+            beta = np.where(infeasible, np.where(use_beta0, edge_beta0[1], edge_rt00[1]), beta)
+
+    return c0 + m, beta, sse(c0, beta)
+
+
+def fit_exponential_recovery_batch(
+    psi: np.ndarray,
+    rt: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    tau_bounds: Tuple[float, float] = TAU_BOUNDS,
+    tau_valid_range: Optional[Tuple[float, float]] = TAU_VALID_RANGE,
+    nonnegative: bool = True,
+    min_points: int = MIN_POINTS,
+    n_grid: int = 256,
+    n_refine: int = 60
+) -> Dict[str, np.ndarray]:
+    """
+    Fit RT(PSI) = RT₀ + β * exp(-PSI / τ) for many sessions in one call.
+
+    Parameters
+    ----------
+    psi, rt : np.ndarray
+        Shape (sessions, trials); rows are padded to a common length.
+    mask : np.ndarray of bool, optional
+        Trials to use (default: where both psi and rt are finite).
+    tau_bounds : tuple
+        Search interval of τ (ms).
+    tau_valid_range : tuple, optional
+        τ outside this window is reported with status 'tau_out_of_range' and
+        NaN in 'tau' (as in the per-session fit); None disables the check.
+    nonnegative : bool, default=True
+        Constrain RT₀ ≥ 0 and β ≥ 0.
+    min_points : int, default=15
+        Sessions with fewer trials get status 'insufficient_data'.
+    n_grid : int
+        Log-spaced τ grid points of the profile.
+    n_refine : int
+        Golden-section iterations inside the best grid bracket.
+
+    Returns
+    -------
+    dict
+        Arrays of length sessions: 'tau' (NaN unless status is 'ok'), 'tau_fit'
+        (fitted τ regardless of the validity window), 'rt0', 'beta', 'sse',
+        'n_points' and 'status' ('ok', 'insufficient_data', 'tau_out_of_range',
+        or 'at_bound' when the optimum lies at a τ bound or in the step limit).
+    """
+    psi = np.atleast_2d(np.asarray(psi, dtype=float))
+    rt = np.atleast_2d(np.asarray(rt, dtype=float))
+    if psi.shape != rt.shape:
+        raise ValueError(f"psi and rt must have the same shape, got {psi.shape} and {rt.shape}")
+    if mask is None:
+        mask = np.isfinite(psi) & np.isfinite(rt)
+    else:
+        mask = np.asarray(mask, dtype=bool) & np.isfinite(psi) & np.isfinite(rt)
+
+    n_sessions = psi.shape[0]
+    n_points = mask.sum(axis=1)
+    result = {
+        'tau': np.full(n_sessions, np.nan),
+        'tau_fit': np.full(n_sessions, np.nan),
+        'rt0': np.full(n_sessions, np.nan),
+        'beta': np.full(n_sessions, np.nan),
+        'sse': np.full(n_sessions, np.nan),
+        'n_points': n_points,
+        'status': np.full(n_sessions, 'insufficient_data', dtype=object),
+    }
+    fit = n_points >= max(min_points, 3)
+    if not fit.any():
+        return result
+
+    levels, counts, sums, sum_sq, mean = _sufficient_statistics(psi[fit], rt[fit], mask[fit])
+
+    # 1. Profile over a shared grid (one basis matrix for all sessions)
+    log_lo, log_hi = np.log(tau_bounds[0]), np.log(tau_bounds[1])
+    log_grid = np.linspace(log_lo, log_hi, n_grid)
+    offsets = levels - levels[0]
+    basis = np.exp(-offsets[:, None] / np.exp(log_grid)[None, :])[None]
+    _, _, grid_sse = _solve_linear(counts, sums, sum_sq, mean, basis, nonnegative)
+    best = np.argmin(grid_sse, axis=1)
+
+    # 2. Golden-section search on log τ inside [grid[best-1], grid[best+1]]
+    lo = log_grid[np.maximum(best - 1, 0)]
+    hi = log_grid[np.minimum(best + 1, n_grid - 1)]
+
+    def profile(log_tau):
+        basis = np.exp(-offsets[None, :, None] / np.exp(log_tau)[:, None, None])
+        rt0, beta, sse = _solve_linear(counts, sums, sum_sq, mean, basis, nonnegative)
+        return rt0[:, 0], beta[:, 0], sse[:, 0]
+
+    x1 = hi - _GOLDEN * (hi - lo)
+    x2 = lo + _GOLDEN * (hi - lo)
+    f1, f2 = profile(x1)[2], profile(x2)[2]
+    for _ in range(n_refine):
+        left = f1 <= f2
+        hi = np.where(left, x2, hi)
+        lo = np.where(left, lo, x1)
+        x2_new = np.where(left, x1, lo + _GOLDEN * (hi - lo))
+        x1_new = np.where(left, hi - _GOLDEN * (hi - lo), x2)
+        f_new = profile(np.where(left, x1_new, x2_new))[2]
+        f1, f2 = np.where(left, f_new, f2), np.where(left, f1, f_new)
+        x1, x2 = x1_new, x2_new
+
+    # Keep the refined point unless a grid point was better (flat profiles)
+    log_tau = np.where(f1 <= f2, x1, x2)
+    rt0, beta, sse = profile(log_tau)
+    grid_best_sse = grid_sse[np.arange(len(best)), best]
+    worse = sse > grid_best_sse
+    if worse.any():
+        log_tau = np.where(worse, log_grid[best], log_tau)
+        rt0, beta, sse = profile(log_tau)
+
+    tau = np.exp(log_tau)
+    result['tau_fit'][fit] = tau
+    result['rt0'][fit] = rt0
+    with np.errstate(over='ignore'):
+        result['beta'][fit] = beta * np.exp(levels[0] / tau)
+    result['sse'][fit] = sse
+
+    status = np.full(len(tau), 'ok', dtype=object)
+    if tau_valid_range is not None:
+        status[(tau < tau_valid_range[0]) | (tau > tau_valid_range[1])] = 'tau_out_of_range'
+    # At a τ bound, or so far below the PSI spacing that the model is numerically a
+    # step at the shortest PSI (the profile is flat there up to rounding)
+    step_limit = np.exp(-offsets[1] / tau) < _STEP_EPS if len(offsets) > 1 else np.zeros(len(tau), dtype=bool)
+    status[(best == 0) | (best == n_grid - 1) | step_limit] = 'at_bound'
+    # τ is not identifiable from fewer than three PSI levels
+    status[(counts > 0).sum(axis=1) < 3] = 'insufficient_data'
+    result['status'][fit] = status
+    result['tau'][fit] = np.where(status == 'ok', tau, np.nan)
+    return result
+
+
+def fit_grouped_psi_recovery(trials_df: pd.DataFrame, group_col: str = 'session_id', **fit_kwargs) -> pd.DataFrame:
+    """
+    Batched exponential PSI fit for every group (session or subject) of trial-level data.
+
+    Uses the trials BaselineFeatureExtractor fits: is_outlier == False and non-null psi/rt.
+
+    Parameters
+    ----------
+    trials_df : pd.DataFrame
+        Trial-level data (see exploratory_lab.data_loader.trials_to_long).
+    group_col : str, default='session_id'
+        Grouping column.
+    **fit_kwargs
+        Passed to fit_exponential_recovery_batch.
+
+    Returns
+    -------
+    pd.DataFrame
+        Index group_col (sorted), columns tau, tau_fit, rt0, beta, sse, n_points, status.
+    """
+    codes, keys = pd.factorize(trials_df[group_col], sort=True)
+    valid = ((trials_df['is_outlier'] == False) & trials_df['psi'].notna() & trials_df['rt'].notna()).to_numpy()
+    valid = valid & (codes >= 0)  # rows without a group key (dropped by groupby as well)
+    codes = codes[valid]
+    positions = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+
+    width = positions.max() + 1 if len(positions) else 1
+    psi = np.full((len(keys), width), np.nan)
+    rt = np.full((len(keys), width), np.nan)
+    psi[codes, positions] = trials_df['psi'].to_numpy(dtype=float)[valid]
+    rt[codes, positions] = trials_df['rt'].to_numpy(dtype=float)[valid]
+
+    fit = fit_exponential_recovery_batch(psi, rt, **fit_kwargs)
+    return pd.DataFrame(fit, index=pd.Index(keys, name=group_col))
@@ -60,7 +60,8 @@ class ExploratoryPipeline:
         self,
         subject_ids: Optional[list] = None,
         min_sessions: int = 3,
-        output_dir: str = "data/exploratory"
+        output_dir: str = "data/exploratory",
+        n_jobs: int = 1
     ) -> Dict[str, Any]:
         """
         Run complete exploratory analysis pipeline.
@@ -73,6 +74,8 @@ class ExploratoryPipeline:
             Minimum number of sessions required
         output_dir : str
             Directory for saving results
+        n_jobs : int, default=1
+            Worker processes for feature extraction (-1 = all cores)
         
         Returns
         -------
@@ -91,7 +94,7 @@ class ExploratoryPipeline:
         
         # Step 2: Extract features
         print("\n[2/7] Extracting corrected baseline features (11 features)...")
-        self.features_df = self.feature_extractor.extract_population_features(trials_df)
+        self.features_df = self.feature_extractor.extract_population_features(trials_df, n_jobs=n_jobs)
         print(f"  → Extracted features for {len(self.features_df)} subjects")
         print(f"  → Features: {list(self.features_df.columns)}")
         
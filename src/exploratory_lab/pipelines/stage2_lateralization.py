@@ -19,6 +19,7 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 
 # Ensure import paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from exploratory_lab.geometry.stability import pca_metrics, run_bootstrap, run_split_half
@@ -36,6 +37,7 @@ OUTPUT_REPORT = PROJECT_ROOT / "data" / "exploratory" / "reports" / "Task_30_Sta
 N_BOOTSTRAP = 1000
 N_SPLITS = 500
 RANDOM_SEED = 42
+N_JOBS = -1  # feature extraction worker processes (-1 = all cores)
 
 MODEL_MAP = {
     "delta_v4_left":  "median_dv1_left",
@@ -68,73 +70,17 @@ RNG = np.random.default_rng(RANDOM_SEED)
 
 def load_data():
     """Loads session-level features and reconstructs residuals."""
-    import sqlite3
-    from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor
+    from exploratory_lab.data_loader import load_trials_long
+    from exploratory_lab.feature_engineering.feature_store import FeatureStore, DEFAULT_STORE_DIR
     
-    conn = sqlite3.connect(DATABASE_PATH)
-    trials_query = """
-    SELECT 
-        t.trial_id as session_id, t.subject_id, t.test_date,
-        t.tst1_1, t.tst1_2, t.tst1_3, t.tst1_4, t.tst1_5, t.tst1_6, t.tst1_7, t.tst1_8, t.tst1_9, t.tst1_10, t.tst1_11, t.tst1_12,
-        t.tst1_13, t.tst1_14, t.tst1_15, t.tst1_16, t.tst1_17, t.tst1_18, t.tst1_19, t.tst1_20, t.tst1_21, t.tst1_22, t.tst1_23, t.tst1_24,
-        t.tst1_25, t.tst1_26, t.tst1_27, t.tst1_28, t.tst1_29, t.tst1_30, t.tst1_31, t.tst1_32, t.tst1_33, t.tst1_34, t.tst1_35, t.tst1_36,
-        t.tst2_1, t.tst2_2, t.tst2_3, t.tst2_4, t.tst2_5, t.tst2_6, t.tst2_7, t.tst2_8, t.tst2_9, t.tst2_10, t.tst2_11, t.tst2_12,
-        t.tst2_13, t.tst2_14, t.tst2_15, t.tst2_16, t.tst2_17, t.tst2_18, t.tst2_19, t.tst2_20, t.tst2_21, t.tst2_22, t.tst2_23, t.tst2_24,
-        t.tst2_25, t.tst2_26, t.tst2_27, t.tst2_28, t.tst2_29, t.tst2_30, t.tst2_31, t.tst2_32, t.tst2_33, t.tst2_34, t.tst2_35, t.tst2_36,
-        t.tst3_1, t.tst3_2, t.tst3_3, t.tst3_4, t.tst3_5, t.tst3_6, t.tst3_7, t.tst3_8, t.tst3_9, t.tst3_10, t.tst3_11, t.tst3_12,
-        t.tst3_13, t.tst3_14, t.tst3_15, t.tst3_16, t.tst3_17, t.tst3_18, t.tst3_19, t.tst3_20, t.tst3_21, t.tst3_22, t.tst3_23, t.tst3_24,
-        t.tst3_25, t.tst3_26, t.tst3_27, t.tst3_28, t.tst3_29, t.tst3_30, t.tst3_31, t.tst3_32, t.tst3_33, t.tst3_34, t.tst3_35, t.tst3_36
-    FROM trials t INNER JOIN users u ON t.subject_id = u.subject_id
-    """
-    trials_wide = pd.read_sql_query(trials_query, conn)
+    trials_df = load_trials_long(DATABASE_PATH, with_test_date=True)
     
-    meta_s = pd.read_sql_query("SELECT * FROM metadata_simple", conn)
-    meta_c = pd.read_sql_query("SELECT * FROM metadata_color_red", conn)
-    meta_sh = pd.read_sql_query("SELECT * FROM metadata_shift", conn)
-    conn.close()
-
-    trial_level_data = []
-    for _, sr in trials_wide.iterrows():
-        sid, tid, date = sr['subject_id'], sr['session_id'], sr['test_date']
-        for stim in range(1, 37):
-            rt = sr[f'tst1_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = meta_s[meta_s['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_date': date,
-                    'test_type': 'Tst1', 'stimulus_id': stim, 'stimulus_location': m['position'], 'stimulus_color': m['color'], 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False})
-        for stim in range(1, 37):
-            rt = sr[f'tst2_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = meta_c[meta_c['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_date': date,
-                    'test_type': 'Tst2', 'stimulus_id': stim, 'stimulus_location': m['position'], 'stimulus_color': 'red', 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False})
-        for stim in range(1, 37):
-            rt = sr[f'tst3_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = meta_sh[meta_sh['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_date': date,
-                    'test_type': 'Tst3', 'stimulus_id': stim, 'stimulus_location': m['position'], 'stimulus_color': m['color'], 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False})
-    
-    trials_df = pd.DataFrame(trial_level_data)
-    
-    # Extract session features
-    extractor = BaselineFeatureExtractor()
-    session_features = []
-    for tid in trials_df['session_id'].unique():
-        sdf = trials_df[trials_df['session_id'] == tid]
-        sid = sdf['subject_id'].iloc[0]
-        date = sdf['test_date'].iloc[0]
-        try:
-            feats = extractor.extract_subject_features(sdf)
-            if isinstance(feats, dict) and 'asym_dv1_abs' in feats and pd.notna(feats['asym_dv1_abs']):
-                feats['session_id'] = tid
-                feats['subject_id'] = sid
-                feats['test_date'] = date
-                session_features.append(feats)
-        except Exception as e:
-            print(f"Extraction failed for session {tid}: {e}")
-            
-    df_sess = pd.DataFrame(session_features)
+    # Extract session features (cached; only new or changed sessions are re-extracted)
+    store = FeatureStore(PROJECT_ROOT / DEFAULT_STORE_DIR, n_jobs=N_JOBS)
+    df_sess = store.extract(trials_df, carry_columns=('subject_id', 'test_date'), database_path=DATABASE_PATH)
+    for tid, error in store.failures.items():
+        print(f"Extraction failed for session {tid}: {error}")
+    df_sess = df_sess[df_sess['asym_dv1_abs'].notna()].reset_index(drop=True)
     
     # Reconstruct residuals
     linear_csv = pd.read_csv(LINEAR_CSV, index_col=0)
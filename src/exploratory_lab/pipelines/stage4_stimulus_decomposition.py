@@ -11,22 +11,24 @@
 # only and does not imply interpretation, inference, or evaluation.
 """
 
+import re
 import sys
 from pathlib import Path
-import sqlite3
 import numpy as np
 import pandas as pd
 from scipy import stats
 from scipy.optimize import curve_fit
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
-import warnings
 
 # Ensure import paths
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from exploratory_lab.geometry.stability import pca_metrics, run_bootstrap, run_split_half
-from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor
+from exploratory_lab.feature_engineering.feature_store import FeatureStore, DEFAULT_STORE_DIR
+from exploratory_lab.feature_engineering.psi_recovery import fit_exponential_recovery_batch
+from exploratory_lab.data_loader import load_trials_long
 
 # ============================================================================
 # CONFIGURATION
@@ -41,6 +43,7 @@ OUTPUT_REPORT = PROJECT_ROOT / "data" / "exploratory" / "reports" / "Task_32_Sta
 N_BOOTSTRAP = 500
 N_SPLITS = 250
 RANDOM_SEED = 42
+N_JOBS = -1  # feature extraction worker processes (-1 = all cores)
 
 MODEL_MAP = {
     "delta_v4_left":  "median_dv1_left",
@@ -65,84 +68,22 @@ RNG = np.random.default_rng(RANDOM_SEED)
 
 def get_raw_trials():
     """Returns the unaggregated raw trial dataframe with full metadata joined."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    trials_query = """
-    SELECT 
-        t.trial_id as session_id, t.subject_id, t.test_date,
-        t.tst1_1, t.tst1_2, t.tst1_3, t.tst1_4, t.tst1_5, t.tst1_6, t.tst1_7, t.tst1_8, t.tst1_9, t.tst1_10, t.tst1_11, t.tst1_12,
-        t.tst1_13, t.tst1_14, t.tst1_15, t.tst1_16, t.tst1_17, t.tst1_18, t.tst1_19, t.tst1_20, t.tst1_21, t.tst1_22, t.tst1_23, t.tst1_24,
-        t.tst1_25, t.tst1_26, t.tst1_27, t.tst1_28, t.tst1_29, t.tst1_30, t.tst1_31, t.tst1_32, t.tst1_33, t.tst1_34, t.tst1_35, t.tst1_36,
-        t.tst2_1, t.tst2_2, t.tst2_3, t.tst2_4, t.tst2_5, t.tst2_6, t.tst2_7, t.tst2_8, t.tst2_9, t.tst2_10, t.tst2_11, t.tst2_12,
-        t.tst2_13, t.tst2_14, t.tst2_15, t.tst2_16, t.tst2_17, t.tst2_18, t.tst2_19, t.tst2_20, t.tst2_21, t.tst2_22, t.tst2_23, t.tst2_24,
-        t.tst2_25, t.tst2_26, t.tst2_27, t.tst2_28, t.tst2_29, t.tst2_30, t.tst2_31, t.tst2_32, t.tst2_33, t.tst2_34, t.tst2_35, t.tst2_36,
-        t.tst3_1, t.tst3_2, t.tst3_3, t.tst3_4, t.tst3_5, t.tst3_6, t.tst3_7, t.tst3_8, t.tst3_9, t.tst3_10, t.tst3_11, t.tst3_12,
-        t.tst3_13, t.tst3_14, t.tst3_15, t.tst3_16, t.tst3_17, t.tst3_18, t.tst3_19, t.tst3_20, t.tst3_21, t.tst3_22, t.tst3_23, t.tst3_24,
-        t.tst3_25, t.tst3_26, t.tst3_27, t.tst3_28, t.tst3_29, t.tst3_30, t.tst3_31, t.tst3_32, t.tst3_33, t.tst3_34, t.tst3_35, t.tst3_36
-    FROM trials t INNER JOIN users u ON t.subject_id = u.subject_id
-    """
-    trials_wide = pd.read_sql_query(trials_query, conn)
-    
-    meta_s = pd.read_sql_query("SELECT * FROM metadata_simple", conn)
-    meta_c = pd.read_sql_query("SELECT * FROM metadata_color_red", conn)
-    meta_sh = pd.read_sql_query("SELECT * FROM metadata_shift", conn)
-    conn.close()
-
-    trial_level_data = []
-    
-    def _count_triples(mask_str):
-        if not mask_str or pd.isna(mask_str):
-            return 0
-        return len(mask_str.strip().split(' '))
-
-    for _, sr in trials_wide.iterrows():
-        sid, tid, date = sr['subject_id'], sr['session_id'], sr['test_date']
-        for stim in range(1, 37):
-            rt = sr[f'tst1_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = meta_s[meta_s['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_date': date,
-                    'test_type': 'Tst1', 'stimulus_id': stim, 'stimulus_location': m['position'], 'stimulus_color': m['color'], 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False,
-                    'shift_parameter': 0, 'mask_triples_count': 0})
-        for stim in range(1, 37):
-            rt = sr[f'tst2_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = meta_c[meta_c['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_date': date,
-                    'test_type': 'Tst2', 'stimulus_id': stim, 'stimulus_location': m['position'], 'stimulus_color': 'red', 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False,
-                    'shift_parameter': 0, 'mask_triples_count': _count_triples(m['mask_triples'])})
-        for stim in range(1, 37):
-            rt = sr[f'tst3_{stim}']
-            if pd.notna(rt) and rt > 0:
-                m = meta_sh[meta_sh['stimulus_id'] == stim].iloc[0]
-                trial_level_data.append({'subject_id': sid, 'session_id': tid, 'test_date': date,
-                    'test_type': 'Tst3', 'stimulus_id': stim, 'stimulus_location': m['position'], 'stimulus_color': m['color'], 'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False,
-                    'shift_parameter': m['shift_parameter'], 'mask_triples_count': _count_triples(m['mask_triples'])})
-    return pd.DataFrame(trial_level_data)
+    return load_trials_long(DATABASE_PATH, with_test_date=True, stimulus_attributes=True)
 
 
 def extract_stratum(trials_df: pd.DataFrame, condition_name: str):
     """Takes filtered trial records and extracts session and population features."""
-    extractor = BaselineFeatureExtractor()
-    session_features = []
-    
     # We only process sessions that still have enough data after filtering
-    grouped = trials_df.groupby('session_id')
-    for tid, sdf in grouped:
-        if len(sdf) < 15: # Arbitrary minimum trials for feature extraction to work
-            continue
-        sid = sdf['subject_id'].iloc[0]
-        date = sdf['test_date'].iloc[0]
-        try:
-            feats = extractor.extract_subject_features(sdf)
-            if isinstance(feats, dict) and 'asym_dv1_abs' in feats and pd.notna(feats['asym_dv1_abs']):
-                feats['session_id'] = tid
-                feats['subject_id'] = sid
-                feats['test_date'] = date
-                session_features.append(feats)
-        except Exception as e:
-            pass # Silent fail for missing elements (e.g. no left stimulus left after filter)
-            
-    df_sess = pd.DataFrame(session_features)
+    # (arbitrary minimum trials for feature extraction to work)
+    n_trials = trials_df.groupby('session_id')['session_id'].transform('size')
+    trials_df = trials_df[n_trials >= 15].sort_values('session_id', kind='stable')
+
+    # One feature store per stratum (the same session has different trials in each).
+    # Failed sessions are skipped silently (e.g. no left stimulus left after filter)
+    store_name = "stage4_" + re.sub(r'[^0-9a-z]+', '_', condition_name.lower()).strip('_')
+    df_sess = FeatureStore(PROJECT_ROOT / DEFAULT_STORE_DIR, name=store_name, n_jobs=N_JOBS).extract(
+        trials_df, carry_columns=('subject_id', 'test_date'), database_path=DATABASE_PATH)
+    df_sess = df_sess[df_sess['asym_dv1_abs'].notna()].reset_index(drop=True)
     if len(df_sess) == 0:
         return None, None
         
@@ -284,36 +225,39 @@ def analyze_psi_nonlinearity(raw_trials_df):
     v5_agg = valid_p[valid_p['test_type'] == 'Tst3'].groupby('psi')['delta_rt'].median()
     
     def linear_model(x, a, b): return a * x + b
-    def exp_model(x, rt0, beta, tau): return rt0 + beta * np.exp(-x / tau)
+    
+    series = [('V4 (Color)', v4_agg), ('V5 (Motion)', v5_agg)]
+    
+    # Exponential fits of both curves in one batched call (unbounded, as curve_fit without bounds)
+    width = max(len(s) for _, s in series)
+    psi_grid = np.full((len(series), width), np.nan)
+    delta_grid = np.full((len(series), width), np.nan)
+    for i, (_, s) in enumerate(series):
+        psi_grid[i, :len(s)] = s.index.values
+        delta_grid[i, :len(s)] = s.values
+    exp_fits = fit_exponential_recovery_batch(psi_grid, delta_grid, nonnegative=False, tau_bounds=(1, 1e6),
+                                              tau_valid_range=None, min_points=3)
     
     models = {}
-    for name, series in [('V4 (Color)', v4_agg), ('V5 (Motion)', v5_agg)]:
-        x = series.index.values
-        y = series.values
+    for i, (name, series_i) in enumerate(series):
+        x = series_i.index.values
+        y = series_i.values
+        ss_tot = np.sum((y - np.mean(y))**2)
         
         # Linear
         try:
             line_popt, _ = curve_fit(linear_model, x, y)
             res = y - linear_model(x, *line_popt)
             ss_res = np.sum(res**2)
-            ss_tot = np.sum((y - np.mean(y))**2)
             r2_lin = 1 - (ss_res / ss_tot)
         except:
              r2_lin = np.nan
              
         # Exp
-        try:
-            rt_min = np.min(y)
-            rt_max = np.max(y)
-            p0 = [rt_min, rt_max - rt_min, 1500]
-            with warnings.catch_warnings():
-                warnings.simplefilter('ignore')
-                exp_popt, _ = curve_fit(exp_model, x, y, p0=p0, maxfev=5000)
-                res = y - exp_model(x, *exp_popt)
-                ss_res = np.sum(res**2)
-                r2_exp = 1 - (ss_res / ss_tot)
-        except:
-             r2_exp = np.nan
+        if exp_fits['status'][i] != 'insufficient_data':
+            r2_exp = 1 - (exp_fits['sse'][i] / ss_tot)
+        else:
+            r2_exp = np.nan
              
         models[name] = {'R2_Linear': r2_lin, 'R2_Exponential': r2_exp}
         
@@ -6,7 +6,9 @@ Loader for pre-computed scenario results.
 
 from pathlib import Path
 import pandas as pd
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+from src.c3_core.scenario_engine.scenario_export import file_checksum, read_manifest, scenario_file_stem, MANIFEST_FILE
 
 # Canonical path resolution
 BASE_DIR = Path(__file__).resolve().parents[3]
@@ -16,23 +18,113 @@ class ScenarioLoader:
     """
     Handles loading of scenario results from persisted storage.
     Ensures absolute path resolution relative to project root.
+
+    Exports with a manifest.json (ScenarioEngineV4.export_results(mode="manifest")) support
+    column and subject range selection; files whose checksum is unchanged since the last
+    load are served from memory instead of being read again. A manifest entry is only
+    used while its files match the recorded size/mtime (or SHA-256) and no newer plain
+    <stem>.parquet exists; otherwise the plain file is loaded.
     """
     def __init__(self, data_dir: Optional[Path] = None):
-        self.data_dir = data_dir or SCENARIO_ROOT
+        self.data_dir = Path(data_dir) if data_dir is not None else SCENARIO_ROOT
+        # (relative path, columns) -> (sha256, DataFrame)
+        self._file_cache: Dict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[str, pd.DataFrame]] = {}
+        # relative path -> (size, mtime_ns, sha256) of files hashed for validation
+        self._checksum_cache: Dict[str, Tuple[int, int, str]] = {}
 
-    def load_scenario(self, scenario_id: str) -> Optional[pd.DataFrame]:
+    def load_scenario(self, scenario_id: str, columns: Optional[List[str]] = None,
+                      subject_range: Optional[Tuple[int, int]] = None) -> Optional[pd.DataFrame]:
         """
         Loads a specific scenario result by ID (e.g., 'A0.0').
+
+        Args:
+            columns: Optional subset of columns to read.
+            subject_range: Optional inclusive (first, last) subject_id range.
         """
-        safe_name = scenario_id.replace(".", "_")
+        safe_name = scenario_file_stem(scenario_id)
         path = self.data_dir / f"{safe_name}.parquet"
-        
+
+        try:
+            manifest = read_manifest(self.data_dir)
+            if manifest is not None and scenario_id in manifest["scenarios"]:
+                entry = manifest["scenarios"][scenario_id]
+                if self._manifest_entry_is_current(entry, path):
+                    return self._load_from_manifest(entry, columns, subject_range)
+                print(f"Manifest entry for {scenario_id} does not match the files on disk; loading {path.name}")
+        except Exception as e:
+            print(f"Error loading scenario {scenario_id}: {e}")
+            return None
+
         if not path.exists():
             print(f"Scenario file not found: {path}")
             return None
-            
+
         try:
-            return pd.read_parquet(path, engine="fastparquet")
+            df = pd.read_parquet(path, engine="fastparquet", columns=columns)
+            return self._filter_subjects(df, subject_range)
         except Exception as e:
             print(f"Error loading scenario {scenario_id}: {e}")
             return None
+
+    def _manifest_entry_is_current(self, entry: dict, plain_path: Path) -> bool:
+        """True if the entry's files are unchanged and no newer unlisted <stem>.parquet exists."""
+        listed = {file_entry["path"] for file_entry in entry["files"]}
+        if plain_path.name not in listed and plain_path.exists():
+            if plain_path.stat().st_mtime_ns > (self.data_dir / MANIFEST_FILE).stat().st_mtime_ns:
+                return False
+
+        for file_entry in entry["files"]:
+            path = self.data_dir / file_entry["path"]
+            if not path.exists():
+                return False
+            stat = path.stat()
+            if file_entry.get("size") == stat.st_size and file_entry.get("mtime_ns") == stat.st_mtime_ns:
+                continue
+            # Touched or copied files (and manifests without size/mtime): compare content
+            cached = self._checksum_cache.get(file_entry["path"])
+            if cached is None or cached[:2] != (stat.st_size, stat.st_mtime_ns):
+                cached = (stat.st_size, stat.st_mtime_ns, file_checksum(path))
+                self._checksum_cache[file_entry["path"]] = cached
+            if cached[2] != file_entry["sha256"]:
+                return False
+        return True
+
+    def _load_from_manifest(self, entry: dict, columns: Optional[List[str]],
+                            subject_range: Optional[Tuple[int, int]]) -> pd.DataFrame:
+        read_columns = list(columns) if columns is not None else None
+        if subject_range is not None and read_columns is not None and 'subject_id' not in read_columns:
+            read_columns.append('subject_id')
+
+        parts = []
+        for file_entry in entry["files"]:
+            # Skip files entirely outside the requested subject range
+            if subject_range is not None and "subject_id_min" in file_entry:
+                if file_entry["subject_id_max"] < subject_range[0] or file_entry["subject_id_min"] > subject_range[1]:
+                    continue
+            parts.append(self._read_file(file_entry, read_columns))
+
+        if not parts:
+            df = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in entry["schema"].items()})
+            df = df[read_columns] if read_columns is not None else df
+        else:
+            df = pd.concat(parts, ignore_index=True)
+
+        df = self._filter_subjects(df, subject_range)
+        return df[columns] if columns is not None else df
+
+    def _read_file(self, file_entry: dict, columns: Optional[List[str]]) -> pd.DataFrame:
+        key = (file_entry["path"], tuple(columns) if columns is not None else None)
+        cached = self._file_cache.get(key)
+        if cached is not None and cached[0] == file_entry["sha256"]:
+            return cached[1].copy()
+
+        df = pd.read_parquet(self.data_dir / file_entry["path"], engine="fastparquet", columns=columns)
+        self._file_cache[key] = (file_entry["sha256"], df)
+        return df.copy()
+
+    @staticmethod
+    def _filter_subjects(df: pd.DataFrame, subject_range: Optional[Tuple[int, int]]) -> pd.DataFrame:
+        if subject_range is None or 'subject_id' not in df.columns:
+            return df
+        mask = df['subject_id'].between(subject_range[0], subject_range[1])
+        return df[mask].reset_index(drop=True)
@@ -24,6 +24,7 @@ class DistributionStructureResult:
     density_curve: List[float] = field(default_factory=list)  # Precomputed KDE values
     density_grid: List[float] = field(default_factory=list)   # Grid points for KDE
     detected_peaks: List[float] = field(default_factory=list) # Indices or values of peaks
+    degenerate: bool = False  # Input admits no density (too few points, non-finite or constant)
     
     # Provenance and reproducibility
     input_parameters: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,217 @@
+"""
+shared.data_access
+
+Shared read-only access to neuro_data.db-style SQLite databases.
+
+All loaders (C3 ETL, exploratory lab, C3.x procedures, scripts) obtain their
+connections here instead of calling sqlite3.connect themselves:
+
+- Connections are opened read-only with an immutable URI (no locking, no journal
+  checks) and tuned pragmas (mmap_size, cache_size, temp_store=MEMORY), and are
+  pooled per database file.
+- A pool is bound to a snapshot of the file (size + mtime). When the file changes,
+  the next request opens a fresh pool, so immutable connections never serve stale pages.
+- Canonical tables are read through prepared helpers; results are cached per snapshot,
+  so repeated loads within one process do not re-read the database. The small
+  metadata_*/warmup_*/system_parameters/users tables are always cached, large tables
+  (trials) only on request.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Pragmas applied to every pooled connection
+READ_PRAGMAS = {
+    "mmap_size": 256 * 2**20,
+    "cache_size": -64 * 2**10,   # negative = KiB, i.e. 64 MiB
+    "temp_store": "MEMORY",
+    "query_only": 1,
+}
+MAX_POOL_CONNECTIONS = 4
+
+# Tables cached by default (small, read by nearly every loader)
+STATIC_TABLES = (
+    "users",
+    "metadata_simple", "metadata_color_red", "metadata_shift",
+    "warmup_simple", "warmup_color_red", "warmup_shift",
+    "system_parameters",
+)
+# All canonical tables of neuro_data.db that read_table accepts
+CANONICAL_TABLES = STATIC_TABLES + ("trials",)
+
+# Test type -> metadata table
+METADATA_TABLES = {
+    "Tst1": "metadata_simple",
+    "Tst2": "metadata_color_red",
+    "Tst3": "metadata_shift",
+}
+
+
+def _snapshot_key(db_path) -> Tuple[str, int, int]:
+    path = Path(db_path).resolve()
+    stat = os.stat(path)
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands it back to its pool instead of closing it."""
+
+    _pool: Optional["ReadOnlyConnectionPool"] = None
+
+    def close(self):
+        pool = self._pool
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def _close_now(self):
+        super().close()
+
+
+class ReadOnlyConnectionPool:
+    """Pool of read-only connections to one snapshot of a database file."""
+
+    def __init__(self, db_path, max_connections: int = MAX_POOL_CONNECTIONS, immutable: bool = True):
+        self.db_path = Path(db_path).resolve()
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+        self.max_connections = max_connections
+        self.immutable = immutable
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> PooledConnection:
+        uri = f"{self.db_path.as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        conn = sqlite3.connect(uri, uri=True, factory=PooledConnection, check_same_thread=False)
+        for pragma, value in READ_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        conn._pool = self
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn: PooledConnection):
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_connections:
+                self._idle.append(conn)
+                return
+        conn._close_now()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn._close_now()
+
+
+_POOLS: Dict[str, Tuple[Tuple[str, int, int], ReadOnlyConnectionPool]] = {}
+_TABLE_CACHE: Dict[Tuple, pd.DataFrame] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_pool(db_path) -> ReadOnlyConnectionPool:
+    """Returns the pool of the current snapshot of db_path (replacing the pool of an older snapshot)."""
+    key = _snapshot_key(db_path)
+    with _REGISTRY_LOCK:
+        entry = _POOLS.get(key[0])
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        pool = ReadOnlyConnectionPool(key[0])
+        _POOLS[key[0]] = (key, pool)
+        # Cached tables of older snapshots of this file are dropped with their pool
+        for cache_key in [k for k in _TABLE_CACHE if k[0][0] == key[0] and k[0] != key]:
+            del _TABLE_CACHE[cache_key]
+    if entry is not None:
+        entry[1].close()
+    return pool
+
+
+def connect_readonly(db_path) -> PooledConnection:
+    """
+    Drop-in replacement for sqlite3.connect(db_path) in read-only loaders.
+    Calling close() on the returned connection returns it to the pool.
+    """
+    return get_pool(db_path).acquire()
+
+
+@contextmanager
+def read_connection(db_path):
+    """Context manager yielding a pooled read-only connection."""
+    conn = connect_readonly(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def read_table(db_path, table: str, columns: Optional[List[str]] = None,
+               cache: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Reads a canonical table (optionally a column subset).
+
+    Args:
+        cache: Keep the result for this snapshot of the database
+            (default: only for STATIC_TABLES).
+
+    Returns:
+        A DataFrame the caller may modify (cached frames are handed out as copies).
+    """
+    if table not in CANONICAL_TABLES:
+        raise ValueError(f"Unknown table '{table}'. Expected one of {CANONICAL_TABLES}")
+    if cache is None:
+        cache = table in STATIC_TABLES
+
+    snapshot = _snapshot_key(db_path)
+    cache_key = (snapshot, table, tuple(columns) if columns is not None else None)
+    if cache:
+        cached = _TABLE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached.copy()
+
+    select = ", ".join(f'"{c}"' for c in columns) if columns is not None else "*"
+    with read_connection(db_path) as conn:
+        df = pd.read_sql_query(f"SELECT {select} FROM {table}", conn)
+
+    if cache:
+        with _REGISTRY_LOCK:
+            _TABLE_CACHE[cache_key] = df
+        return df.copy()
+    return df
+
+
+def read_users(db_path) -> pd.DataFrame:
+    return read_table(db_path, "users")
+
+
+def read_trials(db_path, columns: Optional[List[str]] = None, cache: bool = False) -> pd.DataFrame:
+    return read_table(db_path, "trials", columns=columns, cache=cache)
+
+
+def read_metadata_tables(db_path) -> Dict[str, pd.DataFrame]:
+    """Stimulus metadata per test type ('Tst1'..'Tst3'), from the in-process cache."""
+    return {test_type: read_table(db_path, table) for test_type, table in METADATA_TABLES.items()}
+
+
+def clear_cache():
+    """Closes all pools and drops all cached tables."""
+    with _REGISTRY_LOCK:
+        pools = [pool for _, pool in _POOLS.values()]
+        _POOLS.clear()
+        _TABLE_CACHE.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,253 @@
+"""
+shared.trial_events
+
+Materialized long-format trial table derived from neuro_data.db.
+
+The source stores one row per session with 108 wide tstN_k RT columns; every
+consumer used to unpivot them and join the stimulus metadata in Python. This
+module builds a derived SQLite file next to the (read-only) source holding
+
+    trial_events(session_id, subject_id, test_type, stimulus_index,
+                 rt_ms, psi_ms, color, position)
+
+one row per presented stimulus. The table is clustered by (session_id,
+test_type, stimulus_index) and carries two covering indexes, led by
+(subject_id, session_id) and (test_type, position), so subject- and
+condition-filtered loads are index range scans that never touch the table.
+
+The derived file records the fingerprint of the source it was built from and is
+rebuilt by ensure_trial_events() whenever the source content changes.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import pandas as pd
+
+from .data_access import METADATA_TABLES, connect_readonly
+
+# Bump when the layout of the derived file changes (forces a rebuild)
+TRIAL_EVENTS_SCHEMA_VERSION = "trial_events_v1"
+DERIVED_SUFFIX = "_trial_events.db"
+
+STIMULI_PER_TEST = 36
+TRIAL_EVENT_COLUMNS = [
+    "session_id", "subject_id", "test_type", "stimulus_index",
+    "rt_ms", "psi_ms", "color", "position",
+]
+
+_CREATE_TABLE = """
+CREATE TABLE trial_events (
+    session_id     INTEGER NOT NULL,
+    subject_id     INTEGER,
+    test_type      TEXT    NOT NULL,
+    stimulus_index INTEGER NOT NULL,
+    rt_ms          REAL,
+    psi_ms         INTEGER,
+    color          TEXT,
+    position       TEXT,
+    PRIMARY KEY (session_id, test_type, stimulus_index)
+) WITHOUT ROWID
+"""
+# Secondary indexes of a WITHOUT ROWID table carry the primary key columns, so both
+# indexes below hold every column of trial_events (covering).
+_CREATE_INDEXES = [
+    "CREATE INDEX idx_trial_events_subject ON trial_events"
+    "(subject_id, session_id, test_type, stimulus_index, rt_ms, psi_ms, color, position)",
+    "CREATE INDEX idx_trial_events_condition ON trial_events"
+    "(test_type, position, color, psi_ms, rt_ms, subject_id)",
+]
+
+
+def default_derived_path(source_db) -> Path:
+    """neuro_data.db -> neuro_data_trial_events.db (same directory)."""
+    source = Path(source_db)
+    return source.with_name(source.stem + DERIVED_SUFFIX)
+
+
+def _sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_build_info(derived: Path) -> Optional[dict]:
+    if not derived.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"{derived.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return dict(conn.execute("SELECT key, value FROM build_info").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return None
+
+
+def _write_stat(derived: Path, stat: os.stat_result):
+    conn = sqlite3.connect(derived)
+    try:
+        conn.executemany("INSERT OR REPLACE INTO build_info VALUES (?, ?)", [
+            ("source_size", str(stat.st_size)),
+            ("source_mtime_ns", str(stat.st_mtime_ns)),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _unpivot_sql(test_type: str, metadata_table: str) -> str:
+    prefix = test_type.lower()
+    rt_case = " ".join(f"WHEN {k} THEN t.{prefix}_{k}" for k in range(1, STIMULI_PER_TEST + 1))
+    stim_values = ", ".join(f"({k})" for k in range(1, STIMULI_PER_TEST + 1))
+    return (
+        f"WITH stim(k) AS (VALUES {stim_values}) "
+        f"INSERT INTO trial_events "
+        f"SELECT t.trial_id, t.subject_id, '{test_type}', s.k, CASE s.k {rt_case} END, "
+        f"m.psi_ms, m.color, m.position "
+        f"FROM source.trials t CROSS JOIN stim s "
+        f"LEFT JOIN source.{metadata_table} m ON m.stimulus_id = s.k "
+        f"ORDER BY t.trial_id, s.k"
+    )
+
+
+def build_trial_events(source_db, derived_path=None) -> Path:
+    """
+    (Re)builds the derived trial_events database from source_db.
+
+    The unpivot runs inside SQLite against the source attached read-only. The file is
+    written under a temporary name and moved into place, so readers never see a
+    partially built table.
+
+    Returns:
+        Path of the derived database.
+    """
+    source = Path(source_db).resolve()
+    if not source.exists():
+        raise FileNotFoundError(f"Database not found: {source}")
+    derived = Path(derived_path) if derived_path is not None else default_derived_path(source)
+    derived.parent.mkdir(parents=True, exist_ok=True)
+
+    stat = os.stat(source)
+    fingerprint = _sha256(source)
+
+    tmp = derived.with_name(derived.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("ATTACH DATABASE ? AS source", (f"{source.as_uri()}?mode=ro&immutable=1",))
+        conn.execute(_CREATE_TABLE)
+        for test_type, metadata_table in METADATA_TABLES.items():
+            conn.execute(_unpivot_sql(test_type, metadata_table))
+        conn.commit()
+        conn.execute("DETACH DATABASE source")
+
+        # Indexes are built after the bulk load
+        for sql in _CREATE_INDEXES:
+            conn.execute(sql)
+        conn.execute("CREATE TABLE build_info (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT INTO build_info VALUES (?, ?)", [
+            ("schema_version", TRIAL_EVENTS_SCHEMA_VERSION),
+            ("source_path", str(source)),
+            ("source_sha256", fingerprint),
+            ("source_size", str(stat.st_size)),
+            ("source_mtime_ns", str(stat.st_mtime_ns)),
+            ("built_at", datetime.now().isoformat(timespec="seconds")),
+        ])
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, derived)
+    return derived
+
+
+def ensure_trial_events(source_db, derived_path=None) -> Path:
+    """
+    Returns the derived trial_events database of source_db, rebuilding it if it is
+    missing, has an older schema version or was built from different source content.
+
+    The size/mtime of the source are checked first; the content hash is only computed
+    when they differ from the recorded ones (e.g. after a copy that kept the content).
+    """
+    source = Path(source_db).resolve()
+    derived = Path(derived_path) if derived_path is not None else default_derived_path(source)
+    info = _read_build_info(derived)
+    if info is None or info.get("schema_version") != TRIAL_EVENTS_SCHEMA_VERSION:
+        return build_trial_events(source, derived)
+
+    stat = os.stat(source)
+    if info.get("source_size") == str(stat.st_size) and info.get("source_mtime_ns") == str(stat.st_mtime_ns):
+        return derived
+    if info.get("source_sha256") == _sha256(source):
+        _write_stat(derived, stat)
+        return derived
+    return build_trial_events(source, derived)
+
+
+def _in_clause(column: str, values, conditions: List[str], params: list):
+    if values is None:
+        return
+    if isinstance(values, (str, int)):
+        values = [values]
+    values = [v.item() if hasattr(v, "item") else v for v in values]
+    # One bound JSON array instead of one parameter per value (no variable limit)
+    conditions.append(f"{column} IN (SELECT value FROM json_each(?))")
+    params.append(json.dumps(values))
+
+
+def load_trial_events(source_db, subject_ids: Optional[Iterable[int]] = None,
+                      session_ids: Optional[Iterable[int]] = None,
+                      test_types: Optional[Union[str, Iterable[str]]] = None,
+                      positions: Optional[Union[str, Iterable[str]]] = None,
+                      columns: Optional[List[str]] = None,
+                      derived_path=None) -> pd.DataFrame:
+    """
+    Loads trial-level rows of source_db from the materialized trial_events table.
+
+    Args:
+        subject_ids / session_ids / test_types / positions: Optional filters
+            (subject filters use idx_trial_events_subject, session filters the primary
+            key, test type and position filters idx_trial_events_condition).
+        columns: Subset of TRIAL_EVENT_COLUMNS (default: all).
+
+    Returns:
+        DataFrame ordered by subject_id, session_id, test_type, stimulus_index
+        (those of them that are selected).
+    """
+    columns = list(columns) if columns is not None else list(TRIAL_EVENT_COLUMNS)
+    unknown = [c for c in columns if c not in TRIAL_EVENT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown trial_events columns {unknown}. Expected a subset of {TRIAL_EVENT_COLUMNS}")
+
+    derived = ensure_trial_events(source_db, derived_path)
+
+    conditions, params = [], []
+    _in_clause("subject_id", subject_ids, conditions, params)
+    _in_clause("session_id", session_ids, conditions, params)
+    _in_clause("test_type", test_types, conditions, params)
+    _in_clause("position", positions, conditions, params)
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+
+    # Ordering is applied in pandas: an ORDER BY would steer the planner to the subject
+    # index even for condition filters
+    order = [c for c in ("subject_id", "session_id", "test_type", "stimulus_index") if c in columns]
+    conn = connect_readonly(derived)
+    try:
+        df = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM trial_events {where}", conn, params=params)
+    finally:
+        conn.close()
+    if order:
+        df = df.sort_values(order, kind="stable", ignore_index=True)
+    return df
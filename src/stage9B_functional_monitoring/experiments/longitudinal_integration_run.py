@@ -10,7 +10,6 @@ Strictly adheres to Architectural Constraints:
 
 import os
 import sys
-import sqlite3
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -22,6 +21,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from src.stage9A_geometric_risk_modeling.fluctuation.common.synthetic_time_series import generate_synthetic_cohort
 from src.stage9A_geometric_risk_modeling.fluctuation.fluctuation_model import compute_fluctuations
 from src.stage9A_geometric_risk_modeling.fluctuation.statistical_significance import FluctuationSignificanceModel
+from src.shared.data_access import connect_readonly
 
 from src.stage9B_functional_monitoring.monitoring_metrics import MonitoringMetricsEvaluator
 from src.stage9B_functional_monitoring.deterministic_logic import DeterministicLogicEvaluator, StabilityClassification
@@ -41,7 +41,7 @@ def load_real_longitudinal_data():
     event_frame = pipeline.run()
     
     # 1. Fetch test_date to allow chronological sorting
-    conn = sqlite3.connect(db_path)
+    conn = connect_readonly(db_path)
     dates_df = pd.read_sql_query("SELECT trial_id as session_id, test_date FROM trials", conn)
     conn.close()
     
@@ -0,0 +1,101 @@
+"""
+Tests for process-parallel feature extraction (BaselineFeatureExtractor.extract_grouped_features).
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exploratory_lab.data_loader import load_trials_long
+from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor, resolve_n_jobs
+from tests.test_c3_etl import create_test_db
+
+
+class FailingExtractor(BaselineFeatureExtractor):
+    """Raises for session 11 (module level, so worker processes can unpickle it)."""
+
+    def extract_subject_features(self, trials_df):
+        if trials_df['session_id'].iloc[0] == 11:
+            raise ValueError("broken session")
+        return super().extract_subject_features(trials_df)
+
+
+@pytest.fixture
+def trials_df(tmp_path):
+    path = tmp_path / "neuro_test.db"
+    create_test_db(path, [
+        (13, 1, '2011-06-14'),
+        (11, 2, '2012-02-29'),
+        (12, 3, '2013-01-01'),
+        (10, 1, '2013-05-01'),
+        (14, 4, '2014-01-01'),
+    ])
+    return load_trials_long(str(path))
+
+
+def test_parallel_matches_serial(trials_df):
+    extractor = BaselineFeatureExtractor()
+    serial = extractor.extract_grouped_features(trials_df, group_col='session_id', n_jobs=1)
+    parallel = extractor.extract_grouped_features(trials_df, group_col='session_id', n_jobs=2, chunk_size=2)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert list(serial.index) == [10, 11, 12, 13, 14]
+    assert serial['error'].isna().all()
+
+    unsorted = extractor.extract_grouped_features(trials_df, group_col='session_id', n_jobs=2, sort=False)
+    assert list(unsorted.index) == list(trials_df['session_id'].unique())
+
+    population = extractor.extract_population_features(trials_df, n_jobs=2)
+    pd.testing.assert_frame_equal(population, extractor.extract_population_features(trials_df))
+
+
+def test_batch_psi_fit_covers_all_groups_at_once(trials_df, monkeypatch):
+    from exploratory_lab.feature_engineering import baseline_features, psi_recovery
+
+    # Record the number of sessions of every exponential fit
+    calls = []
+    fit = psi_recovery.fit_exponential_recovery_batch
+
+    def counting_fit(psi, rt, **kwargs):
+        calls.append(len(psi))
+        return fit(psi, rt, **kwargs)
+
+    monkeypatch.setattr(psi_recovery, 'fit_exponential_recovery_batch', counting_fit)
+    monkeypatch.setattr(baseline_features, 'fit_exponential_recovery_batch', counting_fit)
+
+    extractor = BaselineFeatureExtractor(psi_fit='batch')
+    serial = extractor.extract_grouped_features(trials_df, group_col='session_id')
+    assert calls == [5]
+
+    tau = psi_recovery.fit_grouped_psi_recovery(trials_df, group_col='session_id')['tau']
+    pd.testing.assert_series_equal(serial['psi_tau'], tau, check_names=False)
+    # Other features are those of the per-group extraction
+    reference = extractor.extract_subject_features(trials_df[trials_df['session_id'] == 12])
+    assert serial.loc[12].drop(['error', 'psi_tau']).to_dict() == pytest.approx(
+        {k: v for k, v in reference.items() if k != 'psi_tau'}, nan_ok=True)
+
+    parallel = extractor.extract_grouped_features(trials_df, group_col='session_id', n_jobs=2, chunk_size=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_worker_failures_reported_per_group(trials_df):
+    result = FailingExtractor().extract_grouped_features(trials_df, group_col='session_id', n_jobs=2, chunk_size=1)
+
+    assert result.loc[11, 'error'] == "ValueError: broken session"
+    assert result.loc[11].drop('error').isna().all()
+    assert result.drop(index=11)['error'].isna().all()
+
+    with pytest.raises(RuntimeError, match="1 subject\\(s\\): 2: ValueError: broken session"):
+        FailingExtractor().extract_population_features(trials_df, n_jobs=2)
+
+
+def test_resolve_n_jobs():
+    assert resolve_n_jobs(None) == 1
+    assert resolve_n_jobs(3) == 3
+    assert resolve_n_jobs(-1) >= 1
+    with pytest.raises(ValueError):
+        resolve_n_jobs(0)
@@ -0,0 +1,53 @@
+"""
+Tests for the synthetic database generator and scaling benchmark (c3_core.benchmark).
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.c3_core.benchmark import generate_synthetic_db, run_scaling_benchmark
+from src.c3_core.etl.etl_v4 import ETLPipeline
+
+
+def schema_of(path):
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(conn.execute("SELECT type, name, sql FROM sqlite_master").fetchall(), key=str)
+    finally:
+        conn.close()
+
+
+def test_synthetic_db_matches_template_schema(tmp_path):
+    path = generate_synthetic_db(str(tmp_path / "syn.db"), 200, seed=1)
+
+    assert schema_of(path) == schema_of("neuro_data.db")
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM trials").fetchone()[0] == 200
+    assert conn.execute("SELECT COUNT(*) FROM metadata_simple").fetchone()[0] == 36
+    conn.close()
+
+    events = ETLPipeline(db_path=str(path)).run()
+    assert events['session_id'].nunique() == 200
+    assert len(events) == 200 * 3 * 36
+
+
+def test_synthetic_db_is_deterministic(tmp_path):
+    a = generate_synthetic_db(str(tmp_path / "a.db"), 50, seed=3)
+    b = generate_synthetic_db(str(tmp_path / "b.db"), 50, seed=3)
+
+    dump = lambda p: sqlite3.connect(p).execute("SELECT * FROM trials ORDER BY trial_id").fetchall()
+    assert dump(a) == dump(b)
+    with pytest.raises(FileExistsError):
+        generate_synthetic_db(str(a), 50)
+
+
+def test_scaling_report(tmp_path):
+    report = run_scaling_benchmark(sizes=[30, 60], work_dir=str(tmp_path), profile_memory=False)
+
+    assert [run["n_sessions"] for run in report["runs"]] == [30, 60]
+    assert set(report["runs"][0]["stages"]) == {"etl", "component_timing", "qc_aggregation", "scenarios"}
+    with open(tmp_path / "scaling_report.json", encoding="utf-8") as f:
+        assert json.load(f)["runs"][1]["stages"]["etl"]["output_rows"] == 60 * 3 * 36
+    assert "| 60 |" in (tmp_path / "scaling_report.md").read_text(encoding="utf-8")
@@ -0,0 +1,75 @@
+"""
+Tests for the C3.2 Component Timing layer (component_v4).
+
+Checks that the positional tensor mode reproduces the merge-based
+reference implementation.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.c3_core.component_timing.component_v4 import ComponentTimingV4
+
+
+def create_event_frame(n_sessions=4, seed=0):
+    """Synthetic EventFrame: n_sessions x 3 tests x 36 stimuli."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for session_id in range(100, 100 + n_sessions):
+        for test_type in ['Tst1', 'Tst2', 'Tst3']:
+            for stim in range(1, 37):
+                rows.append({
+                    'subject_id': session_id // 2,
+                    'session_id': session_id,
+                    'age': 30.0,
+                    'sex': 'F',
+                    'test_type': test_type,
+                    'stimulus_index': stim,
+                    'rt_ms': rng.normal(300, 40),
+                    'psi_pre_ms': 1000,
+                    'stimulus_color': 'red',
+                    'stimulus_location': ['left', 'center', 'right'][stim % 3],
+                    'technical_qc_flag': True,
+                })
+    df = pd.DataFrame(rows)
+    df.loc[5, 'rt_ms'] = np.nan
+    return df
+
+
+def test_tensor_matches_merge():
+    df = create_event_frame()
+    original = df.copy()
+
+    tensor = ComponentTimingV4(mode="tensor").run(df)
+    merge = ComponentTimingV4(mode="merge").run(df)
+
+    pd.testing.assert_frame_equal(tensor, merge)
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_tensor_handles_shuffled_and_incomplete_sessions():
+    df = create_event_frame().sample(frac=1, random_state=1)
+    # Drop part of the Tst1 baseline of one session
+    df = df.drop(df[(df['session_id'] == 101) & (df['test_type'] == 'Tst1') & (df['stimulus_index'] < 10)].index)
+
+    tensor = ComponentTimingV4(mode="tensor").run(df)
+    merge = ComponentTimingV4(mode="merge").run(df)
+
+    pd.testing.assert_frame_equal(tensor, merge)
+    assert tensor.loc[(tensor['session_id'] == 101) & (tensor['stimulus_index'] < 10), 'ΔV1'].isna().all()
+
+
+def test_duplicated_keys_fall_back_to_merge():
+    df = create_event_frame(n_sessions=2)
+    df = pd.concat([df, df[df['test_type'] == 'Tst1'].head(3)], ignore_index=True)
+
+    tensor = ComponentTimingV4(mode="tensor").run(df)
+    merge = ComponentTimingV4(mode="merge").run(df)
+
+    pd.testing.assert_frame_equal(tensor, merge)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ComponentTimingV4(mode="join")
@@ -0,0 +1,247 @@
+"""
+Tests for the C3.1 ETL pipeline (etl_v4).
+
+Builds a small schema-compatible SQLite database and checks that the
+transform modes produce identical EventFrames.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.c3_core.etl import ETLPipeline, EventFrameStore
+from src.c3_core.schema_registry import validate_frame
+
+
+POSITIONS = ['left', 'center', 'right']
+
+
+def create_test_db(path, sessions):
+    """
+    Writes a minimal neuro_data.db-compatible database.
+
+    sessions: list of (trial_id, subject_id, test_date) tuples.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (subject_id INTEGER PRIMARY KEY, last_name TEXT, "
+                 "birth_date TEXT, first_test_date TEXT, gender INTEGER)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)", [
+        (1, 'A', '1980-06-15', '2010-01-01', 0),
+        (2, 'B', '1990-02-28', '2010-01-01', 1),
+        (3, 'C', 'not-a-date', '2010-01-01', 1),
+        (4, 'D', None, '2010-01-01', 0),
+    ])
+
+    rt_cols = [f"tst{t}_{i}" for t in range(1, 4) for i in range(1, 37)]
+    conn.execute("CREATE TABLE trials (trial_id INTEGER PRIMARY KEY, subject_id INTEGER, test_date TEXT, "
+                 "test_time TEXT, session_condition INTEGER, " + ", ".join(f"{c} REAL" for c in rt_cols) + ")")
+
+    conn.execute("CREATE TABLE metadata_simple (stimulus_id INTEGER PRIMARY KEY, color TEXT, position TEXT, psi_ms INTEGER)")
+    conn.execute("CREATE TABLE metadata_color_red (stimulus_id INTEGER PRIMARY KEY, color TEXT, position TEXT, "
+                 "psi_ms INTEGER, mask_triples TEXT)")
+    conn.execute("CREATE TABLE metadata_shift (stimulus_id INTEGER PRIMARY KEY, color TEXT, position TEXT, "
+                 "psi_ms INTEGER, mask_triples TEXT, shift_parameter INTEGER)")
+    for i in range(1, 37):
+        pos = POSITIONS[i % 3]
+        conn.execute("INSERT INTO metadata_simple VALUES (?, ?, ?, ?)", (i, ['red', 'green', 'blue'][i % 3], pos, 500 + 100 * (i % 5)))
+        conn.execute("INSERT INTO metadata_color_red VALUES (?, ?, ?, ?, ?)", (i, 'red', pos, 800, 'ЖСК0'))
+        conn.execute("INSERT INTO metadata_shift VALUES (?, ?, ?, ?, ?, ?)", (i, 'blue', pos, 1200, 'КЖС0', i % 4))
+    conn.commit()
+    conn.close()
+
+    add_sessions(path, sessions)
+
+
+def add_sessions(path, sessions):
+    """Appends trials rows with random RTs (one missing, one below MIN_RT_MS)."""
+    rt_cols = [f"tst{t}_{i}" for t in range(1, 4) for i in range(1, 37)]
+    conn = sqlite3.connect(path)
+    for trial_id, subject_id, test_date in sessions:
+        rng = np.random.default_rng(trial_id)
+        rts = rng.normal(300, 40, size=len(rt_cols)).round(1).tolist()
+        rts[trial_id % 36] = None
+        rts[40] = 100.0
+        conn.execute(f"INSERT INTO trials VALUES ({', '.join('?' * (5 + len(rt_cols)))})",
+                     [trial_id, subject_id, test_date, '10:00:00', 1] + rts)
+    conn.commit()
+    conn.close()
+
+
+def sort_events(df):
+    return df.sort_values(['session_id', 'test_type', 'stimulus_index']).reset_index(drop=True)
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    path = tmp_path / "neuro_test.db"
+    create_test_db(path, [
+        (10, 1, '2011-06-14'),   # day before birthday
+        (11, 1, '2011-06-15'),   # on birthday
+        (12, 2, '2012-02-29'),   # leap day
+        (13, 3, '2012-05-01'),   # unparseable birth date
+        (14, 4, '2012-05-01'),   # missing birth date
+        (15, 99, '2012-05-01'),  # unknown subject
+        (16, 2, '2012-13-01'),   # invalid test date
+    ])
+    return str(path)
+
+
+def test_columnar_matches_rowwise(test_db):
+    columnar = ETLPipeline(db_path=test_db, transform_mode="columnar").run()
+    rowwise = ETLPipeline(db_path=test_db, transform_mode="rowwise").run()
+
+    pd.testing.assert_frame_equal(columnar, rowwise)
+
+
+@pytest.mark.parametrize("transform_mode", ["columnar", "rowwise"])
+def test_sql_extraction_matches_pandas(test_db, transform_mode):
+    sql = ETLPipeline(db_path=test_db, transform_mode=transform_mode, extraction_strategy="sql").run()
+    reference = ETLPipeline(db_path=test_db, transform_mode=transform_mode, extraction_strategy="pandas").run()
+
+    pd.testing.assert_frame_equal(sql, reference)
+
+
+def test_sql_extraction_incremental(tmp_path):
+    db_path = tmp_path / "neuro_test.db"
+    create_test_db(db_path, [(10, 1, '2011-06-14'), (11, 2, '2011-07-01')])
+    etl = ETLPipeline(db_path=str(db_path), extraction_strategy="sql")
+    etl.run_incremental(str(tmp_path / "event_store"))
+
+    add_sessions(db_path, [(12, 1, '2012-01-10')])
+    new = etl.run_incremental(str(tmp_path / "event_store"))
+    reference = ETLPipeline(db_path=str(db_path)).run()
+
+    pd.testing.assert_frame_equal(
+        new.reset_index(drop=True),
+        reference[reference['session_id'] == 12].reset_index(drop=True)
+    )
+
+
+def test_session_ages(test_db):
+    df = ETLPipeline(db_path=test_db).run()
+    ages = df.groupby('session_id')['age'].first()
+
+    assert ages[10] == 30
+    assert ages[11] == 31
+    assert ages[12] == 22
+    assert ages[[13, 14, 15, 16]].isna().all()
+    assert not df.loc[df['session_id'].isin([13, 14, 15, 16]), 'technical_qc_flag'].any()
+
+
+def test_unknown_modes():
+    with pytest.raises(ValueError):
+        ETLPipeline(transform_mode="vectorised")
+    with pytest.raises(ValueError):
+        ETLPipeline(extraction_strategy="duckdb")
+
+
+def test_incremental_appends_only_new_sessions(tmp_path):
+    db_path = tmp_path / "neuro_test.db"
+    store_dir = tmp_path / "event_store"
+    create_test_db(db_path, [(10, 1, '2011-06-14'), (11, 2, '2011-07-01')])
+    etl = ETLPipeline(db_path=str(db_path))
+
+    first = etl.run_incremental(str(store_dir))
+    assert set(first['session_id']) == {10, 11}
+
+    assert etl.run_incremental(str(store_dir)).empty
+
+    add_sessions(db_path, [(12, 1, '2012-01-10'), (13, 2, '2012-03-05')])
+    second = etl.run_incremental(str(store_dir))
+    assert set(second['session_id']) == {12, 13}
+
+    store = EventFrameStore(str(store_dir))
+    assert len(store.list_partitions()) == 2
+    assert store.read_watermark()["max_trial_id"] == 13
+    pd.testing.assert_frame_equal(sort_events(store.read()), sort_events(etl.run()))
+
+
+def test_incremental_rebuilds_on_users_change(tmp_path):
+    db_path = tmp_path / "neuro_test.db"
+    store_dir = tmp_path / "event_store"
+    create_test_db(db_path, [(10, 1, '2011-06-14'), (11, 5, '2011-07-01')])
+    etl = ETLPipeline(db_path=str(db_path))
+    etl.run_incremental(str(store_dir))
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO users VALUES (5, 'E', '1970-01-01', '2011-07-01', 0)")
+    conn.commit()
+    conn.close()
+
+    rebuilt = etl.run_incremental(str(store_dir))
+    assert set(rebuilt['session_id']) == {10, 11}
+    assert rebuilt.loc[rebuilt['session_id'] == 11, 'age'].eq(41).all()
+    assert len(EventFrameStore(str(store_dir)).list_partitions()) == 1
+
+
+def test_incremental_rebuilds_on_users_edit(tmp_path):
+    db_path = tmp_path / "neuro_test.db"
+    store_dir = tmp_path / "event_store"
+    create_test_db(db_path, [(10, 1, '2011-06-14'), (11, 2, '2011-07-01')])
+    etl = ETLPipeline(db_path=str(db_path))
+    etl.run_incremental(str(store_dir))
+
+    # Same row count: an edit and a delete + insert of another subject
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE users SET birth_date = '1950-01-01' WHERE subject_id = 1")
+    conn.execute("DELETE FROM users WHERE subject_id = 4")
+    conn.execute("INSERT INTO users VALUES (5, 'E', '1970-01-01', '2011-07-01', 0)")
+    conn.commit()
+    conn.close()
+
+    rebuilt = etl.run_incremental(str(store_dir))
+    assert set(rebuilt['session_id']) == {10, 11}
+    assert rebuilt.loc[rebuilt['session_id'] == 10, 'age'].eq(61).all()
+    pd.testing.assert_frame_equal(
+        sort_events(EventFrameStore(str(store_dir)).read()), sort_events(etl.run())
+    )
+
+
+def test_reset_keeps_unrelated_files(tmp_path):
+    db_path = tmp_path / "neuro_test.db"
+    store_dir = tmp_path / "outputs"
+    create_test_db(db_path, [(10, 1, '2011-06-14')])
+    store_dir.mkdir()
+    (store_dir / "report.csv").write_text("keep me")
+    (store_dir / "figures").mkdir()
+    (store_dir / "figures" / "plot.png").write_bytes(b"png")
+
+    ETLPipeline(db_path=str(db_path)).run_incremental(str(store_dir))
+    store = EventFrameStore(str(store_dir))
+    assert store.list_partitions() and store.read_watermark() is not None
+
+    store.reset()
+    assert store.list_partitions() == []
+    assert store.read_watermark() is None
+    assert (store_dir / "report.csv").read_text() == "keep me"
+    assert (store_dir / "figures" / "plot.png").exists()
+
+
+@pytest.mark.parametrize("extraction_strategy", ["pandas", "sql"])
+def test_event_chunks_match_full_run(test_db, extraction_strategy):
+    etl = ETLPipeline(db_path=test_db, extraction_strategy=extraction_strategy)
+    chunks = list(etl.iter_event_chunks(chunk_sessions=3))
+
+    assert [chunk['session_id'].nunique() for chunk in chunks] == [3, 3, 1]
+    pd.testing.assert_frame_equal(
+        sort_events(pd.concat(chunks, ignore_index=True)),
+        sort_events(etl.run())
+    )
+
+
+def test_compact_schema(test_db):
+    reference = ETLPipeline(db_path=test_db).run()
+    compact = ETLPipeline(db_path=test_db, compact_schema=True).run()
+
+    validate_frame(compact, 'EventFrame', compact=True)
+    assert compact['stimulus_index'].dtype == np.int16
+    assert list(compact['test_type'].cat.categories) == ['Tst1', 'Tst2', 'Tst3']
+    assert compact.memory_usage(deep=True).sum() < reference.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(
+        compact, reference, check_dtype=False, check_categorical=False, rtol=1e-6
+    )
+
+    with pytest.raises(TypeError):
+        validate_frame(reference, 'EventFrame', compact=True)
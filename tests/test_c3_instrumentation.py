@@ -0,0 +1,48 @@
+"""
+Tests for the opt-in C3 pipeline instrumentation (instrumentation).
+"""
+
+import json
+
+from src.c3_core.etl.etl_v4 import ETLPipeline
+from src.c3_core.component_timing.component_v4 import ComponentTimingV4
+from src.c3_core.qc_aggregation.qc_aggregation_v4 import QCAggregationV4
+from src.c3_core.scenario_engine.scenario_v4 import ScenarioEngineV4
+from src.c3_core.instrumentation import profile_run, span
+from tests.test_c3_etl import create_test_db
+
+
+def run_pipeline(db_path, max_workers=None):
+    events = ETLPipeline(db_path=db_path).run()
+    aggregated = QCAggregationV4().run(ComponentTimingV4().run(events))
+    return ScenarioEngineV4(max_workers=max_workers).run(aggregated)
+
+
+def test_profile_run_records_nested_spans(tmp_path):
+    db_path = str(tmp_path / "neuro_test.db")
+    create_test_db(db_path, [(10, 1, '2011-06-14'), (11, 2, '2012-02-29')])
+    log_path = tmp_path / "run_log.jsonl"
+
+    with profile_run(log_path=str(log_path), trace_memory=True) as profiler:
+        run_pipeline(db_path, max_workers=2)
+
+    spans = {r["path"]: r for r in profiler.records}
+    assert {"etl", "etl/extract", "etl/melt", "etl/validate", "component_timing/merge",
+            "qc_aggregation/aggregate", "scenarios/validate", "scenarios/A0.2"} <= set(spans)
+    # Scenarios executed on worker threads still nest under the scenario stage
+    assert "scenarios/A0.0/tst1_session_pivot" in spans
+    assert spans["etl/melt"]["rows_out"] == 2 * 3 * 36
+    assert spans["qc_aggregation"]["rows_in"] == 2 * 3 * 36
+    assert spans["etl"]["wall_s"] >= spans["etl/melt"]["wall_s"]
+    assert spans["etl"]["tracemalloc_peak_mb"] >= 0
+
+    logged = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert len(logged) == 1
+    assert logged[0]["pipeline_versions"]["etl_version"].startswith("etl_v4")
+    assert len(logged[0]["spans"]) == len(profiler.records)
+
+
+def test_instrumentation_is_inactive_by_default():
+    with span("outside") as record:
+        assert record is None
+    assert ScenarioEngineV4.run_a0_0.required_intermediates == ("tst1", "tst1_session_pivot")
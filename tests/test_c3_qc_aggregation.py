@@ -0,0 +1,75 @@
+"""
+Tests for the C3.3 QC & Aggregation layer (qc_aggregation_v4).
+
+Checks that the vectorized robust kernel reproduces the pandas
+groupby/lambda reference aggregation exactly.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.c3_core.qc_aggregation.qc_aggregation_v4 import QCAggregationV4
+from src.c3_core.qc_aggregation.robust_kernel import robust_group_stats
+
+
+def create_component_frame(n_sessions=6, seed=0):
+    """Synthetic ComponentFrame with missing values, QC failures and uneven group sizes."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for session_id in range(200, 200 + n_sessions):
+        for test_type in ['Tst1', 'Tst2', 'Tst3']:
+            for stim in range(1, 37):
+                rt = float(np.round(rng.normal(300, 50), 1))
+                base = float(np.round(rng.normal(250, 30), 1))
+                rows.append({
+                    'subject_id': session_id // 3,
+                    'session_id': session_id,
+                    'age': 40.0,
+                    'sex': 'M',
+                    'test_type': test_type,
+                    'stimulus_index': stim,
+                    'rt_ms': rt,
+                    'psi_pre_ms': 1000,
+                    'stimulus_color': 'red',
+                    'stimulus_location': ['left', 'center', 'right'][stim % 3],
+                    'technical_qc_flag': rng.random() > 0.1,
+                    'ΔV1': base,
+                    'ΔV4': rt - base if test_type == 'Tst2' else np.nan,
+                    'ΔV5_MT': rt - base if test_type == 'Tst3' else np.nan,
+                })
+    df = pd.DataFrame(rows)
+    df.loc[df.sample(frac=0.05, random_state=seed).index, 'ΔV1'] = np.nan
+    # A whole group with only NaN values and a single-row group
+    df.loc[(df['session_id'] == 201) & (df['test_type'] == 'Tst2') & (df['stimulus_location'] == 'left'), 'ΔV4'] = np.nan
+    df = df[~((df['session_id'] == 202) & (df['test_type'] == 'Tst1') & (df['stimulus_index'] > 3))]
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def test_kernel_matches_pandas_engine():
+    df = create_component_frame()
+
+    kernel = QCAggregationV4(engine="kernel").run(df)
+    reference = QCAggregationV4(engine="pandas").run(df)
+
+    pd.testing.assert_frame_equal(kernel, reference, check_exact=True)
+
+
+def test_robust_group_stats_values():
+    df = pd.DataFrame({
+        'g': ['a'] * 5 + ['b'] * 4,
+        'x': [1.0, 2.0, 4.0, 8.0, np.nan, 3.0, 1.0, 10.0, 7.0],
+    })
+    stats = robust_group_stats(df, ['g'], ['x']).set_index('g')
+
+    assert stats.loc['a', 'count_valid'] == 5
+    assert stats.loc['a', 'median_x'] == 3.0
+    assert stats.loc['a', 'mad_x'] == 1.5
+    assert stats.loc['a', 'iqr_x'] == pytest.approx(df['x'][:5].quantile(0.75) - df['x'][:5].quantile(0.25))
+    assert stats.loc['b', 'median_x'] == 5.0
+    assert stats.loc['b', 'iqr_x'] == pytest.approx(df['x'][5:].quantile(0.75) - df['x'][5:].quantile(0.25))
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        QCAggregationV4(engine="numba")
@@ -0,0 +1,214 @@
+"""
+Tests for the C3.4 Scenario Computation layer (scenario_v4).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.c3_core.pipeline_config import PIPELINE_VERSIONS
+from src.c3_core.scenario_engine.scenario_v4 import ScenarioEngineV4
+from src.c3_core.scenario_engine.execution_context import ScenarioContext
+from src.c3_core.scenario_engine.scenario_registry import ScenarioRegistry, ScenarioSpec
+from src.c3_core.scenario_engine.scenario_export import read_manifest
+from src.gui.scenario_viewer.scenario_viewer import ScenarioLoader
+
+
+def create_aggregated_frame(n_subjects=4, sessions_per_subject=3, seed=0):
+    """Synthetic AggregatedFrame: one row per (subject, session, test, location)."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    session_id = 1000
+    for subject_id in range(1, n_subjects + 1):
+        for _ in range(sessions_per_subject):
+            session_id += 1
+            for test_type in ['Tst1', 'Tst2', 'Tst3']:
+                for location in ['left', 'center', 'right']:
+                    row = {
+                        'subject_id': subject_id,
+                        'session_id': session_id,
+                        'age': 30.0 + subject_id,
+                        'sex': 'F',
+                        'test_type': test_type,
+                        'stimulus_location': location,
+                        'count_valid': 12,
+                    }
+                    for col in ['rt_ms', 'ΔV1', 'ΔV4', 'ΔV5_MT']:
+                        row[f"median_{col}"] = rng.normal(300, 30)
+                        row[f"mad_{col}"] = rng.normal(20, 3)
+                        row[f"iqr_{col}"] = rng.normal(40, 5)
+                    rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def test_run_produces_all_a0_scenarios():
+    df = create_aggregated_frame()
+    results = ScenarioEngineV4().run(df)
+
+    assert list(results) == ["A0.0", "A0.1", "A0.2", "A0.3"]
+    assert len(results["A0.0"]) == df['session_id'].nunique()
+    assert len(results["A0.2"]) == df['subject_id'].nunique()
+
+
+def test_triad_validation_reports_all_offending_sessions():
+    df = create_aggregated_frame()
+    tst1 = df['test_type'] == 'Tst1'
+    df = df.drop(df[tst1 & (df['session_id'] == 1002) & (df['stimulus_location'] == 'left')].index)
+    df.loc[tst1 & (df['session_id'] == 1005) & (df['stimulus_location'] == 'right'), 'stimulus_location'] = 'top'
+
+    with pytest.raises(ValueError) as excinfo:
+        ScenarioEngineV4().run(df)
+
+    message = str(excinfo.value)
+    assert "2 session(s)" in message
+    assert "Session 1002" in message
+    assert "Session 1005" in message
+
+    with pytest.raises(ValueError):
+        ScenarioEngineV4().run_a0_1(df)
+
+
+def test_missing_spatial_dimension():
+    df = create_aggregated_frame().drop(columns=['stimulus_location'])
+
+    with pytest.raises(ValueError, match="Spatial dimension missing"):
+        ScenarioEngineV4().run_a0_0(df)
+
+
+def test_context_shares_intermediates(monkeypatch):
+    df = create_aggregated_frame()
+    engine = ScenarioEngineV4()
+    calls = []
+    builder = ScenarioContext.INTERMEDIATES["tst1_session_pivot"]
+
+    def counting_builder(ctx):
+        calls.append(1)
+        return builder(ctx)
+
+    monkeypatch.setitem(ScenarioContext.INTERMEDIATES, "tst1_session_pivot", counting_builder)
+    results = engine.run(df)
+
+    assert len(calls) == 1
+    assert engine.run_a0_0.required_intermediates == ("tst1", "tst1_session_pivot")
+    pd.testing.assert_frame_equal(results["A0.1"], engine.run_a0_1(df))
+
+
+def test_register_intermediate(monkeypatch):
+    monkeypatch.setattr(ScenarioContext, "INTERMEDIATES", dict(ScenarioContext.INTERMEDIATES))
+    ScenarioContext.register_intermediate("tst2", lambda ctx: ctx.frame[ctx.frame['test_type'] == 'Tst2'])
+
+    context = ScenarioContext(create_aggregated_frame())
+    assert (context.get("tst2")['test_type'] == 'Tst2').all()
+    with pytest.raises(ValueError):
+        ScenarioContext.register_intermediate("tst2", lambda ctx: ctx.frame)
+
+
+def test_parallel_run_matches_serial():
+    df = create_aggregated_frame(n_subjects=6)
+
+    serial = ScenarioEngineV4(max_workers=1).run(df)
+    parallel = ScenarioEngineV4(max_workers=4).run(df)
+
+    assert list(parallel) == list(serial)
+    for sid in serial:
+        pd.testing.assert_frame_equal(parallel[sid], serial[sid], check_exact=True)
+
+
+def test_run_only_selected_scenario():
+    df = create_aggregated_frame()
+    results = ScenarioEngineV4().run(df, only=["A0.2"])
+
+    assert list(results) == ["A0.2"]
+    pd.testing.assert_frame_equal(results["A0.2"], ScenarioEngineV4().run_a0_2(df))
+
+    with pytest.raises(ValueError, match="Unknown scenario"):
+        ScenarioEngineV4().run(df, only=["B1.0"])
+
+
+def test_registry_resolves_upstream_scenarios():
+    registry = ScenarioRegistry()
+    registry.register(ScenarioSpec("A0.2", "run_a0_2", ("tst1",)))
+    registry.register(ScenarioSpec("A1.0", "run_a1_0", ("A0.2",)))
+    registry.register(ScenarioSpec("A0.3", "run_a0_3", ("tst1",)))
+
+    assert registry.resolve(["A1.0"]) == ["A0.2", "A1.0"]
+    assert registry.waves(registry.resolve()) == [["A0.2", "A0.3"], ["A1.0"]]
+
+
+def test_manifest_export_roundtrip(tmp_path):
+    df = create_aggregated_frame(n_subjects=10)
+    engine = ScenarioEngineV4()
+    results = engine.run(df)
+    engine.export_results(results, str(tmp_path), mode="manifest", subjects_per_file=4)
+
+    manifest = read_manifest(tmp_path)
+    entry = manifest["scenarios"]["A0.2"]
+    assert entry["rows"] == 10
+    assert [f["rows"] for f in entry["files"]] == [3, 4, 3]
+    assert manifest["pipeline_versions"]["scenario_version"] == PIPELINE_VERSIONS["scenario_version"]
+
+    loader = ScenarioLoader(tmp_path)
+    pd.testing.assert_frame_equal(loader.load_scenario("A0.2"), results["A0.2"])
+
+    subset = loader.load_scenario("A0.0", columns=['session_id', 'median_left'], subject_range=(4, 7))
+    expected = results["A0.0"][results["A0.0"]['subject_id'].between(4, 7)]
+    pd.testing.assert_frame_equal(subset, expected[['session_id', 'median_left']].reset_index(drop=True))
+
+
+def test_loader_skips_unchanged_files(tmp_path, monkeypatch):
+    engine = ScenarioEngineV4()
+    results = engine.run(create_aggregated_frame())
+    engine.export_results(results, str(tmp_path), mode="manifest")
+
+    loader = ScenarioLoader(tmp_path)
+    reads = []
+    original_read = pd.read_parquet
+
+    def counting_read(*args, **kwargs):
+        reads.append(args[0])
+        return original_read(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_parquet", counting_read)
+    loader.load_scenario("A0.3")
+    loader.load_scenario("A0.3")
+    assert len(reads) == 1
+
+    results["A0.3"] = results["A0.3"].head(2)
+    engine.export_results(results, str(tmp_path), mode="manifest")
+    assert len(loader.load_scenario("A0.3")) == 2
+    assert len(reads) == 2
+
+
+def test_legacy_export_replaces_manifest(tmp_path):
+    engine = ScenarioEngineV4()
+    old = engine.run(create_aggregated_frame(seed=0))
+    engine.export_results(old, str(tmp_path), mode="manifest")
+
+    new = engine.run(create_aggregated_frame(seed=1))
+    engine.export_results(new, str(tmp_path))
+    assert read_manifest(tmp_path) is None
+
+    loader = ScenarioLoader(tmp_path)
+    pd.testing.assert_frame_equal(loader.load_scenario("A0.2"), new["A0.2"])
+
+
+def test_loader_ignores_stale_manifest(tmp_path):
+    engine = ScenarioEngineV4()
+    old = engine.run(create_aggregated_frame(n_subjects=6, seed=0))
+    engine.export_results(old, str(tmp_path), mode="manifest", subjects_per_file=4)
+    manifest_text = (tmp_path / "manifest.json").read_text()
+    loader = ScenarioLoader(tmp_path)
+    pd.testing.assert_frame_equal(loader.load_scenario("A0.2"), old["A0.2"])
+
+    # Files rewritten behind a surviving manifest (e.g. by an older legacy exporter)
+    new = engine.run(create_aggregated_frame(n_subjects=6, seed=1))
+    new["A0.2"].to_parquet(tmp_path / "A0_2.parquet", engine="fastparquet", index=False)
+    new["A0.3"].to_parquet(tmp_path / "A0_3" / "subjects_00000000_00000003.parquet", engine="fastparquet", index=False)
+    (tmp_path / "manifest.json").write_text(manifest_text)
+    os.utime(tmp_path / "manifest.json", ns=(0, 0))
+
+    pd.testing.assert_frame_equal(loader.load_scenario("A0.2"), new["A0.2"])
+    assert loader.load_scenario("A0.3") is None    # no plain file to fall back to
+    pd.testing.assert_frame_equal(loader.load_scenario("A0.0"), old["A0.0"])
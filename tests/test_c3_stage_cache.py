@@ -0,0 +1,76 @@
+"""
+Tests for the content-addressed C3 stage cache (stage_cache).
+"""
+
+import pandas as pd
+import pytest
+
+from src.c3_core import stage_cache
+from src.c3_core.etl.etl_v4 import ETLPipeline
+from src.c3_core.stage_cache import StageCache, run_cached_pipeline
+from tests.test_c3_etl import create_test_db, add_sessions
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    path = tmp_path / "neuro_test.db"
+    create_test_db(path, [
+        (10, 1, '2011-06-14'),
+        (11, 1, '2011-06-15'),
+        (12, 2, '2012-02-29'),
+    ])
+    return str(path)
+
+
+@pytest.fixture
+def etl_calls(monkeypatch):
+    calls = []
+    original_run = ETLPipeline.run
+
+    def counting_run(self):
+        calls.append(self.db_path)
+        return original_run(self)
+
+    monkeypatch.setattr(ETLPipeline, "run", counting_run)
+    return calls
+
+
+def test_cached_pipeline_reuses_stages(test_db, tmp_path, etl_calls):
+    cache_dir = str(tmp_path / "cache")
+
+    first = run_cached_pipeline(test_db, cache_dir)
+    second = run_cached_pipeline(test_db, cache_dir)
+
+    assert len(etl_calls) == 1
+    assert list(second) == list(first)
+    for sid in first:
+        pd.testing.assert_frame_equal(second[sid], first[sid])
+
+
+def test_cache_invalidated_by_db_and_version_changes(test_db, tmp_path, etl_calls, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    run_cached_pipeline(test_db, cache_dir)
+
+    # A scenario version bump recomputes scenarios from the cached AggregatedFrame
+    versions = dict(stage_cache.PIPELINE_VERSIONS, scenario_version="scenario_test")
+    monkeypatch.setattr(stage_cache, "PIPELINE_VERSIONS", versions)
+    run_cached_pipeline(test_db, cache_dir)
+    assert len(etl_calls) == 1
+    assert len(list((tmp_path / "cache" / "scenarios").iterdir())) == 2
+
+    # New sessions in the database invalidate every stage
+    add_sessions(test_db, [(13, 2, '2012-05-01')])
+    results = run_cached_pipeline(test_db, cache_dir)
+    assert len(etl_calls) == 2
+    assert 1 in results["A0.0"]['subject_id'].values
+
+
+def test_stage_cache_restores_dtypes(tmp_path):
+    df = pd.DataFrame({'sex': ['M', None, 'F'], 'x': [1.0, 2.0, None]})
+    cache = StageCache(str(tmp_path))
+    cache.store("etl", "k", {"EventFrame": df, "Empty": pd.DataFrame()})
+
+    loaded = cache.load("etl", "k")
+    pd.testing.assert_frame_equal(loaded["EventFrame"], df)
+    assert loaded["Empty"].empty
+    assert cache.load("etl", "missing") is None
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+import numpy as np
+
+from src.c3x_exploratory.synthetic_time_series import generate_piecewise_series
+from src.c3x_exploratory.change_point import ChangePointDetection, StreamingChangePointDetection
+
+
+PARAMETER_SETS = [
+    dict(),
+    dict(window_size=5, threshold=0.5, minimum_segment_length=3, search_radius=2, normalize=True),
+    dict(window_size=3, threshold=0.0, minimum_segment_length=1, search_radius=0),
+    dict(window_size=8, threshold=1.0, minimum_segment_length=5, search_radius=12, normalize=True),
+]
+
+
+class TestChangePointDetection:
+
+    def test_detects_mean_shifts(self):
+        data = generate_piecewise_series(n_samples=300, change_points=[100, 200], means=[0.0, 5.0, 0.0], std=0.5, seed=42)
+        res = ChangePointDetection().execute(data, seed=42)
+
+        assert len(res.detected_change_points) == 2
+        assert all(abs(cp - true) <= 3 for cp, true in zip(res.detected_change_points, [100, 200]))
+        assert len(res.statistic_curve) == 300
+
+    @pytest.mark.parametrize("params", PARAMETER_SETS)
+    def test_matches_reference_scan(self, params):
+        rng = np.random.default_rng(0)
+        proc = ChangePointDetection(**params)
+        series = [
+            rng.normal(500, 80, 250),
+            rng.integers(0, 4, 250).astype(float),                  # exact ties in the statistic
+            np.repeat(rng.normal(0, 3, 5), 50) + rng.integers(0, 2, 250),
+            rng.normal(0, 1e-3, 250) + 1e6,                         # large offset, small spread
+        ]
+        for data in series:
+            curve, points = proc._reference_scan(data)
+            res = proc.execute(data, seed=0)
+
+            assert res.detected_change_points == points
+            np.testing.assert_allclose(res.statistic_curve, curve, rtol=1e-6, atol=1e-6 * np.abs(curve).max())
+
+    def test_batch_and_edge_cases(self):
+        rng = np.random.default_rng(1)
+        data = rng.normal(0, 1, (4, 120))
+        data[:, 60:] += 3
+        data[2, 10] = np.nan
+
+        proc = ChangePointDetection()
+        batch = proc.execute_batch(data, seeds=[5, 6, 7, 8])
+        assert [r.seed for r in batch] == [5, 6, 7, 8]
+        for row, res in zip(data, batch):
+            assert res.detected_change_points == proc.execute(row, seed=0).detected_change_points
+        assert batch[2].detected_change_points == proc._reference_scan(data[2])[1]
+
+        short = proc.execute(np.arange(15.0), seed=0)
+        assert short.detected_change_points == [] and short.statistic_curve == [0.0] * 15
+
+        with pytest.raises(ValueError):
+            proc.execute_batch(data[0])
+        with pytest.raises(ValueError):
+            proc.execute_batch(data, seeds=[1, 2])
+
+
+class TestStreamingChangePointDetection:
+
+    @pytest.mark.parametrize("params", [p for p in PARAMETER_SETS if not p.get("normalize")])
+    def test_stream_matches_batch(self, params):
+        data = generate_piecewise_series(n_samples=400, change_points=[120, 250], means=[0.0, 3.0, 1.0], std=1.0, seed=3)
+        stream = StreamingChangePointDetection(**params)
+        window, radius = stream.parameters["window_size"], stream.parameters["search_radius"]
+
+        points = []
+        for i, value in enumerate(data):
+            point = stream.push(value)
+            if point is not None:
+                assert point == i - window - radius or point < i - window - radius
+                points.append(point)
+        points += stream.flush()
+
+        expected = ChangePointDetection(**params).execute(data, seed=0).detected_change_points
+        assert points == expected
+
+    def test_snapshot_restore(self):
+        data = generate_piecewise_series(n_samples=300, change_points=[100, 200], means=[0.0, 5.0, 0.0], std=0.5, seed=42)
+        reference = StreamingChangePointDetection(normalize=True)
+        expected = [p for p in map(reference.push, data) if p is not None]
+
+        first = StreamingChangePointDetection(normalize=True)
+        points = [p for p in map(first.push, data[:150]) if p is not None]
+        state = json.loads(json.dumps(first.snapshot()))
+
+        resumed = StreamingChangePointDetection(normalize=True)
+        resumed.restore(state)
+        points += [p for p in map(resumed.push, data[150:]) if p is not None]
+
+        assert points == expected
+        assert resumed.n_seen == 300
+        with pytest.raises(ValueError):
+            StreamingChangePointDetection(window_size=5).restore(state)
@@ -0,0 +1,120 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.c3x_exploratory.microdynamics import MicrodynamicAnalysis, burst_runs, permutation_indices
+from src.c3x_exploratory.synthetic_microdynamics import generate_autocorrelated_rt, generate_bursty_rt
+
+
+def reference_runs(mask, min_length=3):
+    runs, current = [], 0
+    for value in list(mask) + [False]:
+        if value:
+            current += 1
+        else:
+            if current >= min_length:
+                runs.append(current)
+            current = 0
+    return runs
+
+
+class TestMicrodynamicPermutationEngine:
+
+    def test_permutation_indices_follow_in_place_shuffles(self):
+        rt = np.random.default_rng(5).normal(500, 90, 36)
+        indices = permutation_indices(36, 50, np.random.default_rng(3))
+
+        rng = np.random.default_rng(3)
+        shuffled = rt.copy()
+        for row in indices:
+            rng.shuffle(shuffled)
+            assert np.array_equal(shuffled, rt[row])
+
+    def test_burst_runs_match_state_machine(self):
+        rng = np.random.default_rng(0)
+        fast = rng.random((200, 36)) < 0.4
+        slow = ~fast & (rng.random((200, 36)) < 0.5)
+        fast_counts, fast_lengths, slow_counts, slow_lengths = burst_runs(fast, slow)
+
+        for i in range(200):
+            assert fast_counts[i] == len(reference_runs(fast[i]))
+            assert fast_lengths[i] == sum(reference_runs(fast[i]))
+            assert slow_counts[i] == len(reference_runs(slow[i]))
+            assert slow_lengths[i] == sum(reference_runs(slow[i]))
+
+    @pytest.mark.parametrize("params", [
+        dict(),
+        dict(n_blocks=4, burst_threshold_mad=0.5, n_permutations=300),
+        dict(n_blocks=6, burst_threshold_mad=-0.2, n_permutations=200),
+    ])
+    def test_p_values_match_sequential_shuffles(self, params):
+        rng = np.random.default_rng(1)
+        series = [
+            generate_autocorrelated_rt(seed=42),
+            generate_bursty_rt(burst_type='slow', seed=42),
+            np.round(rng.normal(500, 90, 36)),
+            rng.integers(400, 404, 36).astype(float),       # many exact ties
+            np.tile(rng.normal(500, 50, 12), 3),
+            np.full(36, 0.1),                               # constant
+        ]
+        proc = MicrodynamicAnalysis(**params)
+        for seed, rt in enumerate(series):
+            assert proc.permutation_test(rt, seed=seed) == proc._permutation_test_reference(rt, seed=seed)
+
+    def test_block_length_validation(self):
+        with pytest.raises(ValueError):
+            MicrodynamicAnalysis(n_blocks=5).permutation_test(np.arange(36.0), seed=0)
+
+
+def flatten_report(report):
+    block, acf = report["block_decomposition"], report["autocorrelation"]
+    perm = report["permutation_test"]
+    row = {f"block_median_{i + 1}": v for i, v in enumerate(block["block_medians"])}
+    row.update({f"block_mad_{i + 1}": v for i, v in enumerate(block["block_mads"])})
+    row.update(trend_slope=block["trend_slope"], trend_p_value=block["trend_p_value"])
+    row.update({f"acf_lag{k + 1}": v for k, v in enumerate(acf["acf_lags"])})
+    row.update(ljung_box_stat=acf["ljung_box_stat"], ljung_box_p_value=acf["ljung_box_p_value"])
+    row.update(report["burst_analysis"])
+    row.update(perm_p_trend=perm["perm_p_trend"], perm_p_acf1=perm["perm_p_acf1"], perm_p_bursts=perm["perm_p_bursts"])
+    return row
+
+
+class TestMicrodynamicPopulation:
+
+    def test_population_matches_per_session_execute(self):
+        rng = np.random.default_rng(2)
+        rt_tensor = np.vstack([
+            rng.normal(500, 90, (6, 36)),
+            generate_bursty_rt(burst_type='fast', seed=7),
+            generate_autocorrelated_rt(seed=7),
+            np.round(rng.normal(500, 90, 36) / 50) * 50,
+            np.full(36, 480.0),
+        ])
+        seeds = list(range(100, 110))
+        proc = MicrodynamicAnalysis(n_permutations=200)
+
+        result = proc.execute_population(rt_tensor, seeds=seeds, index=[f"s{i}" for i in range(10)], chunk_size=3)
+        assert list(result.index) == [f"s{i}" for i in range(10)]
+        assert list(result["seed"]) == seeds
+
+        for (label, row), rt, seed in zip(result.iterrows(), rt_tensor, seeds):
+            expected = flatten_report(proc.execute(rt, seed=seed))
+            for key, value in expected.items():
+                if key.startswith("perm_p") or "burst" in key:
+                    assert row[key] == value, (label, key)
+                else:
+                    assert row[key] == pytest.approx(value, rel=1e-9, abs=1e-9, nan_ok=True), (label, key)
+
+    def test_process_pool_matches_serial(self):
+        rt_tensor = np.random.default_rng(3).normal(500, 90, (8, 36))
+        proc = MicrodynamicAnalysis(n_blocks=4, n_permutations=100)
+
+        serial = proc.execute_population(rt_tensor, seeds=42)
+        pooled = proc.execute_population(rt_tensor, seeds=42, n_jobs=2, chunk_size=2)
+        pd.testing.assert_frame_equal(pooled, serial)
+        assert list(serial.columns[:8]) == [f"block_median_{i}" for i in range(1, 5)] + [f"block_mad_{i}" for i in range(1, 5)]
+
+        with pytest.raises(ValueError):
+            proc.execute_population(rt_tensor[0], seeds=42)
+        with pytest.raises(ValueError):
+            proc.execute_population(rt_tensor, seeds=[1, 2])
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+
+from src.c3x_exploratory.synthetic_generators import generate_mixture_distribution
+from src.c3x_exploratory.multimodality import MultimodalityDetection, binned_kde_batch
+
+
+class TestMultimodalityDetection:
+
+    def test_fft_matches_exact(self):
+        data = generate_mixture_distribution(n_samples=2000, modes=2, separation=4.0, seed=42)
+
+        exact = MultimodalityDetection().execute(data, seed=42)
+        binned = MultimodalityDetection(kde_method="fft").execute(data, seed=42)
+
+        assert binned.density_grid == exact.density_grid
+        assert np.allclose(binned.density_curve, exact.density_curve, atol=1e-3 * max(exact.density_curve))
+        assert binned.number_of_modes == exact.number_of_modes == 2
+        assert binned.input_parameters["kde_method"] == "fft"
+
+    @pytest.mark.parametrize("bandwidth", ["scott", "silverman", 0.3])
+    def test_batch_matches_single_runs(self, bandwidth):
+        samples = [
+            generate_mixture_distribution(n_samples=n, modes=m, separation=3.0, seed=s)
+            for n, m, s in [(40, 1, 0), (500, 2, 1), (3000, 3, 2)]
+        ]
+        for kde_method in ["exact", "fft"]:
+            proc = MultimodalityDetection(bandwidth=bandwidth, kde_method=kde_method)
+            batch = proc.execute_batch(samples, seeds=[0, 1, 2])
+
+            assert [r.seed for r in batch] == [0, 1, 2]
+            for data, res in zip(samples, batch):
+                single = proc.execute(data, seed=res.seed)
+                assert res.density_curve == single.density_curve
+                assert res.detected_peaks == single.detected_peaks
+
+        exact = MultimodalityDetection(bandwidth=bandwidth).execute_batch(samples)
+        binned = MultimodalityDetection(bandwidth=bandwidth, kde_method="fft").execute_batch(samples)
+        assert [r.number_of_modes for r in binned] == [r.number_of_modes for r in exact]
+
+    def test_degenerate_samples_do_not_stop_batch(self):
+        data = generate_mixture_distribution(n_samples=300, modes=2, separation=4.0, seed=3)
+        samples = [np.full(50, 0.4), data, np.array([0.7]), np.array([]), np.array([1.0, np.nan])]
+
+        grids, densities, degenerate = binned_kde_batch(samples)
+        assert degenerate.tolist() == [True, False, True, True, True]
+        assert np.isnan(densities[degenerate]).all() and np.isfinite(densities[1]).all()
+
+        for kde_method in ["exact", "fft"]:
+            proc = MultimodalityDetection(kde_method=kde_method)
+            batch = proc.execute_batch(samples, seeds=[0, 1, 2, 3, 4])
+            assert [r.degenerate for r in batch] == degenerate.tolist()
+            for res in [batch[i] for i in np.flatnonzero(degenerate)]:
+                assert res.number_of_modes == 0
+                assert res.density_curve == [] and res.detected_peaks == []
+            assert batch[1].density_curve == proc.execute(data, seed=1).density_curve
+
+        with pytest.raises(ValueError):
+            MultimodalityDetection(kde_method="fft").execute(np.full(50, 0.4), seed=0)
+
+    def test_invalid_inputs(self):
+        with pytest.raises(ValueError):
+            MultimodalityDetection(kde_method="histogram")
+        with pytest.raises(ValueError):
+            MultimodalityDetection().execute_batch([np.array([1.0, 2.0])], seeds=[0, 1])
+
+        grids, densities, degenerate = binned_kde_batch([])
+        assert densities.shape == (0, 100) and degenerate.shape == (0,)
@@ -0,0 +1,127 @@
+"""
+Tests for the persisted baseline feature store (exploratory_lab.feature_engineering.feature_store).
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exploratory_lab.data_loader import load_trials_long
+from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor
+from exploratory_lab.feature_engineering.feature_store import FeatureStore, FEATURE_COLUMNS
+from tests.test_c3_etl import create_test_db
+
+
+class CountingExtractor(BaselineFeatureExtractor):
+    """Records the groups it extracts; raises for sessions in `failing`."""
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.calls = []
+        self.failing = set(failing)
+
+    def extract_subject_features(self, trials_df):
+        session_id = trials_df['session_id'].iloc[0]
+        self.calls.append(session_id)
+        if session_id in self.failing:
+            raise ValueError("broken session")
+        return super().extract_subject_features(trials_df)
+
+
+@pytest.fixture
+def trials_df(tmp_path):
+    path = tmp_path / "neuro_test.db"
+    create_test_db(path, [
+        (10, 1, '2011-06-14'),
+        (11, 2, '2012-02-29'),
+        (12, 1, '2013-01-01'),
+    ])
+    return load_trials_long(str(path), with_test_date=True)
+
+
+def reference_features(trials_df):
+    extractor = BaselineFeatureExtractor()
+    rows = []
+    for tid in trials_df['session_id'].unique():
+        sdf = trials_df[trials_df['session_id'] == tid]
+        feats = extractor.extract_subject_features(sdf)
+        feats['session_id'] = tid
+        feats['subject_id'] = sdf['subject_id'].iloc[0]
+        feats['test_date'] = sdf['test_date'].iloc[0]
+        rows.append(feats)
+    return pd.DataFrame(rows)
+
+
+def test_matches_loop_and_reuses_stored_rows(trials_df, tmp_path):
+    extractor = CountingExtractor()
+    store = FeatureStore(tmp_path / "store", extractor=extractor)
+
+    first = store.extract(trials_df, carry_columns=('subject_id', 'test_date'))
+    pd.testing.assert_frame_equal(first, reference_features(trials_df))
+    assert store.stats == {'reused': 0, 'computed': 3}
+
+    second = FeatureStore(tmp_path / "store", extractor=extractor).extract(
+        trials_df, carry_columns=('subject_id', 'test_date'))
+    pd.testing.assert_frame_equal(second, first)
+    assert extractor.calls == [10, 11, 12]
+
+
+def test_changed_session_is_recomputed(trials_df, tmp_path):
+    extractor = CountingExtractor()
+    store = FeatureStore(tmp_path, extractor=extractor)
+    store.extract(trials_df)
+
+    changed = trials_df.copy()
+    changed.loc[changed.index[changed['session_id'] == 11][:5], 'rt'] += 50
+    extractor.calls.clear()
+    result = store.extract(changed)
+
+    assert extractor.calls == [11]
+    assert store.stats == {'reused': 2, 'computed': 1}
+    assert list(result['session_id']) == [10, 11, 12]
+
+    # Subsets are served from the same store
+    extractor.calls.clear()
+    subset = store.extract(changed[changed['session_id'] != 10])
+    assert extractor.calls == []
+    pd.testing.assert_frame_equal(subset, result.iloc[1:].reset_index(drop=True))
+
+
+def test_extractor_version_invalidates_store(trials_df, tmp_path):
+    FeatureStore(tmp_path).extract(trials_df)
+
+    extractor = CountingExtractor()
+    extractor.version = "baseline_features_test"
+    store = FeatureStore(tmp_path, extractor=extractor)
+    store.extract(trials_df)
+
+    assert extractor.calls == [10, 11, 12]
+    assert store.read_meta()['extractor_version'] == "baseline_features_test"
+
+
+def test_failures_are_reported_and_cached(trials_df, tmp_path):
+    extractor = CountingExtractor(failing={11})
+    store = FeatureStore(tmp_path, extractor=extractor)
+    result = store.extract(trials_df)
+
+    assert list(result['session_id']) == [10, 12]
+    assert list(result.columns) == FEATURE_COLUMNS + ['session_id']
+    assert store.failures == {11: "ValueError: broken session"}
+
+    extractor.calls.clear()
+    store.extract(trials_df)
+    assert extractor.calls == []
+    assert store.failures == {11: "ValueError: broken session"}
+
+
+def test_subject_groups(trials_df, tmp_path):
+    store = FeatureStore(tmp_path, name="subject_features")
+    result = store.extract(trials_df, group_col='subject_id')
+
+    assert list(result['subject_id']) == [1, 2]
+    expected = BaselineFeatureExtractor().extract_subject_features(trials_df[trials_df['subject_id'] == 1])
+    assert result.iloc[0][FEATURE_COLUMNS].to_dict() == pytest.approx(expected, nan_ok=True)
@@ -0,0 +1,87 @@
+"""
+Tests for the vectorized wide-to-long trial loader (exploratory_lab.data_loader).
+
+The loader must reproduce the per-session loops it replaced row for row.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exploratory_lab.data_loader import (
+    load_trials_long, load_trials_wide, load_stimulus_metadata, trials_to_long,
+)
+from tests.test_c3_etl import create_test_db
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    path = tmp_path / "neuro_test.db"
+    create_test_db(path, [
+        (10, 1, '2011-06-14'),
+        (11, 2, '2012-02-29'),
+        (12, 9, '2012-03-01'),   # subject missing from users
+        (13, 1, '2013-01-01'),
+    ])
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE trials SET tst2_5 = 0, tst3_1 = -1 WHERE trial_id = 11")
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def reference_long(trials_wide, metadata, with_test_date=False, stimulus_attributes=False):
+    """The iterrows loop of the exploratory pipelines."""
+    def count_triples(mask_str):
+        if not mask_str or pd.isna(mask_str):
+            return 0
+        return len(mask_str.strip().split(' '))
+
+    rows = []
+    for _, sr in trials_wide.iterrows():
+        for test_type in ('Tst1', 'Tst2', 'Tst3'):
+            meta_df = metadata[test_type]
+            for stim in range(1, 37):
+                rt = sr[f'{test_type.lower()}_{stim}']
+                if pd.notna(rt) and rt > 0:
+                    m = meta_df[meta_df['stimulus_id'] == stim].iloc[0]
+                    row = {'subject_id': sr['subject_id'], 'session_id': sr['trial_id']}
+                    if with_test_date:
+                        row['test_date'] = sr['test_date']
+                    row.update({
+                        'test_type': test_type, 'stimulus_id': stim, 'stimulus_location': m['position'],
+                        'stimulus_color': 'red' if test_type == 'Tst2' else m['color'],
+                        'psi': m['psi_ms'], 'rt': rt, 'is_outlier': False,
+                    })
+                    if stimulus_attributes:
+                        row['shift_parameter'] = m['shift_parameter'] if test_type == 'Tst3' else 0
+                        row['mask_triples_count'] = count_triples(m['mask_triples']) if test_type != 'Tst1' else 0
+                    rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("with_test_date,stimulus_attributes", [(False, False), (True, True)])
+def test_matches_reference_loop(test_db, with_test_date, stimulus_attributes):
+    expected = reference_long(load_trials_wide(test_db), load_stimulus_metadata(test_db),
+                              with_test_date=with_test_date, stimulus_attributes=stimulus_attributes)
+    result = load_trials_long(test_db, with_test_date=with_test_date, stimulus_attributes=stimulus_attributes)
+
+    pd.testing.assert_frame_equal(result, expected)
+    # Sessions of subjects missing from users and non-positive RTs are dropped
+    assert 12 not in set(result['session_id'])
+    assert len(result[result['session_id'] == 11]) == 108 - 1 - 2
+
+
+def test_filtered_wide_frame(test_db):
+    trials_wide = load_trials_wide(test_db)
+    trials_wide['test_date'] = pd.to_datetime(trials_wide['test_date'])
+    first_visits = trials_wide.sort_values('test_date').groupby('subject_id').first().reset_index()
+    metadata = load_stimulus_metadata(test_db)
+
+    pd.testing.assert_frame_equal(trials_to_long(first_visits, metadata),
+                                  reference_long(first_visits, metadata))
@@ -0,0 +1,85 @@
+"""
+Tests for the batched exponential PSI recovery fitter (exploratory_lab.feature_engineering.psi_recovery).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exploratory_lab.feature_engineering.baseline_features import BaselineFeatureExtractor, EXTRACTOR_VERSION
+from exploratory_lab.feature_engineering.psi_recovery import (
+    fit_exponential_recovery_batch, fit_grouped_psi_recovery,
+)
+
+PSI_LEVELS = np.array([800, 950, 1000, 1200, 1500, 1600, 2000, 2400, 2800], dtype=float)
+
+
+def synthetic_sessions(taus, n_trials=90, noise=5.0, seed=0):
+    rng = np.random.default_rng(seed)
+    psi = np.tile(PSI_LEVELS, n_trials // len(PSI_LEVELS))
+    rows_psi, rows_rt = [], []
+    for tau in taus:
+        rt = 300 + 150 * np.exp(-(psi - 800) / tau) + rng.normal(0, noise, len(psi))
+        rows_psi.append(psi)
+        rows_rt.append(rt)
+    return np.array(rows_psi), np.array(rows_rt)
+
+
+def test_matches_per_session_curve_fit():
+    psi, rt = synthetic_sessions([150, 300, 600, 1200])
+    result = fit_exponential_recovery_batch(psi, rt)
+
+    extractor = BaselineFeatureExtractor()
+    expected = np.array([extractor._fit_exponential_recovery(p, r) for p, r in zip(psi, rt)])
+
+    assert list(result['status']) == ['ok'] * 4
+    np.testing.assert_allclose(result['tau'], expected, rtol=1e-4)
+    # Same fit, so the same residual sum of squares
+    fitted = result['rt0'][:, None] + result['beta'][:, None] * np.exp(-psi / result['tau'][:, None])
+    np.testing.assert_allclose(result['sse'], ((fitted - rt) ** 2).sum(axis=1), rtol=1e-6)
+
+
+def test_padding_and_statuses():
+    psi, rt = synthetic_sessions([400, 400, 400])
+    rt[1, 10:] = np.nan                 # too few trials
+    rt[2] = 300 + np.where(psi[2] == 800, 100, 0) + np.random.default_rng(1).normal(0, 5, psi.shape[1])  # step at the shortest PSI
+
+    result = fit_exponential_recovery_batch(psi, rt)
+    assert list(result['status']) == ['ok', 'insufficient_data', 'at_bound']
+    assert result['n_points'][1] == 10
+    assert np.isnan(result['tau'][1:]).all()
+
+    # Padding does not change the fit of a session
+    alone = fit_exponential_recovery_batch(psi[:1, :45], rt[:1, :45])
+    padded = fit_exponential_recovery_batch(np.where(np.arange(90) < 45, psi[:1], np.nan), rt[:1])
+    np.testing.assert_allclose(padded['tau'], alone['tau'], rtol=1e-6)
+
+
+def test_grouped_fit_and_extractor_mode():
+    psi, rt = synthetic_sessions([250, 700])
+    trials_df = pd.DataFrame({
+        'session_id': np.repeat([7, 3], psi.shape[1]),
+        'psi': psi.ravel(),
+        'rt': rt.ravel(),
+        'is_outlier': False,
+    })
+    trials_df.loc[0, 'is_outlier'] = True
+
+    grouped = fit_grouped_psi_recovery(trials_df)
+    assert list(grouped.index) == [3, 7]
+    assert grouped.loc[7, 'n_points'] == psi.shape[1] - 1
+    # Equal up to the resolution of a flat profile minimum
+    np.testing.assert_allclose(grouped.loc[3, 'tau'], fit_exponential_recovery_batch(psi[1:], rt[1:])['tau'][0], rtol=1e-6)
+
+    extractor = BaselineFeatureExtractor(psi_fit='batch')
+    assert extractor.version == f"{EXTRACTOR_VERSION}+psi_batch"
+    assert BaselineFeatureExtractor().version == EXTRACTOR_VERSION
+    np.testing.assert_allclose(extractor._fit_exponential_recovery(psi[1], rt[1]), grouped.loc[3, 'tau'], rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        BaselineFeatureExtractor(psi_fit='lbfgs')
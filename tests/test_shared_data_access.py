@@ -0,0 +1,70 @@
+"""
+Tests for the shared read-only SQLite access layer (src.shared.data_access).
+"""
+
+import sqlite3
+
+import pytest
+
+from src.shared import data_access
+from src.shared.data_access import connect_readonly, read_table, read_trials, read_users
+from tests.test_c3_etl import create_test_db, add_sessions
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    path = tmp_path / "neuro_test.db"
+    create_test_db(path, [
+        (10, 1, '2011-06-14'),
+        (11, 2, '2012-02-29'),
+    ])
+    yield str(path)
+    data_access.clear_cache()
+
+
+def test_connections_are_pooled_and_read_only(test_db):
+    conn = connect_readonly(test_db)
+    assert conn.execute("SELECT COUNT(*) FROM trials").fetchone()[0] == 2
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM trials")
+    conn.close()
+
+    # close() hands the connection back; the next request reuses it
+    assert connect_readonly(test_db) is conn
+
+
+def test_static_tables_cached_per_snapshot(test_db, monkeypatch):
+    first = read_users(test_db)
+
+    queries = []
+    original = data_access.pd.read_sql_query
+    monkeypatch.setattr(data_access.pd, "read_sql_query",
+                        lambda *args, **kwargs: queries.append(args[0]) or original(*args, **kwargs))
+
+    second = read_users(test_db)
+    assert queries == []
+    # Cached frames are handed out as copies
+    second.loc[0, 'subject_id'] = -1
+    assert read_users(test_db)['subject_id'].iloc[0] == first['subject_id'].iloc[0]
+
+    # Large tables are not cached unless requested
+    read_trials(test_db, columns=['trial_id'])
+    read_trials(test_db, columns=['trial_id'])
+    assert len(queries) == 2
+
+
+def test_file_change_invalidates_snapshot(test_db):
+    before = read_table(test_db, "trials", cache=True)
+    conn = connect_readonly(test_db)
+    conn.close()
+
+    add_sessions(test_db, [(12, 1, '2013-01-01')])
+
+    after = read_table(test_db, "trials", cache=True)
+    assert len(after) == len(before) + 1
+    assert connect_readonly(test_db) is not conn
+
+
+def test_unknown_table_rejected(test_db):
+    with pytest.raises(ValueError):
+        read_table(test_db, "sqlite_master")
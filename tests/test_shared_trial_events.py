@@ -0,0 +1,82 @@
+"""
+Tests for the materialized trial_events table (shared.trial_events).
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.c3_core.etl.etl_v4 import ETLPipeline
+from src.shared import data_access, trial_events
+from src.shared.trial_events import (
+    default_derived_path, ensure_trial_events, load_trial_events,
+)
+from tests.test_c3_etl import create_test_db, add_sessions
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    path = tmp_path / "neuro_test.db"
+    create_test_db(path, [
+        (10, 1, '2011-06-14'),
+        (11, 1, '2011-06-15'),
+        (12, 2, '2012-02-29'),
+    ])
+    yield str(path)
+    data_access.clear_cache()
+
+
+def test_trial_events_match_etl_unpivot(test_db):
+    events = load_trial_events(test_db)
+    assert default_derived_path(test_db).exists()
+
+    etl = ETLPipeline(db_path=test_db).run()
+    assert len(events) == len(etl) == 3 * 108
+
+    merged = etl.merge(events, on=['session_id', 'test_type', 'stimulus_index'], validate='one_to_one')
+    np.testing.assert_array_equal(merged['rt_ms_x'].to_numpy(), merged['rt_ms_y'].to_numpy())
+    assert (merged['psi_pre_ms'] == merged['psi_ms']).all()
+    assert (merged['stimulus_location'] == merged['position']).all()
+    assert (merged['stimulus_color'] == merged['color']).all()
+
+
+def test_filtered_loads_use_covering_indexes(test_db):
+    subject = load_trial_events(test_db, subject_ids=[1], columns=['session_id', 'rt_ms'])
+    assert list(subject.columns) == ['session_id', 'rt_ms']
+    assert set(subject['session_id']) == {10, 11}
+
+    condition = load_trial_events(test_db, test_types="Tst1", positions=["left"])
+    assert set(condition['test_type']) == {"Tst1"}
+    assert set(condition['position']) == {"left"}
+
+    conn = sqlite3.connect(default_derived_path(test_db))
+    for where, index in [
+        ("subject_id = 1", "idx_trial_events_subject"),
+        ("test_type = 'Tst1' AND position = 'left'", "idx_trial_events_condition"),
+    ]:
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM trial_events WHERE {where}"))
+        assert f"COVERING INDEX {index}" in plan
+    conn.close()
+
+
+def test_rebuilt_only_when_source_content_changes(test_db, monkeypatch):
+    ensure_trial_events(test_db)
+
+    builds = []
+    original = trial_events.build_trial_events
+    monkeypatch.setattr(trial_events, "build_trial_events",
+                        lambda *args, **kwargs: builds.append(args) or original(*args, **kwargs))
+
+    ensure_trial_events(test_db)
+    assert builds == []
+
+    add_sessions(test_db, [(13, 2, '2013-01-01')])
+    events = load_trial_events(test_db, session_ids=[13])
+    assert len(builds) == 1
+    assert len(events) == 108
+
+
+def test_unknown_column_rejected(test_db):
+    with pytest.raises(ValueError):
+        load_trial_events(test_db, columns=['age'])